@@ -0,0 +1,35 @@
+"""In-process stand-in for ``AsyncOpenAI`` with latency proportional to input."""
+
+import asyncio
+from types import SimpleNamespace
+
+from core.tokens import estimate_tokens
+
+
+class FakeChatClient:
+    """Mimics ``client.chat.completions.create`` closely enough for ``core``.
+
+    Each call sleeps ``base_latency + seconds_per_1k_tokens * prompt_tokens/1000``
+    and answers with a reply about a tenth the length of its input.
+    """
+
+    def __init__(self, base_latency: float = 0.05, seconds_per_1k_tokens: float = 0.02):
+        self.base_latency = base_latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, **kwargs):
+        self.calls += 1
+        prompt = "\n".join(m["content"] for m in messages)
+        prompt_tokens = estimate_tokens(prompt)
+        await asyncio.sleep(self.base_latency + self.seconds_per_1k_tokens * prompt_tokens / 1000)
+        words = messages[-1]["content"].split()
+        reply = " ".join(words[: max(1, len(words) // 10)])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=reply))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=estimate_tokens(reply)),
+        )
+
+    async def close(self):
+        pass
@@ -0,0 +1,71 @@
+"""Synthetic audio shared by the benchmarks."""
+
+import wave
+
+import numpy as np
+
+from core.audio import SAMPLE_RATE
+
+
+def _talk_gate(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Alternate 1-4 s of "talking" with 0.2-1.5 s of near silence."""
+    gate = np.zeros(n, dtype=np.float32)
+    pos = 0
+    while pos < n:
+        talk = int(rng.uniform(1, 4) * SAMPLE_RATE)
+        gate[pos:pos + talk] = 1.0
+        pos += talk + int(rng.uniform(0.2, 1.5) * SAMPLE_RATE)
+    return gate
+
+
+def speech_like(seconds: float, seed: int = 0, pitch: float = 140.0) -> np.ndarray:
+    """Return float32 audio of voiced bursts separated by short pauses."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+    # A few harmonics with slow vibrato stand in for a voice.
+    phase = 2 * np.pi * pitch * t + 3 * np.sin(2 * np.pi * 5 * t)
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6)).astype(np.float32)
+    gate = _talk_gate(n, rng)
+    noise = rng.normal(0, 0.003, n).astype(np.float32)
+    return 0.3 * voice * gate + noise
+
+
+def conversation(seconds: float, voices, seed: int = 0):
+    """Return ``(audio, turns)`` of alternating synthetic speakers.
+
+    Each voice is ``(pitch_hz, (f1, f2, f3))``: harmonics of the pitch shaped
+    by three formant peaks, so voices differ in timbre as well as pitch.
+    ``turns`` lists ``(start, end, speaker)`` in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    parts, turns, t = [], [], 0.0
+    while t < seconds:
+        speaker = int(rng.integers(len(voices)))
+        length = min(rng.uniform(3, 20), seconds - t)
+        pitch, formants = voices[speaker]
+        n = int(length * SAMPLE_RATE)
+        time = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+        # Per-turn jitter in pitch and formants, as from changing vowels.
+        f0 = pitch * rng.uniform(0.93, 1.07)
+        peaks = np.array(formants) * rng.uniform(0.95, 1.05, 3)
+        phase = 2 * np.pi * f0 * time + 3 * np.sin(2 * np.pi * 4 * time)
+        voice = np.zeros(n, dtype=np.float32)
+        for k in range(1, int(3800 // f0) + 1):
+            gain = sum(np.exp(-0.5 * ((k * f0 - peak) / 120) ** 2) for peak in peaks) + 0.02
+            voice += (gain / np.sqrt(k)) * np.sin(k * phase)
+        voice = 0.2 * voice / (np.abs(voice).max() + 1e-9) * _talk_gate(n, rng) + rng.normal(0, 0.003, n)
+        parts.append(voice.astype(np.float32))
+        turns.append((t, t + length, speaker))
+        t += length
+    return np.concatenate(parts), turns
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+    """Write mono float audio as 16-bit PCM WAV."""
+    pcm = (np.clip(audio, -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.writeframes(pcm.tobytes())
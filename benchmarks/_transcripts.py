@@ -0,0 +1,41 @@
+"""Synthetic timed transcripts shared by the text-analysis benchmarks."""
+
+import numpy as np
+
+from core.transcription import Segment
+
+TOPICS = {
+    "pricing": "pricing revenue subscription churn discount customers billing plans annual monthly",
+    "hiring": "hiring interview candidates recruiting culture engineers onboarding team salary remote",
+    "marketing": "marketing podcast audience newsletter growth content social brand campaign launch",
+    "health": "sleep exercise health burnout stress routine morning habits energy focus",
+    "product": "product roadmap feature users feedback design prototype release bugs metrics",
+    "funding": "funding investors valuation seed series runway pitch equity board capital",
+}
+FILLER = "people company business work time years first good great important started the and we you so".split()
+SEGMENT_SECONDS = 5.0
+WORDS_PER_SEGMENT = 14
+
+
+def synthetic_transcript(hours: float, seed: int = 0, topical: float = 0.35):
+    """Return ``(segments, boundaries)`` of topic runs lasting 3-10 minutes each.
+
+    ``topical`` is the share of words drawn from the current topic's
+    vocabulary; the rest are filler. ``boundaries`` are the true topic-change
+    times in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = {name: words.split() for name, words in TOPICS.items()}
+    names = list(vocab)
+    segments, boundaries, t, topic = [], [], 0.0, None
+    while t < hours * 3600:
+        topic = rng.choice([name for name in names if name != topic])
+        boundaries.append(t)
+        for _ in range(int(rng.uniform(180, 600) / SEGMENT_SECONDS)):
+            words = [
+                str(rng.choice(vocab[topic])) if rng.random() < topical else str(rng.choice(FILLER))
+                for _ in range(WORDS_PER_SEGMENT)
+            ]
+            segments.append(Segment(" ".join(words), t, t + SEGMENT_SECONDS))
+            t += SEGMENT_SECONDS
+    return segments, boundaries
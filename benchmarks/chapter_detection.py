@@ -0,0 +1,42 @@
+"""Run time and boundary accuracy of chapter detection as transcripts grow.
+
+Synthetic transcripts switch topic every 3-10 minutes. For each length the
+detector is timed and its chapter starts are matched against the true topic
+changes (within ``--tolerance`` seconds)::
+
+    python -m benchmarks.chapter_detection --hours 1 2 4 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._transcripts import synthetic_transcript
+from core.chapters import detect_chapters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--tolerance", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{'hours':>5} {'words':>9} {'seconds':>8} {'chapters':>8} {'recall':>7} {'precision':>9}")
+    for hours in args.hours:
+        segments, truth = synthetic_transcript(hours)
+        words = sum(len(seg.text.split()) for seg in segments)
+        start = time.perf_counter()
+        chapters = detect_chapters(segments)
+        elapsed = time.perf_counter() - start
+
+        found = np.array([chapter.start for chapter in chapters])
+        truth = np.array(truth)
+        hits = np.abs(found[:, None] - truth[None, :]) <= args.tolerance
+        recall = hits.any(axis=0).mean()
+        precision = hits.any(axis=1).mean()
+        print(f"{hours:5.1f} {words:9,d} {elapsed:8.3f} {len(chapters):8d} {recall:7.0%} {precision:9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Peak memory of decoding an episode: whole-file arrays vs. streamed blocks.
+
+Encodes ``--minutes`` of 44.1 kHz stereo test audio to M4A with ffmpeg, then
+decodes it to 16 kHz mono float32 twice: once the naive way (all PCM read
+into one array, downmixed and resampled in one go) and once through
+:func:`core.audio.decode_audio`::
+
+    python -m benchmarks.decode_memory --minutes 45
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.upload_memory import PeakSampler
+from core.audio import SAMPLE_RATE, decode_audio
+
+NATIVE_RATE = 44100
+
+
+def naive(path: str) -> int:
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le", "-"]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    pcm = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    mono = pcm.reshape(-1, 2).mean(axis=1)
+    positions = np.arange(0, len(mono), NATIVE_RATE / SAMPLE_RATE)
+    audio = np.interp(positions, np.arange(len(mono)), mono).astype(np.float32)
+    return len(audio)
+
+
+def streamed(path: str) -> int:
+    return sum(len(block) for block in decode_audio(path))
+
+
+def measure(fn, path):
+    sampler = PeakSampler()
+    sampler.start()
+    started = time.perf_counter()
+    samples = fn(path)
+    elapsed = time.perf_counter() - started
+    return sampler.stop(), elapsed, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=45.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "episode.m4a")
+        subprocess.run([
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate={NATIVE_RATE}:duration={args.minutes * 60}",
+            "-ac", "2", "-c:a", "aac", path,
+        ], check=True)
+
+        streamed_peak, streamed_time, streamed_samples = measure(streamed, path)
+        naive_peak, naive_time, naive_samples = measure(naive, path)
+
+    print(f"{args.minutes:.0f} min of 44.1 kHz stereo M4A -> 16 kHz mono float32")
+    print(f"whole-file arrays: peak +{naive_peak:8.1f} MB in {naive_time:6.2f} s ({naive_samples} samples)")
+    print(f"streamed blocks:   peak +{streamed_peak:8.1f} MB in {streamed_time:6.2f} s ({streamed_samples} samples)")
+
+
+if __name__ == "__main__":
+    main()
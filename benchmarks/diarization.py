@@ -0,0 +1,71 @@
+"""Speed and accuracy of CPU diarization on synthetic multi-voice audio.
+
+Writes ``--minutes`` of a conversation between ``--speakers`` synthetic
+voices, diarizes it with batch and incremental clustering, and reports the
+real-time factor and the share of speech windows given the right speaker::
+
+    python -m benchmarks.diarization --minutes 60 --speakers 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+from benchmarks._synthetic import conversation, write_wav
+from core.diarization import diarize
+
+VOICES = [
+    (110.0, (600, 1200, 2500)),
+    (140.0, (450, 1700, 2600)),
+    (210.0, (750, 1900, 3000)),
+    (180.0, (350, 2200, 2900)),
+    (95.0, (700, 1100, 2300)),
+    (250.0, (500, 1500, 3200)),
+]
+
+
+def accuracy(turns, truth) -> float:
+    """Share of windows labelled correctly under a greedy one-to-one cluster/speaker mapping."""
+    starts = np.array([start for start, _, _ in truth])
+    actual = [truth[np.searchsorted(starts, (t.start + t.end) / 2, side="right") - 1][2] for t in turns]
+    votes = Counter(zip((t.speaker for t in turns), actual))
+    clusters, speakers, correct = set(), set(), 0
+    for (cluster, speaker), count in votes.most_common():
+        if cluster not in clusters and speaker not in speakers:
+            clusters.add(cluster)
+            speakers.add(speaker)
+            correct += count
+    return correct / max(len(turns), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--speakers", type=int, default=3, choices=range(1, len(VOICES) + 1))
+    args = parser.parse_args()
+
+    audio, truth = conversation(args.minutes * 60, VOICES[:args.speakers])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "conversation.wav")
+        write_wav(path, audio)
+        del audio
+
+        print(f"audio: {args.minutes:.0f} min, {args.speakers} speakers, {len(truth)} turns")
+        for incremental in (False, True):
+            start = time.perf_counter()
+            turns = diarize(path, incremental=incremental)
+            elapsed = time.perf_counter() - start
+            found = len({turn.speaker for turn in turns})
+            print(
+                f"{'incremental' if incremental else 'batch':12s} {elapsed:7.2f} s "
+                f"({elapsed / (args.minutes * 60):.2%} of real time), "
+                f"{found} speakers found, {accuracy(turns, truth):.1%} of windows correct"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Indexing and query latency of the episode search index at scale.
+
+Synthetic episodes are added one at a time, as finished jobs would add
+them, then re-added to show that indexed episodes are skipped without a
+re-scan. Query latency is the median over repeated runs of word, phrase,
+time-anchored and single-episode queries::
+
+    python -m benchmarks.episode_search --episodes 2000 --hours 0.5
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks._transcripts import synthetic_transcript
+from core.search import SearchIndex
+
+QUERIES = [
+    "valuation",
+    '"pricing churn"',
+    "burnout after:10:00 before:20:00",
+    "investors runway",
+]
+# Distinct transcripts generated; episodes reuse them under their own keys.
+_VARIANTS = 40
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=2000)
+    parser.add_argument("--hours", type=float, default=0.5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    variants = [synthetic_transcript(args.hours, seed=seed)[0] for seed in range(_VARIANTS)]
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(os.path.join(directory, "search.sqlite3"))
+        start = time.perf_counter()
+        rows = 0
+        for n in range(args.episodes):
+            segments = variants[n % _VARIANTS]
+            index.add_episode(f"episode-{n}", f"Episode {n}", segments)
+            rows += len(segments)
+        indexing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for n in range(args.episodes):
+            index.add_episode(f"episode-{n}", f"Episode {n}", variants[n % _VARIANTS])
+        reindexing = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(directory, "search.sqlite3"))
+
+        print(f"indexed {args.episodes:,} episodes ({rows:,} segments) in {indexing:.1f} s "
+              f"({rows / indexing:,.0f} segments/s), {size / 1024 / 1024:.0f} MB")
+        print(f"re-adding all of them: {reindexing * 1000:.0f} ms (already indexed, skipped)")
+        print(f"{'query':<40} {'hits':>5} {'median ms':>9}")
+        for query, key in [(q, None) for q in QUERIES] + [("valuation", "episode-7")]:
+            times = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                hits = index.search(query, key=key)
+                times.append(time.perf_counter() - start)
+            label = query + (f"  [in {key}]" if key else "")
+            print(f"{label:<40} {len(hits):5d} {statistics.median(times) * 1000:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Latency of concurrent vs. sequential content generation against the stub API.
+
+Usage::
+
+    python -m benchmarks.generation_fanout --latency 1.0
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_openai import serve
+from core.generation import CONTENT_PROMPTS, generate_all, make_client
+
+TRANSCRIPT = "We talked about repurposing podcast content for every platform. " * 200
+
+
+async def run(base_url: str, max_concurrency: int) -> float:
+    client = make_client(base_url=base_url, api_key="stub")
+    started = time.perf_counter()
+    async with client:
+        await generate_all(TRANSCRIPT, CONTENT_PROMPTS, client=client, max_concurrency=max_concurrency)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="stub seconds per request")
+    args = parser.parse_args()
+
+    with serve(latency=args.latency) as base_url:
+        sequential = asyncio.run(run(base_url, max_concurrency=1))
+        concurrent = asyncio.run(run(base_url, max_concurrency=len(CONTENT_PROMPTS)))
+
+    print(f"formats:     {len(CONTENT_PROMPTS)} @ {args.latency:.2f} s each")
+    print(f"sequential:  {sequential:6.2f} s")
+    print(f"concurrent:  {concurrent:6.2f} s")
+    print(f"speedup:     {sequential / concurrent:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
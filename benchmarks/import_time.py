@@ -0,0 +1,80 @@
+"""Cold import time of each page and of the heaviest modules, via ``-X importtime``.
+
+Each page's top-level imports run in a fresh interpreter that has already
+imported Streamlit, as a page's first run does inside the server. The
+report gives the import time the page adds on top of Streamlit and the
+packages that contribute most to it::
+
+    python -m benchmarks.import_time --repeats 5
+"""
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Home.py", "pages/landing_page.py", "pages/streamlit_app.py"]
+# Also measured alone: the modules that can make a cold start slow.
+MODULES = ["numpy", "pandas", "openai", "core.pipeline", "core.generation"]
+_MARKER = "--- measured ---"
+# "import time: <self us> | <cumulative us> | <indented module name>"
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def page_imports(path: str) -> str:
+    """The page's top-level import statements, as source."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in ast.parse(source).body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def import_report(code: str):
+    """Run ``code`` after importing Streamlit; returns ``{top-level module: cumulative us}``."""
+    script = f"import streamlit, sys\nsys.stderr.write({_MARKER!r} + '\\n')\n{code}\n"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    lines = result.stderr.split(_MARKER, 1)[1].splitlines()
+    # -X importtime logs a package after its submodules; the unindented
+    # lines are the imports the code itself triggered.
+    roots = {}
+    for line in lines:
+        match = _LINE.match(line)
+        if match and not match.group(3):
+            roots[match.group(4)] = int(match.group(2))
+    return roots
+
+
+def median_report(code: str, repeats: int):
+    reports = [import_report(code) for _ in range(repeats)]
+    totals = [sum(report.values()) for report in reports]
+    modules = {name: float(np.median([report.get(name, 0) for report in reports])) for name in reports[0]}
+    return float(np.median(totals)), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=4, help="heaviest imports listed per page")
+    args = parser.parse_args()
+
+    print(f"{'imports of':<24} {'ms':>7}  heaviest")
+    for page in PAGES:
+        total, modules = median_report(page_imports(os.path.join(ROOT, page)), args.repeats)
+        heaviest = sorted(modules.items(), key=lambda item: -item[1])[:args.top]
+        print(f"{page:<24} {total / 1000:7.1f}  " + ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest))
+    for module in MODULES:
+        total, _ = median_report(f"import {module}", args.repeats)
+        print(f"{module:<24} {total / 1000:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Wall-clock scaling of map-reduce summarization with fan-out width.
+
+Usage::
+
+    python -m benchmarks.map_reduce_summary --hours 3 --fan-out 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._fake_llm import FakeChatClient
+from core.summarize import CHUNK_TOKENS, map_reduce_summarize
+from core.transcription import Segment
+
+SENTENCE = "we dig into how small teams ship podcasts weekly and repurpose every episode"
+
+
+def synthetic_transcript(hours: float):
+    # About 150 spoken words a minute in 5-second segments.
+    return [
+        Segment(f"{SENTENCE} part {i}", i * 5.0, i * 5.0 + 5.0)
+        for i in range(int(hours * 3600 / 5))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--chunk-tokens", type=int, default=CHUNK_TOKENS // 4)
+    parser.add_argument("--fan-out", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    segments = synthetic_transcript(args.hours)
+    print(f"{len(segments):,} segments ({args.hours:g} h), chunk budget {args.chunk_tokens} tokens")
+    baseline = None
+    for fan_out in args.fan_out:
+        client = FakeChatClient()
+        started = time.perf_counter()
+        result = asyncio.run(map_reduce_summarize(
+            segments, client, chunk_tokens=args.chunk_tokens, fan_out=fan_out
+        ))
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(
+            f"fan-out {fan_out:3d}: {elapsed:7.2f} s  {result.calls} calls, "
+            f"{result.levels} levels, speedup vs. first {baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Models loaded and memory held when concurrent sessions transcribe at once.
+
+Each of ``--sessions`` threads transcribes ``--windows`` windows, as the
+script threads of that many Streamlit sessions would. With a model per
+session every thread pays the load and holds its own copy; with the shared
+registry one copy is loaded and the threads queue for it window by window.
+A stand-in model that sleeps on load, holds ``--model-mb`` of weights and
+burns CPU per second of audio replaces Whisper::
+
+    python -m benchmarks.model_registry --sessions 8 --load-seconds 2 --model-mb 140
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.parallel_transcription import FakeModel
+from core.audio import SAMPLE_RATE
+from core.models import ModelRegistry
+from core.transcription import transcribe_window
+
+
+class _Weights:
+    def __init__(self, megabytes: float):
+        self.array = np.ones(int(megabytes * 2**20) // 4, dtype=np.float32)
+
+    def numel(self) -> int:
+        return self.array.size
+
+    def element_size(self) -> int:
+        return self.array.itemsize
+
+
+class HeavyFakeModel(FakeModel):
+    def __init__(self, megabytes: float):
+        self.weights = _Weights(megabytes)
+
+    def parameters(self):
+        return [self.weights]
+
+
+def run_sessions(sessions: int, session):
+    """Wall time to run ``session(i)`` on ``sessions`` threads at once."""
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--windows", type=int, default=10, help="30 s windows transcribed per session")
+    parser.add_argument("--load-seconds", type=float, default=2.0)
+    parser.add_argument("--model-mb", type=float, default=140.0, help="weights held per model (base is ~140)")
+    args = parser.parse_args()
+
+    window = np.random.default_rng(0).normal(0, 0.1, 30 * SAMPLE_RATE).astype(np.float32)
+
+    def loader(name, device):
+        time.sleep(args.load_seconds)
+        return HeavyFakeModel(args.model_mb)
+
+    def transcribe(model):
+        for i in range(args.windows):
+            list(transcribe_window(model, window, i * 30.0))
+
+    own = []
+
+    def own_model(_):
+        model = loader("base", "cpu")
+        own.append(model)
+        transcribe(model)
+
+    registry = ModelRegistry(loader=loader)
+
+    def shared_model(_):
+        with registry.lease("base", "cpu") as model:
+            transcribe(model)
+
+    print(f"{'models':<10} {'wall s':>7} {'loads':>5} {'MB held':>8} {'mean wait ms':>12} {'max wait ms':>11}")
+    wall = run_sessions(args.sessions, own_model)
+    print(f"{'per user':<10} {wall:7.2f} {len(own):5d} {len(own) * args.model_mb:8.0f} {0:12.1f} {0:11.1f}")
+    own.clear()
+
+    wall = run_sessions(args.sessions, shared_model)
+    stats = registry.stats()[0]
+    print(f"{'shared':<10} {wall:7.2f} {registry.loads:5d} {stats.megabytes:8.0f} "
+          f"{stats.mean_wait * 1000:12.1f} {stats.max_wait * 1000:11.1f}")
+
+    # A second model size over the budget pushes out the idle first one.
+    registry.memory_budget = int(args.model_mb * 1.5 * 2**20)
+    with registry.lease("small", "cpu"):
+        held = [(s.name, s.refs) for s in registry.stats()]
+    print(f"after loading 'small' with a {args.model_mb * 1.5:.0f} MB budget: "
+          f"{registry.evictions} evicted, loaded {held}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Script time and markup sent per rerun of each page, measured with AppTest.
+
+Every rerun executes the whole page script and re-sends every element it
+draws, so the run time, the serialized size of all elements and the bytes
+of HTML/CSS in markdown elements are reported. The app page is measured
+with a YouTube link entered, which draws the results section, and again
+with all six formats selected and already generated as long drafts. AppTest
+compiles the page script afresh on every run, which a server does only
+when the file changes, so its times are an upper bound::
+
+    python -m benchmarks.page_reruns --reruns 20 --draft-words 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Home.py", "pages/landing_page.py", "pages/streamlit_app.py"]
+APP = "pages/streamlit_app.py"
+FORMATS = ["Twitter Thread", "LinkedIn Post", "Blog Post", "Newsletter", "YouTube Shorts", "TikTok Script"]
+
+
+def markup_bytes(at) -> int:
+    """Bytes of markdown and HTML in the elements of the last run."""
+    return sum(len(element.value.encode()) for element in at.markdown)
+
+
+def payload_bytes(node) -> int:
+    """Serialized size of every element under ``node``."""
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None else 0
+    return size + sum(payload_bytes(child) for child in getattr(node, "children", {}).values())
+
+
+def drafts(words: int):
+    """Generated content for every format, ``words`` long each."""
+    from core.generation import GeneratedContent
+
+    paragraph = "Repurposing one episode into every platform starts with the strongest idea. " * 4
+    text = "\n\n".join([paragraph] * max(1, words // len(paragraph.split())))
+    return {name: GeneratedContent(name, f"## {name}\n\n{text}") for name in FORMATS}
+
+
+def measure(page: str, reruns: int, draft_words: int = 0):
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=60)
+    if draft_words:
+        at.session_state.generated = drafts(draft_words)
+    at.run()
+    if page == APP:
+        at.text_input[0].set_value("https://youtube.com/watch?v=demo").run()
+    if draft_words:
+        for box in at.sidebar.checkbox:
+            if box.label.split(" ", 1)[-1] in FORMATS:
+                box.check()
+        at.run()
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return 1000 * float(np.median(times)), payload_bytes(at._tree), markup_bytes(at), len(at.markdown)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--draft-words", type=int, default=2000, help="length of each generated draft")
+    args = parser.parse_args()
+
+    # Keep the pages' caches and job database out of the real cache directory.
+    os.environ.setdefault("PODCAST_AGENT_CACHE_DIR", tempfile.mkdtemp())
+    print(f"{'page':<34} {'rerun ms':>8} {'payload KB':>10} {'markup KB':>9} {'elements':>8}")
+    runs = [(page, page, 0) for page in PAGES] + [(f"{APP} (6 drafts)", APP, args.draft_words)]
+    for name, page, words in runs:
+        ms, payload, markup, count = measure(page, args.reruns, words)
+        print(f"{name:<34} {ms:8.1f} {payload / 1024:10.1f} {markup / 1024:9.1f} {count:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Wall-clock speedup of process-pool transcription over the streaming path.
+
+Usage::
+
+    python -m benchmarks.parallel_transcription --minutes 45 --workers 8
+    python -m benchmarks.parallel_transcription --fake   # no Whisper needed
+
+The baseline is :func:`core.transcription.transcribe_stream`, the path the
+app takes with one worker. ``--fake`` swaps Whisper for a stand-in that
+burns 5 ms of CPU per second of audio, so the pool's start-up and
+scheduling overhead can be weighed against work that divides across cores.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks._synthetic import speech_like, write_wav
+from core.audio import SAMPLE_RATE
+import core.models
+from core.parallel import transcribe_parallel
+from core.transcription import load_model, transcribe_stream
+
+
+_NOISE = np.random.default_rng(0).random(1 << 12)
+
+
+class FakeModel:
+    device = SimpleNamespace(type="cpu")
+    # CPU seconds spent per second of audio.
+    cost = 0.005
+
+    def transcribe(self, audio, **options):
+        # Burn this thread's CPU time rather than a fixed amount of work, so
+        # the cost is the same on any machine and still competes for cores.
+        seconds = len(audio) / SAMPLE_RATE
+        deadline = time.thread_time() + seconds * self.cost
+        while time.thread_time() < deadline:
+            np.fft.rfft(_NOISE)
+        return {"segments": [
+            {"text": f"words at {start}", "start": start, "end": min(start + 5.0, seconds)}
+            for start in np.arange(0.0, seconds, 5.0)
+        ]}
+
+
+def fake_loader(model_name):
+    return FakeModel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=45.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--fake", action="store_true", help="use a CPU-bound fake model")
+    args = parser.parse_args()
+
+    loader = fake_loader if args.fake else load_model
+    if args.fake:
+        core.models.registry.loader = lambda name, device: FakeModel()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "episode.wav")
+        write_wav(path, speech_like(args.minutes * 60))
+
+        # Load outside the timing, as the workers' start-up is part of theirs.
+        load_model(args.model)
+        start = time.perf_counter()
+        single = list(transcribe_stream(path, model_name=args.model))
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = list(transcribe_parallel(path, workers=args.workers, model_name=args.model, loader=loader))
+        parallel_time = time.perf_counter() - start
+
+    print(f"audio:           {args.minutes:.1f} min")
+    print(f"single process:  {single_time:8.2f} s  ({len(single)} segments)")
+    print(f"{args.workers:2d} workers:      {parallel_time:8.2f} s  ({len(parallel)} segments)")
+    print(f"speedup:         {single_time / parallel_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
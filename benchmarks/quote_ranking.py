@@ -0,0 +1,83 @@
+"""Run time of quote ranking on long transcripts, and whether it finds planted quotes.
+
+Synthetic episodes are plain statements built from topic words, with a
+few hand-written quotable lines planted at random. Segments are cut every
+few seconds regardless of sentence ends, as Whisper does. The report
+splits time into sentence splitting, batch scoring and top-k selection,
+and compares the heap against a full sort::
+
+    python -m benchmarks.quote_ranking --hours 1 4 12
+"""
+
+import argparse
+import heapq
+import time
+
+import numpy as np
+
+from benchmarks._transcripts import FILLER, TOPICS
+from core.quotes import TOP_K, score_sentences, split_sentences, top_quotes
+from core.transcription import Segment
+
+PLANTED = [
+    "The biggest mistake founders make is charging too little for something customers love!",
+    "Why do you never raise prices when every customer tells you the product is a bargain?",
+    "Nobody remembers your launch, but everyone remembers how you treated them when things broke.",
+    "Burnout is not a badge of honour, it is the most expensive mistake a team can make.",
+    "The secret is simple: hire people who are better than you and get out of their way.",
+    "You will never regret the hard conversations, only the ones you were too afraid to have.",
+]
+WORDS_PER_SECOND = 2.5
+
+
+def synthetic_talk(hours: float, seed: int = 0, planted_every: float = 600.0):
+    """Return segments of plain sentences with one planted quote per ``planted_every`` seconds."""
+    rng = np.random.default_rng(seed)
+    vocab = " ".join(TOPICS.values()).split()
+    words = []
+    for _ in range(int(hours * 3600 * WORDS_PER_SECOND / 12)):
+        if rng.random() < 12 / (WORDS_PER_SECOND * planted_every):
+            words += PLANTED[rng.integers(len(PLANTED))].split()
+            continue
+        sentence = [str(rng.choice(vocab if rng.random() < 0.4 else FILLER)) for _ in range(rng.integers(6, 18))]
+        words += sentence[:-1] + [sentence[-1] + "."]
+    segments = []
+    step = int(5 * WORDS_PER_SECOND)
+    for i in range(0, len(words), step):
+        t = i / WORDS_PER_SECOND
+        segments.append(Segment(" ".join(words[i:i + step]), t, t + step / WORDS_PER_SECOND))
+    return segments, len(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 12])
+    args = parser.parse_args()
+
+    planted = {quote.lower() for quote in PLANTED}
+    print(f"{'hours':>5} {'words':>9} {'split':>7} {'score':>7} {'heap':>7} {'sort':>7} {'total':>7} {'planted':>8}")
+    for hours in args.hours:
+        segments, words = synthetic_talk(hours)
+        start = time.perf_counter()
+        sentences, _ = split_sentences(segments)
+        split = time.perf_counter() - start
+        scores = score_sentences(sentences)
+        scoring = time.perf_counter() - start - split
+
+        start = time.perf_counter()
+        heapq.nlargest(TOP_K, range(len(scores)), key=scores.__getitem__)
+        heap = time.perf_counter() - start
+        start = time.perf_counter()
+        sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:TOP_K]
+        full_sort = time.perf_counter() - start
+
+        start = time.perf_counter()
+        quotes = top_quotes(segments)
+        total = time.perf_counter() - start
+        found = sum(quote.text.lower() in planted for quote in quotes)
+        print(f"{hours:5.1f} {words:9,d} {split:7.3f} {scoring:7.3f} {heap:7.4f} {full_sort:7.4f} {total:7.3f} "
+              f"{found:>3}/{min(len(PLANTED), len(quotes)):<4}")
+
+
+if __name__ == "__main__":
+    main()
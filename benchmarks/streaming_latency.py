@@ -0,0 +1,38 @@
+"""Time-to-first-token vs. time-to-complete for streamed content generation.
+
+Usage::
+
+    python -m benchmarks.streaming_latency --latency 0.5 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.stub_openai import serve
+from core.generation import CONTENT_PROMPTS, make_client, stream_all
+
+DIGEST = "Summary: a conversation about repurposing podcast episodes for every platform. " * 20
+
+
+async def run(base_url: str):
+    client = make_client(base_url=base_url, api_key="stub")
+    async with client:
+        return await stream_all(DIGEST, CONTENT_PROMPTS, lambda content_type, text: None, client=client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="stub seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="stub seconds between tokens")
+    args = parser.parse_args()
+
+    with serve(latency=args.latency, token_delay=args.token_delay) as base_url:
+        results = asyncio.run(run(base_url))
+
+    print(f"{'format':<16} {'first token':>12} {'complete':>10}")
+    for content_type, result in results.items():
+        print(f"{content_type:<16} {result.first_token_seconds:>10.2f} s {result.seconds:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
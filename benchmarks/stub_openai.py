@@ -0,0 +1,130 @@
+"""Local stand-in for the OpenAI chat-completions endpoint.
+
+Responds to ``POST /v1/chat/completions`` after a configurable delay, and
+streams word-by-word server-sent events when asked to, so the generation
+engine can be exercised and timed without network access::
+
+    python -m benchmarks.stub_openai --latency 1.5 --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub streamlit run Home.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _reply_for(body):
+    messages = body.get("messages", [])
+    prompt = messages[-1]["content"] if messages else ""
+    words = prompt.split()
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        return json.dumps({
+            "summary": " ".join(words[:60]),
+            "key_topics": sorted(set(words), key=words.count, reverse=True)[:5],
+            "quotes": [" ".join(words[i:i + 12]) for i in range(0, min(len(words), 48), 12)],
+            "chapters": [{"start": "00:00", "title": "Introduction"}],
+            "speakers": "One host.",
+        })
+    return f"Stub reply to a {len(words)}-word prompt: " + " ".join(words[:40])
+
+
+def make_handler(latency: float, token_delay: float = 0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            text = _reply_for(body)
+            prompt_tokens = sum(len(m["content"]) for m in body.get("messages", [])) // 4
+            if body.get("stream"):
+                self._stream(body, text, prompt_tokens)
+                return
+            payload = json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(text) // 4,
+                    "total_tokens": prompt_tokens + len(text) // 4,
+                },
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _stream(self, body, text, prompt_tokens):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+
+            def send(choices, usage=None):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": choices,
+                    "usage": usage,
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+
+            for word in text.split(" "):
+                send([{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}])
+                time.sleep(token_delay)
+            send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if (body.get("stream_options") or {}).get("include_usage"):
+                send([], {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(text) // 4,
+                    "total_tokens": prompt_tokens + len(text) // 4,
+                })
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@contextmanager
+def serve(latency: float = 1.0, port: int = 0, token_delay: float = 0.0):
+    """Run the stub in a background thread and yield its ``base_url``."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, token_delay))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per request")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed tokens")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.latency, args.token_delay))
+    print(f"Stub chat-completions API on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
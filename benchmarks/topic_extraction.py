@@ -0,0 +1,33 @@
+"""Run time of topic extraction as transcripts grow, with the topics found.
+
+Synthetic transcripts mix a handful of topics with filler talk, so the
+extracted topics should be drawn from the planted vocabulary::
+
+    python -m benchmarks.topic_extraction --hours 1 4 12
+"""
+
+import argparse
+import time
+
+from benchmarks._transcripts import synthetic_transcript
+from core.topics import extract_topics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 12])
+    args = parser.parse_args()
+
+    print(f"{'hours':>5} {'words':>9} {'seconds':>8}  topics")
+    for hours in args.hours:
+        segments, _ = synthetic_transcript(hours)
+        words = sum(len(seg.text.split()) for seg in segments)
+        start = time.perf_counter()
+        topics = extract_topics(segments)
+        elapsed = time.perf_counter() - start
+        names = ", ".join(f"{topic.name} ({topic.mentions})" for topic in topics)
+        print(f"{hours:5.1f} {words:9,d} {elapsed:8.3f}  {names}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Memory per hour of transcript: dict list vs. Segment list vs. columnar store.
+
+Each representation is built from the same synthetic transcript and its
+allocations are measured with ``tracemalloc``. The store is also saved,
+memory-mapped back and queried by time to show random access on disk::
+
+    python -m benchmarks.transcript_memory --hours 1 4 12
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks._transcripts import synthetic_transcript
+from core.store import TranscriptStore
+from core.transcription import Segment
+
+
+def measure(build):
+    """Return ``(result, bytes allocated and still held)`` for ``build()``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'hours':>5} {'segments':>8} {'dicts MB/h':>10} {'tuples MB/h':>11} {'store MB/h':>10} "
+          f"{'file MB':>7} {'open ms':>7} {'lookup us':>9}")
+    for hours in args.hours:
+        segments, _ = synthetic_transcript(hours)
+        rows = [(seg.text, seg.start, seg.end) for seg in segments]
+        # Fresh strings per representation, as each would come from its own source.
+        _, dicts = measure(lambda: [{"text": text.encode().decode(), "start": s, "end": e, "speaker": None} for text, s, e in rows])
+        _, tuples = measure(lambda: [Segment(text.encode().decode(), s, e) for text, s, e in rows])
+        store, columnar = measure(lambda: TranscriptStore.from_segments(segments))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "transcript.store")
+            store.save(path)
+            size = os.path.getsize(path)
+            start = time.perf_counter()
+            mapped = TranscriptStore.open(path)
+            opened = time.perf_counter() - start
+            times = np.random.default_rng(0).uniform(0, hours * 3600, args.lookups)
+            start = time.perf_counter()
+            for t in times:
+                mapped[max(0, mapped.index_at(t))]
+            lookup = (time.perf_counter() - start) / args.lookups
+            assert list(mapped) == list(store)
+            del mapped
+
+        mb = 1024 * 1024 * hours
+        print(f"{hours:5.1f} {len(segments):8,d} {dicts / mb:10.2f} {tuples / mb:11.2f} {columnar / mb:10.3f} "
+              f"{size / 1024 / 1024:7.2f} {opened * 1000:7.2f} {lookup * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
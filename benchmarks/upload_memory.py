@@ -0,0 +1,100 @@
+"""Peak memory of concurrent upload ingestion: naive copies vs. spool + mmap.
+
+Simulates ``--sessions`` users each uploading a ``--size-mb`` file at once.
+The naive path does what passing ``UploadedFile`` around costs (``read()``
+the whole file, hash it, hand a copy to the decoder); the spooled path uses
+:mod:`core.ingest`. Peak anonymous RSS is sampled from ``/proc`` (Linux)::
+
+    python -m benchmarks.upload_memory --sessions 12 --size-mb 200
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from core.ingest import MappedAudio, spool_upload
+
+
+def rss_anon_mb() -> float:
+    """Anonymous (non file-backed) resident memory of this process in MB."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class PeakSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = self.baseline = rss_anon_mb()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, rss_anon_mb())
+            time.sleep(0.005)
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        return self.peak - self.baseline
+
+
+def naive(upload: io.BytesIO, spool_dir: str) -> None:
+    data = upload.read()
+    hashlib.sha256(data).hexdigest()
+    pcm = np.frombuffer(bytes(data), dtype=np.int16).astype(np.float32)
+    pcm.sum()
+
+
+def spooled(upload: io.BytesIO, spool_dir: str) -> None:
+    path = spool_upload(upload, spool_dir)
+    try:
+        with MappedAudio(path) as audio:
+            audio.sha256()
+            for block in audio.blocks():
+                np.frombuffer(block, dtype=np.int16).astype(np.float32).sum()
+    finally:
+        os.remove(path)
+
+
+def measure(fn, uploads, spool_dir) -> float:
+    for upload in uploads:
+        upload.seek(0)
+    sampler = PeakSampler()
+    sampler.start()
+    threads = [threading.Thread(target=fn, args=(upload, spool_dir)) for upload in uploads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sampler.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--size-mb", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = np.random.default_rng(0).integers(-2000, 2000, args.size_mb * 512 * 1024, dtype=np.int16).tobytes()
+    # Streamlit already holds each upload in memory; both paths share that cost.
+    uploads = [io.BytesIO(payload) for _ in range(args.sessions)]
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spooled_peak = measure(spooled, uploads, spool_dir)
+        naive_peak = measure(naive, uploads, spool_dir)
+
+    print(f"{args.sessions} sessions x {args.size_mb} MB uploads (beyond the uploads themselves)")
+    print(f"naive copies:   peak +{naive_peak:8.1f} MB")
+    print(f"spool + mmap:   peak +{spooled_peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Voice-activity detection throughput and the transcription time it saves.
+
+Builds an episode of speech broken up by long pauses and hum (``--silence``
+is the fraction of non-speech), measures how fast the detector runs over
+it, then times streaming transcription with and without skipping silence::
+
+    python -m benchmarks.vad_skip --minutes 45 --silence 0.3
+    python -m benchmarks.vad_skip --fake   # no Whisper needed
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import core.models
+from benchmarks._synthetic import speech_like, write_wav
+from benchmarks.parallel_transcription import FakeModel
+from core.audio import SAMPLE_RATE, decode_audio
+from core.transcription import transcribe_stream
+from core.vad import VoiceActivityDetector
+
+
+class RealtimeFakeModel(FakeModel):
+    """Stand-in that, like Whisper on a CPU, costs time per second of audio."""
+
+    def transcribe(self, audio, **options):
+        time.sleep(len(audio) / SAMPLE_RATE / 20)
+        return super().transcribe(audio, **options)
+
+
+def episode(minutes: float, silence: float, seed: int = 0) -> np.ndarray:
+    """Alternate 20-90 s of speech with pauses of room noise or mains hum."""
+    rng = np.random.default_rng(seed)
+    parts, total = [], int(minutes * 60 * SAMPLE_RATE)
+    while sum(len(p) for p in parts) < total:
+        talk = rng.uniform(20, 90)
+        parts.append(speech_like(talk, seed=len(parts)))
+        gap = int(talk * silence / (1 - silence) * SAMPLE_RATE)
+        pause = rng.normal(0, 0.003, gap).astype(np.float32)
+        if len(parts) % 4 == 1:
+            pause += 0.05 * np.sin(2 * np.pi * 50 * np.arange(gap) / SAMPLE_RATE).astype(np.float32)
+        parts.append(pause)
+    return np.concatenate(parts)[:total]
+
+
+def timed_transcription(path: str, vad=None):
+    start = time.perf_counter()
+    segments = list(transcribe_stream(path, vad=vad))
+    return time.perf_counter() - start, len(segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=45.0)
+    parser.add_argument("--silence", type=float, default=0.3, help="fraction of the episode without speech")
+    parser.add_argument("--fake", action="store_true", help="use a fake model running at 20x real time")
+    args = parser.parse_args()
+
+    if args.fake:
+        core.models.registry.loader = lambda name, device: RealtimeFakeModel()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "episode.wav")
+        write_wav(path, episode(args.minutes, args.silence))
+
+        blocks = list(decode_audio(path))
+        vad = VoiceActivityDetector()
+        start = time.perf_counter()
+        for _ in vad.drop_silence(blocks):
+            pass
+        vad_time = time.perf_counter() - start
+
+        full_time, full_segments = timed_transcription(path)
+        vad = VoiceActivityDetector()
+        skip_time, skip_segments = timed_transcription(path, vad)
+
+    audio_seconds = args.minutes * 60
+    print(f"audio:               {args.minutes:.1f} min, {args.silence:.0%} without speech")
+    print(f"VAD throughput:      {audio_seconds / vad_time:8.0f} audio-seconds per second")
+    print(f"skipped by VAD:      {vad.skipped_fraction:8.1%}")
+    print(f"transcribe all:      {full_time:8.2f} s  ({full_segments} segments)")
+    print(f"transcribe speech:   {skip_time:8.2f} s  ({skip_segments} segments)")
+    print(f"time saved:          {1 - skip_time / full_time:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Top-k latency and memory of the brute-force vector index at 1M chunks.
+
+Random unit vectors fill a float32 and an int8 index of the same size.
+Queries are noisy copies of stored rows, so each has a known nearest
+neighbour; recall@k of the int8 index is measured against the float32
+results. The hashing embedder's throughput is measured on synthetic
+transcript chunks::
+
+    python -m benchmarks.vector_retrieval --chunks 100000 1000000 --dim 256
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._transcripts import synthetic_transcript
+from core.retrieval import HashingEmbedder, VectorIndex, chunk_segments, normalize
+
+BATCH = 100_000
+
+
+def median_ms(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return 1000 * float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 6, 32])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    segments, _ = synthetic_transcript(12)
+    chunks = chunk_segments(segments)
+    start = time.perf_counter()
+    HashingEmbedder(args.dim).embed([chunk.text for chunk in chunks])
+    elapsed = time.perf_counter() - start
+    print(f"hashing embedder: {len(chunks):,} chunks (12 h) in {elapsed * 1000:.0f} ms, "
+          f"{len(chunks) / elapsed:,.0f} chunks/s")
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>9} {'mode':>7} {'MB':>7} {'add s':>6} " + " ".join(f"{f'q={b} ms':>9}" for b in args.batches)
+          + f" {'recall@' + str(args.k):>9}")
+    for n in args.chunks:
+        indexes = {"float32": VectorIndex(args.dim), "int8": VectorIndex(args.dim, quantized=True)}
+        adds = dict.fromkeys(indexes, 0.0)
+        targets = rng.choice(n, size=max(args.batches), replace=False)
+        queries = np.empty((len(targets), args.dim), dtype=np.float32)
+        for first in range(0, n, BATCH):
+            vectors = normalize(rng.standard_normal((min(BATCH, n - first), args.dim), dtype=np.float32))
+            mine = (targets >= first) & (targets < first + len(vectors))
+            queries[mine] = vectors[targets[mine] - first]
+            for mode, index in indexes.items():
+                started = time.perf_counter()
+                index.add(vectors)
+                adds[mode] += time.perf_counter() - started
+        queries += rng.normal(0, 0.5 / np.sqrt(args.dim), queries.shape).astype(np.float32)
+
+        exact = indexes["float32"].search(queries, args.k)[1]
+        for mode, index in indexes.items():
+            latencies = [median_ms(lambda: index.search(queries[:b], args.k), args.repeats) for b in args.batches]
+            found = index.search(queries, args.k)[1]
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(found, exact)])
+            top1 = np.mean(found[:, 0] == targets)
+            print(f"{n:9,d} {mode:>7} {index.nbytes / 1e6:7.0f} {adds[mode]:6.2f} "
+                  + " ".join(f"{ms:9.1f}" for ms in latencies) + f" {recall:9.3f}  (top-1 {top1:.0%})")
+        del indexes
+
+
+if __name__ == "__main__":
+    main()
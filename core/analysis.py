@@ -0,0 +1,161 @@
+"""Single analysis pass that condenses a transcript into a reusable digest.
+
+The transcript is sent to the model once to extract key topics, quotable
+moments, a chapter outline and a speaker summary. Every content generator
+then works from that digest instead of the raw transcript, so prompt tokens
+no longer scale with the number of selected formats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence
+
+from core.generation import DEFAULT_CHAT_MODEL, complete, make_client
+from core.llm_cache import ResponseCache
+from core.summarize import CHUNK_TOKENS, FAN_OUT, map_reduce_summarize
+from core.tokens import estimate_tokens
+from core.transcription import Segment, format_timestamp, parse_timestamp, segment_line
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Transcripts above this are condensed with map-reduce before analysis.
+MAX_INPUT_TOKENS = 100_000
+
+_QUOTES_FIELD = '  "quotes": up to 8 verbatim, self-contained quotable lines,\n'
+ANALYSIS_PROMPT = (
+    "Analyse this timestamped podcast transcript and reply with a JSON object "
+    "with these keys:\n"
+    '  "summary": a 3-5 sentence summary of the episode,\n'
+    '  "key_topics": up to 8 short topic names, most important first,\n'
+    + _QUOTES_FIELD +
+    '  "chapters": a list of {"start": "MM:SS", "title": "..."} covering the episode,\n'
+    '  "speakers": one or two sentences on who speaks and their roles.\n'
+    "Use only what is said in the transcript."
+)
+
+
+class Chapter(NamedTuple):
+    title: str
+    start: float
+
+
+@dataclass
+class TranscriptDigest:
+    summary: str = ""
+    key_topics: List[str] = field(default_factory=list)
+    quotes: List[str] = field(default_factory=list)
+    chapters: List[Chapter] = field(default_factory=list)
+    speakers: str = ""
+
+    @classmethod
+    def from_json(cls, raw: str) -> "TranscriptDigest":
+        """Parse the model's JSON reply, keeping whatever fields are usable."""
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            return cls(summary=raw.strip())
+        if not isinstance(data, dict):
+            return cls(summary=raw.strip())
+        chapters = []
+        for chapter in data.get("chapters") or []:
+            if isinstance(chapter, dict) and chapter.get("title"):
+                chapters.append(Chapter(str(chapter["title"]), parse_timestamp(str(chapter.get("start", "0")))))
+        return cls(
+            summary=str(data.get("summary") or ""),
+            key_topics=[str(t) for t in data.get("key_topics") or []],
+            quotes=[str(q) for q in data.get("quotes") or []],
+            chapters=chapters,
+            speakers=str(data.get("speakers") or ""),
+        )
+
+    def to_prompt(self) -> str:
+        """Render the digest as the compact source text for generators."""
+        lines = [f"Summary: {self.summary}"]
+        if self.key_topics:
+            lines.append("Key topics: " + "; ".join(self.key_topics))
+        if self.quotes:
+            lines.append("Quotable moments:")
+            lines.extend(f'- "{quote}"' for quote in self.quotes)
+        if self.chapters:
+            lines.append("Chapters:")
+            lines.extend(f"- [{format_timestamp(c.start)}] {c.title}" for c in self.chapters)
+        if self.speakers:
+            lines.append(f"Speakers: {self.speakers}")
+        return "\n".join(lines)
+
+
+@dataclass
+class AnalysisResult:
+    digest: TranscriptDigest
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AnalysisResult":
+        digest = dict(data["digest"])
+        digest["chapters"] = [Chapter(*chapter) for chapter in digest.get("chapters", [])]
+        return cls(TranscriptDigest(**digest), data.get("prompt_tokens", 0), data.get("completion_tokens", 0))
+
+
+def timestamped_text(segments: Sequence[Segment]) -> str:
+    """Render segments one per line, prefixed with their start time and speaker."""
+    return "\n".join(segment_line(seg) for seg in segments)
+
+
+async def analyze_transcript(
+    segments: Sequence[Segment],
+    client: Optional[AsyncOpenAI] = None,
+    model: str = DEFAULT_CHAT_MODEL,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+    chunk_tokens: int = CHUNK_TOKENS,
+    fan_out: int = FAN_OUT,
+    cache: Optional[ResponseCache] = None,
+    local_quotes: bool = False,
+) -> AnalysisResult:
+    """Run the shared analysis pass over ``segments``.
+
+    Transcripts over ``max_input_tokens`` are first condensed with
+    :func:`core.summarize.map_reduce_summarize`; its token usage is included
+    in the result. With ``local_quotes`` the model is not asked for quotes,
+    because :mod:`core.quotes` has already ranked them.
+    """
+    owns_client = client is None
+    client = client or make_client()
+    result = AnalysisResult(TranscriptDigest())
+    try:
+        source = timestamped_text(segments)
+        if estimate_tokens(source) > max_input_tokens:
+            condensed = await map_reduce_summarize(
+                segments, client, model, chunk_tokens=chunk_tokens, fan_out=fan_out, cache=cache
+            )
+            source = condensed.text
+            result.prompt_tokens += condensed.prompt_tokens
+            result.completion_tokens += condensed.completion_tokens
+        prompt = ANALYSIS_PROMPT.replace(_QUOTES_FIELD, "") if local_quotes else ANALYSIS_PROMPT
+        messages = [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": source},
+        ]
+        text, prompt_tokens, completion_tokens = await complete(
+            client, messages, model, cache=cache, response_format={"type": "json_object"}
+        )
+    finally:
+        if owns_client:
+            await client.close()
+    result.digest = TranscriptDigest.from_json(text)
+    result.prompt_tokens += prompt_tokens
+    result.completion_tokens += completion_tokens
+    return result
+
+
+def run_analysis(segments: Sequence[Segment], **kwargs) -> AnalysisResult:
+    """Blocking wrapper around :func:`analyze_transcript` for Streamlit scripts."""
+    return asyncio.run(analyze_transcript(segments, **kwargs))
+
@@ -0,0 +1,69 @@
+"""Page stylesheets and HTML fragments, minified once per process.
+
+Streamlit runs a page script top to bottom on every interaction and
+re-sends every element the run draws, page CSS and large HTML blocks
+included. Stylesheets and templates therefore live as files under
+``static/`` and are read and minified on first use, and inline markup is
+minified the same way. Every result is memoized on its content, so later
+reruns only look up strings that were already built.
+
+Elements still have to be drawn on every run, since Streamlit removes any
+element a run leaves out; what shrinks is the work and the bytes per rerun.
+"""
+
+from __future__ import annotations
+
+import html
+import os
+import re
+from functools import lru_cache
+from string import Template
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+# Distinct rendered fragments and inline blocks kept per process.
+FRAGMENT_CACHE_SIZE = 256
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+# Whitespace between tags that spans a line break is only indentation.
+_TAG_INDENT = re.compile(r">\s*\n\s*<")
+_SPACE = re.compile(r"\s+")
+
+
+def minify_css(css: str) -> str:
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_PUNCTUATION.sub(r"\1", _SPACE.sub(" ", css))
+    return css.replace(";}", "}").replace(": ", ":").strip()
+
+
+def minify_html(markup: str) -> str:
+    return _SPACE.sub(" ", _TAG_INDENT.sub("><", _HTML_COMMENT.sub("", markup))).strip()
+
+
+def _read(*parts: str) -> str:
+    with open(os.path.join(STATIC_DIR, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def stylesheet(name: str) -> str:
+    """A ``<style>`` element holding the minified ``static/css/<name>``."""
+    return f"<style>{minify_css(_read('css', name))}</style>"
+
+
+@lru_cache(maxsize=None)
+def _template(name: str) -> Template:
+    return Template(minify_html(_read("html", name)))
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def fragment(name: str, **values) -> str:
+    """The template ``static/html/<name>`` with its ``$placeholders`` set to escaped ``values``."""
+    return _template(name).substitute({key: html.escape(str(value)) for key, value in values.items()})
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def markup(text: str) -> str:
+    """Minified inline HTML, memoized on its content."""
+    return minify_html(text)
@@ -0,0 +1,214 @@
+"""Streaming decode, downmix and resample to Whisper's 16 kHz mono float32.
+
+Audio is read a block at a time and converted with vectorized NumPy, so
+memory use is bounded by the block size rather than the episode length. PCM
+WAV files are read straight from a memory map; everything else is decoded by
+ffmpeg at its native rate and channel count and converted here.
+"""
+
+from __future__ import annotations
+
+import struct
+import subprocess
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from core.ingest import MappedAudio
+
+SAMPLE_RATE = 16000
+BLOCK_SECONDS = 5.0
+
+# Taps in the anti-aliasing filter applied before downsampling.
+_FILTER_TAPS = 63
+
+
+class StreamFormat(NamedTuple):
+    sample_rate: int
+    channels: int
+
+
+class Resampler:
+    """Stateful linear-interpolation resampler for a stream of mono blocks.
+
+    When downsampling, a windowed-sinc low-pass filter runs first so content
+    above the new Nyquist frequency does not alias. Filter history and the
+    fractional read position carry over between blocks, so block boundaries
+    are seamless.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = SAMPLE_RATE):
+        self.step = source_rate / target_rate
+        self._position = 0.0
+        self._previous: Optional[np.ndarray] = None
+        self._kernel = None
+        if source_rate > target_rate:
+            n = np.arange(_FILTER_TAPS) - (_FILTER_TAPS - 1) / 2
+            cutoff = 0.5 * target_rate / source_rate
+            kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(_FILTER_TAPS)
+            self._kernel = (kernel / kernel.sum()).astype(np.float32)
+            self._history = np.zeros(_FILTER_TAPS - 1, dtype=np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self.step == 1.0:
+            return block
+        if self._kernel is not None:
+            padded = np.concatenate((self._history, block))
+            self._history = padded[len(padded) - (_FILTER_TAPS - 1):]
+            block = np.convolve(padded, self._kernel, mode="valid").astype(np.float32)
+
+        # Keep the last input sample so interpolation can span the boundary.
+        buf = block if self._previous is None else np.concatenate((self._previous, block))
+        last = len(buf) - 1
+        if last < self._position:
+            self._position -= len(block)
+            self._previous = buf[-1:]
+            return np.empty(0, dtype=np.float32)
+
+        count = int((last - self._position) // self.step) + 1
+        positions = self._position + self.step * np.arange(count)
+        index = positions.astype(np.int64)
+        frac = (positions - index).astype(np.float32)
+        upper = np.minimum(index + 1, last)
+        out = buf[index] * (1 - frac) + buf[upper] * frac
+
+        self._position = self._position + self.step * count - last
+        self._previous = buf[-1:]
+        return out.astype(np.float32, copy=False)
+
+
+def to_mono(block: np.ndarray, channels: int) -> np.ndarray:
+    """Average interleaved ``channels`` into one."""
+    if channels == 1:
+        return block
+    return block[: len(block) - len(block) % channels].reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+
+def rechunk(blocks: Iterable[np.ndarray], size: int) -> Iterator[np.ndarray]:
+    """Regroup blocks into arrays of exactly ``size`` samples (the last may be short)."""
+    buf = np.empty(size, dtype=np.float32)
+    filled = 0
+    for block in blocks:
+        pos = 0
+        while pos < len(block):
+            take = min(size - filled, len(block) - pos)
+            buf[filled:filled + take] = block[pos:pos + take]
+            filled += take
+            pos += take
+            if filled == size:
+                yield buf
+                buf = np.empty(size, dtype=np.float32)
+                filled = 0
+    if filled:
+        yield buf[:filled]
+
+
+def _wav_layout(header: memoryview):
+    """Return ``(format, channels, rate, bits, data_offset, data_size)`` or None."""
+    if len(header) < 12 or bytes(header[:4]) != b"RIFF" or bytes(header[8:12]) != b"WAVE":
+        return None
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(header):
+        chunk_id = bytes(header[pos:pos + 4])
+        size = struct.unpack_from("<I", header, pos + 4)[0]
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", header, pos + 8)
+        elif chunk_id == b"data" and fmt is not None:
+            tag, channels, rate, _, _, bits = fmt
+            return tag, channels, rate, bits, pos + 8, min(size, len(header) - pos - 8)
+        pos += 8 + size + (size & 1)
+    return None
+
+
+def _wav_blocks(path: str, block_seconds: float) -> Optional[Iterator[np.ndarray]]:
+    """Decode 16-bit integer or 32-bit float PCM WAV from a memory map."""
+    audio = MappedAudio(path)
+    with audio.view() as header:
+        layout = _wav_layout(header)
+    if layout is None or (layout[0], layout[3]) not in ((1, 16), (3, 32)):
+        audio.close()
+        return None
+    tag, channels, rate, bits, offset, size = layout
+    dtype = np.dtype("<i2") if tag == 1 else np.dtype("<f4")
+    frame_bytes = channels * dtype.itemsize
+    block_bytes = max(1, int(block_seconds * rate)) * frame_bytes
+
+    def blocks() -> Iterator[np.ndarray]:
+        resampler = Resampler(rate)
+        try:
+            for start in range(offset, offset + size - size % frame_bytes, block_bytes):
+                end = min(start + block_bytes, offset + size - size % frame_bytes)
+                with audio.view(start, end) as raw:
+                    pcm = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+                if tag == 1:
+                    pcm /= 32768.0
+                yield resampler.process(to_mono(pcm, channels))
+        finally:
+            audio.close()
+
+    return blocks()
+
+
+def probe_format(path: str) -> Optional[StreamFormat]:
+    """Return the first audio stream's native rate and channel count via ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "stream=sample_rate,channels",
+        "-of", "default=noprint_wrappers=1",
+        path,
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, text=True).stdout
+        fields = dict(line.split("=", 1) for line in out.split() if "=" in line)
+        return StreamFormat(int(fields["sample_rate"]), int(fields["channels"]))
+    except (OSError, subprocess.CalledProcessError, KeyError, ValueError):
+        return None
+
+
+def _ffmpeg_blocks(path: str, block_seconds: float) -> Iterator[np.ndarray]:
+    """Decode any container with ffmpeg, converting to 16 kHz mono in NumPy.
+
+    Without ffprobe the native format is unknown, so ffmpeg is asked to
+    downmix and resample itself.
+    """
+    fmt = probe_format(path)
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le"]
+    if fmt is None:
+        fmt = StreamFormat(SAMPLE_RATE, 1)
+        cmd += ["-ac", "1", "-ar", str(SAMPLE_RATE)]
+    cmd.append("-")
+
+    resampler = Resampler(fmt.sample_rate)
+    block = bytearray(max(1, int(block_seconds * fmt.sample_rate)) * fmt.channels * 2)
+    view = memoryview(block)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            filled = 0
+            while filled < len(block):
+                read = proc.stdout.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+            usable = filled - filled % (2 * fmt.channels)
+            if usable:
+                pcm = np.frombuffer(block, dtype="<i2", count=usable // 2).astype(np.float32) / 32768.0
+                yield resampler.process(to_mono(pcm, fmt.channels))
+            if filled < len(block):
+                break
+        stderr = proc.stderr.read().decode(errors="ignore").strip()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {stderr}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def decode_audio(path: str, block_seconds: float = BLOCK_SECONDS) -> Iterator[np.ndarray]:
+    """Yield ``path`` as fixed-size blocks of 16 kHz mono float32 samples."""
+    blocks = _wav_blocks(path, block_seconds) if path.lower().endswith(".wav") else None
+    if blocks is None:
+        blocks = _ffmpeg_blocks(path, block_seconds)
+    return rechunk(blocks, int(block_seconds * SAMPLE_RATE))
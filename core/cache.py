@@ -0,0 +1,147 @@
+"""Content-addressed, disk-backed cache of finished transcripts.
+
+Entries are keyed by a SHA-256 of the audio bytes plus the settings that
+change what Whisper produces, so re-uploading an episode or toggling display
+options reuses the earlier transcript. Each entry holds the columns of a
+:class:`core.store.TranscriptStore` in a small compressed ``.npz`` file and
+the directory is kept under a byte budget by evicting the least recently
+used entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, BinaryIO, Iterable, List, Optional, Union
+
+from core.ingest import BLOCK_SIZE, MappedAudio, iter_buffer
+
+if TYPE_CHECKING:
+    from core.transcription import Segment
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "PODCAST_AGENT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "podcast-to-content-agent"),
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def hash_audio(source: Union[str, "os.PathLike[str]", BinaryIO]) -> str:
+    """Return the hex SHA-256 of an audio file without copying it into memory.
+
+    Paths are hashed through a memory map and in-memory uploads through
+    slices of their own buffer.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with MappedAudio(os.fspath(source)) as audio:
+            return audio.sha256()
+
+    digest = hashlib.sha256()
+    if hasattr(source, "getvalue"):
+        for block in iter_buffer(source):
+            digest.update(block)
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(BLOCK_SIZE), b""):
+            digest.update(block)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(audio_hash: str, model_name: str, language: Optional[str] = None, **options) -> str:
+    """Combine an audio hash with the transcription settings into one key."""
+    settings = json.dumps(
+        {"model": model_name, "language": language, **options},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(f"{audio_hash}:{settings}".encode()).hexdigest()
+
+
+def hash_transcript(segments: Iterable[Segment]) -> str:
+    """Return the hex SHA-256 of a transcript's text and timing."""
+    digest = hashlib.sha256()
+    for seg in segments:
+        digest.update(f"{seg.start:.2f}\x1f{seg.speaker or ''}\x1f{seg.text}\x1e".encode())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """LRU, size-bounded store of transcripts under ``directory``."""
+
+    def __init__(self, directory: str = os.path.join(DEFAULT_CACHE_DIR, "transcripts"),
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[List[Segment]]:
+        # Imported here so that modules needing only DEFAULT_CACHE_DIR or the
+        # hash helpers do not load numpy.
+        import numpy as np
+
+        from core.store import TranscriptStore
+
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                store = TranscriptStore.from_columns({name: data[name] for name in data.files})
+            # Touching the file marks it as recently used for eviction.
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return list(store)
+
+    def put(self, key: str, segments: List[Segment]) -> None:
+        import numpy as np
+
+        from core.store import TranscriptStore
+
+        columns = TranscriptStore.from_segments(segments).columns()
+
+        # Write to a temp file first so readers never see a partial entry.
+        handle, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,125 @@
+"""Chapter detection by lexical topic shift (TextTiling-style).
+
+The transcript is cut into blocks of about ``BLOCK_WORDS`` content words.
+At every block boundary the words of the ``WINDOW_BLOCKS`` blocks before it
+are compared with those after it; a boundary where the similarity dips well
+below its surroundings is a topic change. Term vectors are kept sparse as
+``(row, term, count)`` triples and every step is a NumPy sort or bincount,
+so the cost grows about linearly with transcript length.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+from core.analysis import Chapter
+from core.text import Vocabulary, sparse_counts, tokenize
+from core.transcription import Segment
+
+BLOCK_WORDS = 40
+WINDOW_BLOCKS = 6
+MIN_CHAPTER_SECONDS = 120.0
+TITLE_WORDS = 3
+
+
+def _window_vectors(blocks: np.ndarray, terms: np.ndarray, counts: np.ndarray, n_terms: int,
+                    offsets: Iterable[int], n_gaps: int):
+    """Sum block vectors into one sparse vector per gap, ``gap = block + offset``."""
+    offsets = list(offsets)
+    gaps = np.concatenate([blocks + offset for offset in offsets])
+    tiled_terms = np.tile(terms, len(offsets))
+    tiled_counts = np.tile(counts, len(offsets))
+    valid = (gaps >= 1) & (gaps < n_gaps)
+    keys, inverse = np.unique(gaps[valid] * n_terms + tiled_terms[valid], return_inverse=True)
+    return keys, np.bincount(inverse, weights=tiled_counts[valid])
+
+
+def gap_similarity(blocks: np.ndarray, terms: np.ndarray, n_blocks: int, n_terms: int,
+                   window: int = WINDOW_BLOCKS) -> np.ndarray:
+    """Cosine similarity across each block boundary; entry ``g`` is the gap before block ``g``."""
+    rows, term_ids, counts = sparse_counts(blocks, terms, n_terms)
+    # Gap g sees blocks g-window..g-1 on its left and g..g+window-1 on its right.
+    left_keys, left = _window_vectors(rows, term_ids, counts, n_terms, range(1, window + 1), n_blocks)
+    right_keys, right = _window_vectors(rows, term_ids, counts, n_terms, range(0, -window, -1), n_blocks)
+
+    _, li, ri = np.intersect1d(left_keys, right_keys, assume_unique=True, return_indices=True)
+    dot = np.bincount(left_keys[li] // n_terms, weights=left[li] * right[ri], minlength=n_blocks)
+    left_norm = np.sqrt(np.bincount(left_keys // n_terms, weights=left * left, minlength=n_blocks))
+    right_norm = np.sqrt(np.bincount(right_keys // n_terms, weights=right * right, minlength=n_blocks))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        similarity = np.nan_to_num(dot / (left_norm * right_norm))
+    similarity[0] = 1.0
+    return similarity
+
+
+def depth_scores(similarity: np.ndarray, window: int = WINDOW_BLOCKS) -> np.ndarray:
+    """How far each gap's similarity dips below the highest points on either side."""
+    padded = np.pad(similarity, window, mode="edge")
+    views = np.lib.stride_tricks.sliding_window_view(padded, window + 1)
+    left_peak = views[:len(similarity)].max(axis=1)
+    right_peak = views[window:window + len(similarity)].max(axis=1)
+    return left_peak + right_peak - 2 * similarity
+
+
+def _titles(blocks: np.ndarray, terms: np.ndarray, chapter_of_block: np.ndarray, n_chapters: int,
+            vocabulary: Vocabulary) -> List[str]:
+    """Title each chapter with its most distinctive words (TF-IDF across chapters)."""
+    rows, term_ids, counts = sparse_counts(chapter_of_block[blocks], terms, len(vocabulary))
+    document_frequency = np.bincount(term_ids, minlength=len(vocabulary))
+    scores = counts * np.log((1 + n_chapters) / (1 + document_frequency[term_ids]))
+    # Sort by chapter, then by score descending, and take the first few of each.
+    order = np.lexsort((-scores, rows))
+    titles = [[] for _ in range(n_chapters)]
+    for row, term in zip(rows[order], term_ids[order]):
+        if len(titles[row]) < TITLE_WORDS:
+            titles[row].append(vocabulary.terms[term])
+    return [", ".join(words).title() if words else "Chapter" for words in titles]
+
+
+def detect_chapters(
+    segments: Sequence[Segment],
+    block_words: int = BLOCK_WORDS,
+    window: int = WINDOW_BLOCKS,
+    min_seconds: float = MIN_CHAPTER_SECONDS,
+) -> List[Chapter]:
+    """Split a timed transcript into titled chapters at topic shifts."""
+    vocabulary = Vocabulary()
+    term_arrays, times = [], []
+    for seg in segments:
+        ids = vocabulary.encode(tokenize(seg.text))
+        term_arrays.append(ids)
+        times.append(np.full(len(ids), seg.start))
+    if not term_arrays or not len(vocabulary):
+        return [Chapter("Introduction", segments[0].start)] if segments else []
+
+    terms = np.concatenate(term_arrays)
+    word_times = np.concatenate(times)
+    blocks = np.arange(len(terms)) // block_words
+    n_blocks = int(blocks[-1]) + 1
+    block_start = word_times[::block_words]
+
+    boundaries = [0]
+    if n_blocks > 2:
+        depth = depth_scores(gap_similarity(blocks, terms, n_blocks, len(vocabulary), window), window)
+        depth[0] = 0.0
+        # TextTiling's cut-off: deeper than the mean by half a standard deviation.
+        cutoff = depth[1:].mean() + depth[1:].std() / 2
+        # Strongest shifts first, skipping any too close to one already taken.
+        taken_times = [float(block_start[0])]
+        for gap in np.argsort(-depth, kind="stable"):
+            if depth[gap] <= cutoff or depth[gap] <= 0:
+                break
+            start = float(block_start[gap])
+            if all(abs(start - t) >= min_seconds for t in taken_times) and \
+                    float(word_times[-1]) - start >= min_seconds:
+                boundaries.append(int(gap))
+                taken_times.append(start)
+        boundaries.sort()
+
+    chapter_of_block = np.zeros(n_blocks, dtype=np.int64)
+    chapter_of_block[boundaries[1:]] = 1
+    chapter_of_block = np.cumsum(chapter_of_block)
+    titles = _titles(blocks, terms, chapter_of_block, len(boundaries), vocabulary)
+    return [Chapter(title, float(block_start[gap])) for title, gap in zip(titles, boundaries)]
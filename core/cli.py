@@ -0,0 +1,249 @@
+"""Batch command line: process a directory or manifest of episodes without the UI.
+
+Usage::
+
+    python -m core episodes/ --formats "Twitter Thread" "Blog Post" --concurrency 4
+    python -m core manifest.txt --output out/ --formats all
+
+Each episode gets ``<output>/<name>/`` (see :func:`episode_names`) with
+``transcript.json``, ``content.json`` and ``content.md``. ``content.json``
+is written last, so an episode that has it is complete and is skipped when
+the command is re-run after a crash; transcripts of half-finished episodes
+come back from the transcript cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+AUDIO_EXTENSIONS = (".mp3", ".mp4", ".wav", ".m4a")
+DEFAULT_FORMATS = ["Twitter Thread", "LinkedIn Post", "Blog Post"]
+
+
+def find_episodes(inputs: List[str]) -> List[str]:
+    """Expand directories and manifest files into a list of audio paths."""
+    episodes = []
+    for item in inputs:
+        if os.path.isdir(item):
+            episodes.extend(
+                os.path.join(item, name)
+                for name in sorted(os.listdir(item))
+                if name.lower().endswith(AUDIO_EXTENSIONS)
+            )
+        elif item.lower().endswith(AUDIO_EXTENSIONS):
+            episodes.append(item)
+        elif item.lower().endswith(".json"):
+            base = os.path.dirname(item)
+            with open(item) as f:
+                episodes.extend(os.path.join(base, path) for path in json.load(f))
+        else:
+            base = os.path.dirname(item)
+            with open(item) as f:
+                episodes.extend(
+                    os.path.join(base, line.strip())
+                    for line in f
+                    if line.strip() and not line.lstrip().startswith("#")
+                )
+    # A file listed twice (say, in a directory and a manifest) is processed once.
+    unique = {}
+    for path in episodes:
+        unique.setdefault(os.path.abspath(path), path)
+    return list(unique.values())
+
+
+def episode_names(episodes: List[str]) -> Dict[str, str]:
+    """Output folder name for each episode: its file name without extension.
+
+    Episodes that share a file name (``a/ep1.mp3`` and ``b/ep1.mp3``) get a
+    short hash of their absolute path appended, so neither overwrites the
+    other or is taken for already done.
+    """
+    stems = {path: os.path.splitext(os.path.basename(path))[0] for path in episodes}
+    counts: Dict[str, int] = {}
+    for stem in stems.values():
+        counts[stem] = counts.get(stem, 0) + 1
+    return {
+        path: stem if counts[stem] == 1
+        else f"{stem}-{hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]}"
+        for path, stem in stems.items()
+    }
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _to_markdown(name: str, analysis, generated, chapters, quotes) -> str:
+    from core.transcription import format_timestamp
+
+    lines = [f"# {name}", ""]
+    if analysis is not None:
+        lines += ["## Summary", "", analysis.digest.summary, ""]
+    # Detected chapters have exact start times; the analysis outline is the fallback.
+    chapters = chapters or (analysis.digest.chapters if analysis is not None else [])
+    if chapters:
+        lines += ["## Chapters", ""]
+        lines += [f"- {format_timestamp(c.start)} {c.title}" for c in chapters]
+        lines.append("")
+    if quotes:
+        lines += ["## Quotable Moments", ""]
+        lines += [f'- {format_timestamp(q.start)} "{q.text}"' for q in quotes]
+        lines.append("")
+    for content_type, content in generated.items():
+        lines += [f"## {content_type}", "", content.text, ""]
+    return "\n".join(lines)
+
+
+def process_one(audio_path: str, name: str, output_dir: str, options: Dict) -> Tuple[str, float, float]:
+    """Process one episode into ``<output_dir>/<name>/``; returns ``(name, audio_seconds, wall_seconds)``."""
+    from core.cache import TranscriptCache
+    from core.generation import ContentSettings, generate_content
+    from core.llm_cache import ResponseCache
+    from core.pipeline import (
+        analysis_from_result, chapters_from_result, process_episode, quotes_from_result, segments_from_result,
+    )
+    from core.retrieval import TranscriptIndex
+    from core.search import SearchIndex
+    from core.transcription import probe_duration
+
+    started = time.perf_counter()
+    episode_dir = os.path.join(output_dir, name)
+    os.makedirs(episode_dir, exist_ok=True)
+
+    response_cache = ResponseCache() if options["cache"] else None
+    result = process_episode(
+        {
+            "audio_path": audio_path,
+            "title": name,
+            "workers": options["workers"],
+            "model_name": options["model"],
+            "detect_speakers": options["speakers"],
+        },
+        lambda *progress: None,
+        transcript_cache=TranscriptCache() if options["cache"] else None,
+        response_cache=response_cache,
+        search_index=SearchIndex(),
+    )
+    if result["analysis_error"]:
+        raise RuntimeError(f"analysis failed: {result['analysis_error']}")
+    segments = segments_from_result(result)
+    analysis = analysis_from_result(result)
+    chapters = chapters_from_result(result)
+    quotes = quotes_from_result(result)
+    _write_atomic(os.path.join(episode_dir, "transcript.json"), json.dumps(result["segments"]))
+
+    generated = {}
+    if analysis is not None:
+        excerpts = TranscriptIndex.from_segments(segments).excerpts(options["formats"], analysis.digest.to_prompt())
+        generated = generate_content(
+            analysis.digest.to_prompt(),
+            options["formats"],
+            settings=ContentSettings(**options["settings"]),
+            cache=response_cache,
+            chapters=chapters,
+            quotes=quotes,
+            excerpts=excerpts,
+        )
+    _write_atomic(os.path.join(episode_dir, "content.md"), _to_markdown(name, analysis, generated, chapters, quotes))
+    _write_atomic(os.path.join(episode_dir, "content.json"), json.dumps({
+        "episode": audio_path,
+        "analysis": result["analysis"],
+        "content": {content_type: content.text for content_type, content in generated.items()},
+    }, indent=2))
+
+    audio_seconds = probe_duration(audio_path) or (segments[-1].end if segments else 0.0)
+    return name, audio_seconds, time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from core.generation import CONTENT_PROMPTS
+    from core.transcription import DEFAULT_MODEL
+
+    parser = argparse.ArgumentParser(prog="python -m core", description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="audio files, directories, or manifest files (.txt/.json)")
+    parser.add_argument("-o", "--output", default="output", help="output directory (default: output)")
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS,
+                        help=f"content types to generate, or 'all' (choices: {', '.join(CONTENT_PROMPTS)})")
+    parser.add_argument("-c", "--concurrency", type=int, default=2, help="episodes processed at once")
+    parser.add_argument("--workers", type=int, default=1, help="transcription processes per episode")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Whisper model name")
+    parser.add_argument("--speakers", action="store_true", help="label transcript segments by speaker")
+    parser.add_argument("--tone", default="Professional")
+    parser.add_argument("--length", default="Medium", choices=["Short", "Medium", "Long"])
+    parser.add_argument("--audience", default="General")
+    parser.add_argument("--emojis", type=int, default=5)
+    parser.add_argument("--no-hashtags", action="store_true")
+    parser.add_argument("--no-cta", action="store_true")
+    parser.add_argument("--timestamps", action="store_true", help="add [MM:SS] chapter markers to content")
+    parser.add_argument("--no-cache", action="store_true", help="skip transcript and response caches")
+    args = parser.parse_args(argv)
+
+    formats = list(CONTENT_PROMPTS) if args.formats == ["all"] else args.formats
+    unknown = [f for f in formats if f not in CONTENT_PROMPTS]
+    if unknown:
+        parser.error(f"unknown content types: {', '.join(unknown)}")
+
+    missing = [item for item in args.inputs if not os.path.exists(item)]
+    if missing:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+    episodes = find_episodes(args.inputs)
+    names = episode_names(episodes)
+    todo = [path for path in episodes if not os.path.exists(os.path.join(args.output, names[path], "content.json"))]
+    print(f"{len(episodes)} episodes, {len(episodes) - len(todo)} already done, {len(todo)} to process")
+    if not todo:
+        return 0
+
+    options = {
+        "formats": formats,
+        "workers": args.workers,
+        "model": args.model,
+        "speakers": args.speakers,
+        "cache": not args.no_cache,
+        "settings": {
+            "tone": args.tone,
+            "length": args.length,
+            "audience": args.audience,
+            "emojis": args.emojis,
+            "hashtags": not args.no_hashtags,
+            "cta": not args.no_cta,
+            "timestamps": args.timestamps,
+        },
+    }
+    started = time.perf_counter()
+    audio_seconds = 0.0
+    done = failed = 0
+    # Separate processes, so each concurrent episode has its own Whisper model.
+    with ProcessPoolExecutor(
+        max_workers=args.concurrency, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {pool.submit(process_one, path, names[path], args.output, options): path for path in todo}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                name, seconds, wall = future.result()
+            except Exception as error:  # noqa: BLE001 - reported, batch continues
+                failed += 1
+                print(f"[{done + failed}/{len(todo)}] FAILED {path}: {error}", file=sys.stderr)
+                continue
+            done += 1
+            audio_seconds += seconds
+            print(f"[{done + failed}/{len(todo)}] {name}: {seconds / 60:.1f} min of audio in {wall:.1f} s")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Processed {done} episodes ({failed} failed) in {elapsed / 60:.1f} min: "
+        f"{done / elapsed * 3600:.1f} episodes/hour, "
+        f"{audio_seconds / elapsed:.2f} audio-minutes/minute"
+    )
+    return 1 if failed else 0
@@ -0,0 +1,320 @@
+"""CPU speaker diarization from spectral embeddings.
+
+Speech is cut into 1.5 s windows, each summarised by the mean and spread of
+its mel-frequency cepstra. The windows are clustered into speakers, either all
+at once with cosine k-means (choosing the speaker count by silhouette) or
+incrementally as the audio streams, which keeps memory flat on very long
+episodes. Transcript segments then take the speaker of the windows they
+overlap most.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.audio import SAMPLE_RATE, decode_audio
+from core.transcription import Segment
+from core.vad import VoiceActivityDetector
+
+WINDOW_SECONDS = 1.5
+HOP_SECONDS = 0.75
+MAX_SPEAKERS = 6
+# Episodes longer than this are clustered incrementally by the pipeline.
+INCREMENTAL_AFTER_SECONDS = 2 * 3600.0
+# Best silhouette below which the episode is treated as a single speaker.
+MIN_SILHOUETTE = 0.6
+# Fewer speakers win when their silhouette is within this of the best.
+_SILHOUETTE_TOLERANCE = 0.02
+# Distance, in seed-cluster spreads, past which the online clusterer starts a new speaker.
+JOIN_RADIUS = 2.5
+# Windows (about 5 min of speech) clustered in a batch to seed the online clusterer.
+_WARMUP_WINDOWS = 400
+# Consecutive far-off windows (about 3 s) needed before a new speaker is started online.
+_CONFIRM_WINDOWS = 4
+# Share of a window that must be speech for it to be embedded.
+_MIN_SPEECH = 0.5
+# Windows scored when estimating the silhouette; it is quadratic in this.
+_SILHOUETTE_SAMPLE = 1500
+_KMEANS_ITERATIONS = 20
+
+_N_FFT = 512
+_FRAME = 400  # 25 ms
+_HOP = 160  # 10 ms
+_N_MELS = 32
+_N_CEPSTRA = 19
+_WINDOW_FRAMES = int(WINDOW_SECONDS * SAMPLE_RATE) // _HOP
+_HOP_FRAMES = int(HOP_SECONDS * SAMPLE_RATE) // _HOP
+
+
+class SpeakerTurn(NamedTuple):
+    start: float
+    end: float
+    speaker: int
+
+
+def _mel_filterbank(n_mels: int = _N_MELS, low: float = 60.0, high: float = 7600.0) -> np.ndarray:
+    """Triangular mel filters as an ``(n_fft // 2 + 1, n_mels)`` matrix."""
+    mel = np.linspace(2595 * np.log10(1 + low / 700), 2595 * np.log10(1 + high / 700), n_mels + 2)
+    hz = 700 * (10 ** (mel / 2595) - 1)
+    freqs = np.fft.rfftfreq(_N_FFT, 1 / SAMPLE_RATE)[:, None]
+    left, centre, right = hz[:-2], hz[1:-1], hz[2:]
+    rising = (freqs - left) / (centre - left)
+    falling = (right - freqs) / (right - centre)
+    return np.maximum(0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _dct_matrix(n_in: int = _N_MELS, n_out: int = _N_CEPSTRA) -> np.ndarray:
+    """DCT-II basis for coefficients 1..n_out (c0, overall loudness, is dropped)."""
+    k = np.arange(1, n_out + 1)[None, :]
+    n = np.arange(n_in)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)).astype(np.float32)
+
+
+_MEL = _mel_filterbank()
+_DCT = _dct_matrix()
+_HANN = np.hanning(_FRAME).astype(np.float32)
+
+
+def cepstra(audio: np.ndarray) -> np.ndarray:
+    """Return ``(frames, n_cepstra)`` mel-frequency cepstral coefficients at a 10 ms hop.
+
+    Cepstra describe the spectral envelope (the vocal tract) rather than the
+    individual harmonics, so they vary less with pitch than a raw spectrum.
+    """
+    if len(audio) < _FRAME:
+        return np.empty((0, _N_CEPSTRA), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(audio, _FRAME)[::_HOP] * _HANN
+    power = np.square(np.abs(np.fft.rfft(frames, n=_N_FFT, axis=1)))
+    return np.log(power.astype(np.float32) @ _MEL + 1e-6) @ _DCT
+
+
+def embed_windows(
+    blocks: Iterable[np.ndarray],
+    vad: Optional[VoiceActivityDetector] = None,
+) -> Iterator[Tuple[float, float, np.ndarray]]:
+    """Yield ``(start, end, embedding)`` for each mostly-speech window of a PCM stream."""
+    vad = vad or VoiceActivityDetector()
+    window = _WINDOW_FRAMES * _HOP
+    hop = _HOP_FRAMES * _HOP
+    # Samples needed for the last frame of a window to be complete.
+    needed = window - _HOP + _FRAME
+    speech_frame = int(0.03 * SAMPLE_RATE)
+    buf = np.empty(0, dtype=np.float32)
+    base = 0  # sample position of buf[0] in the stream
+
+    for block in blocks:
+        buf = np.concatenate((buf, block))
+        if len(buf) < needed:
+            continue
+        count = (len(buf) - needed) // hop + 1
+        span = (count - 1) * hop + window
+        features = cepstra(buf[:span - _HOP + _FRAME])
+        # Only speech frames count, so pauses inside a window do not skew it.
+        n = (span - _HOP + _FRAME) // speech_frame
+        flags = vad.is_speech(buf[:n * speech_frame].reshape(n, speech_frame))
+        centres = (np.arange(len(features)) * _HOP + _FRAME // 2) // speech_frame
+        mask = flags[np.minimum(centres, n - 1)].astype(np.float32)[:, None]
+
+        # Window statistics from running sums over frames, for all windows at once.
+        zero = np.zeros((1, features.shape[1]), np.float32)
+        sums = np.concatenate((zero, np.cumsum(features * mask, axis=0)))
+        squares = np.concatenate((zero, np.cumsum(features * features * mask, axis=0)))
+        voiced = np.concatenate(([0], np.cumsum(mask[:, 0])))
+        starts = np.arange(count) * _HOP_FRAMES
+        ends = starts + _WINDOW_FRAMES
+        frames = np.maximum(voiced[ends] - voiced[starts], 1)[:, None]
+        mean = (sums[ends] - sums[starts]) / frames
+        spread = np.sqrt(np.maximum((squares[ends] - squares[starts]) / frames - mean * mean, 0))
+        embeddings = np.hstack((mean, spread))
+        share = (voiced[ends] - voiced[starts]) / _WINDOW_FRAMES
+
+        for i in np.flatnonzero(share >= _MIN_SPEECH):
+            start = (base + starts[i] * _HOP) / SAMPLE_RATE
+            yield start, start + WINDOW_SECONDS, embeddings[i]
+
+        consumed = count * hop
+        buf = buf[consumed:]
+        base += consumed
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / (np.linalg.norm(x, axis=-1, keepdims=True) + 1e-9)
+
+
+def _kmeans(x: np.ndarray, k: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means with k-means++ seeding; returns ``(labels, centroids)``."""
+    centroids = [x[rng.integers(len(x))]]
+    for _ in range(1, k):
+        distance = 1 - np.max(x @ np.array(centroids).T, axis=1)
+        weights = np.maximum(distance, 0) ** 2
+        total = weights.sum()
+        centroids.append(x[rng.choice(len(x), p=weights / total) if total > 0 else rng.integers(len(x))])
+    centroids = np.array(centroids)
+
+    labels = np.full(len(x), -1)
+    for _ in range(_KMEANS_ITERATIONS):
+        new = np.argmax(x @ centroids.T, axis=1)
+        if np.array_equal(new, labels):
+            break
+        labels = new
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+        # An emptied cluster keeps its old centroid.
+        centroids = np.where(np.linalg.norm(sums, axis=1, keepdims=True) > 0, _normalize(sums), centroids)
+    return labels, centroids
+
+
+def _silhouette(x: np.ndarray, labels: np.ndarray, k: int) -> float:
+    """Mean silhouette under cosine distance."""
+    distance = 1 - x @ x.T
+    counts = np.bincount(labels, minlength=k).astype(np.float64)
+    # Mean distance from every point to every cluster, in one matrix product.
+    per_cluster = distance @ np.eye(k)[labels] / np.maximum(counts, 1)
+    own = per_cluster[np.arange(len(x)), labels] * counts[labels] / np.maximum(counts[labels] - 1, 1)
+    per_cluster[np.arange(len(x)), labels] = np.inf
+    per_cluster[:, counts == 0] = np.inf
+    nearest = per_cluster.min(axis=1)
+    scores = (nearest - own) / np.maximum(np.maximum(nearest, own), 1e-9)
+    return float(np.mean(np.where(counts[labels] > 1, scores, 0)))
+
+
+def cluster_embeddings(embeddings: np.ndarray, max_speakers: int = MAX_SPEAKERS, seed: int = 0) -> np.ndarray:
+    """Label embeddings by speaker, choosing the count of speakers by silhouette."""
+    if len(embeddings) < 2:
+        return np.zeros(len(embeddings), dtype=int)
+    x = _normalize(embeddings - embeddings.mean(axis=0))
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(x), min(len(x), _SILHOUETTE_SAMPLE), replace=False)
+
+    candidates = [(np.zeros(len(x), dtype=int), MIN_SILHOUETTE)]
+    for k in range(2, min(max_speakers, len(x) - 1) + 1):
+        labels, _ = _kmeans(x, k, rng)
+        candidates.append((labels, _silhouette(x[sample], labels[sample], k)))
+    best_score = max(score for _, score in candidates)
+    return next(labels for labels, score in candidates if score >= best_score - _SILHOUETTE_TOLERANCE)
+
+
+class OnlineClusterer:
+    """Single-pass speaker clustering with one running centroid per speaker.
+
+    The first ``warmup`` embeddings are clustered in a batch to seed the
+    speakers and measure how far a speaker's windows spread around its
+    centroid. After that each embedding joins the nearest speaker, or starts
+    a new one when it is more than ``join_radius`` spreads from all of them,
+    so memory does not grow with episode length.
+    """
+
+    def __init__(self, max_speakers: int = MAX_SPEAKERS, join_radius: float = JOIN_RADIUS,
+                 warmup: int = _WARMUP_WINDOWS):
+        self.max_speakers = max_speakers
+        self.join_radius = join_radius
+        self.warmup = warmup
+        self.centroids = None
+        self.counts = None
+        self.spread = 0.0
+
+    def _nearest(self, x: np.ndarray) -> Tuple[int, float]:
+        distance = np.linalg.norm(self.centroids - x, axis=1)
+        best = int(np.argmin(distance))
+        return best, float(distance[best])
+
+    def _update(self, speaker: int, x: np.ndarray) -> int:
+        self.counts[speaker] += 1
+        self.centroids[speaker] += (x - self.centroids[speaker]) / self.counts[speaker]
+        return speaker
+
+    def labels(self, embeddings: Iterable[np.ndarray]) -> Iterator[int]:
+        """Yield a speaker label per embedding, in order.
+
+        A new speaker needs ``_CONFIRM_WINDOWS`` far-off windows in a row;
+        shorter runs (a cough, laughter) go to their nearest speaker.
+        """
+        pending, far = [], []
+        for x in embeddings:
+            if self.centroids is None:
+                pending.append(x)
+                if len(pending) >= self.warmup:
+                    yield from self._seed(np.array(pending))
+                continue
+            best, distance = self._nearest(x)
+            if distance <= self.join_radius * self.spread or len(self.centroids) >= self.max_speakers:
+                yield from (self._update(self._nearest(y)[0], y) for y in far)
+                far = []
+                yield self._update(best, x)
+                continue
+            far.append(x)
+            if len(far) >= _CONFIRM_WINDOWS:
+                self.centroids = np.vstack((self.centroids, np.mean(far, axis=0)))
+                self.counts = np.append(self.counts, float(len(far)))
+                yield from [len(self.centroids) - 1] * len(far)
+                far = []
+        if self.centroids is None and pending:
+            yield from self._seed(np.array(pending))
+        yield from (self._update(self._nearest(y)[0], y) for y in far)
+
+    def _seed(self, batch: np.ndarray) -> Iterator[int]:
+        labels = cluster_embeddings(batch, self.max_speakers)
+        self.counts = np.bincount(labels).astype(float)
+        self.centroids = np.zeros((len(self.counts), batch.shape[1]))
+        np.add.at(self.centroids, labels, batch)
+        self.centroids /= self.counts[:, None]
+        self.spread = float(np.sqrt(np.mean(np.sum((batch - self.centroids[labels]) ** 2, axis=1))))
+        yield from labels.tolist()
+
+
+def diarize(
+    path: str,
+    max_speakers: int = MAX_SPEAKERS,
+    incremental: bool = False,
+) -> List[SpeakerTurn]:
+    """Return speaker-labelled speech windows for the audio file at ``path``."""
+    windows = embed_windows(decode_audio(path))
+    if incremental:
+        spans = []
+
+        def vectors():
+            for start, end, vector in windows:
+                spans.append((start, end))
+                yield vector
+
+        labels = OnlineClusterer(max_speakers).labels(vectors())
+        turns = [SpeakerTurn(*spans[i], label) for i, label in enumerate(labels)]
+    else:
+        spans, vectors = [], []
+        for start, end, vector in windows:
+            spans.append((start, end))
+            vectors.append(vector)
+        labels = cluster_embeddings(np.array(vectors), max_speakers) if vectors else []
+        turns = [SpeakerTurn(start, end, int(label)) for (start, end), label in zip(spans, labels)]
+
+    # Number speakers in order of first appearance.
+    order = {}
+    for turn in turns:
+        order.setdefault(turn.speaker, len(order))
+    return [turn._replace(speaker=order[turn.speaker]) for turn in turns]
+
+
+def assign_speakers(segments: Sequence[Segment], turns: Sequence[SpeakerTurn]) -> List[Segment]:
+    """Label each segment with the speaker whose windows overlap it most."""
+    if not turns:
+        return list(segments)
+    starts = np.array([turn.start for turn in turns])
+    ends = np.array([turn.end for turn in turns])
+    speakers = np.array([turn.speaker for turn in turns])
+    n_speakers = int(speakers.max()) + 1
+
+    labelled = []
+    for seg in segments:
+        lo = np.searchsorted(ends, seg.start, side="right")
+        hi = np.searchsorted(starts, seg.end, side="left")
+        if hi > lo:
+            overlap = np.minimum(ends[lo:hi], seg.end) - np.maximum(starts[lo:hi], seg.start)
+            speaker = int(np.argmax(np.bincount(speakers[lo:hi], weights=overlap, minlength=n_speakers)))
+        else:
+            # No speech window overlaps; fall back to the nearest one.
+            centre = (seg.start + seg.end) / 2
+            speaker = int(speakers[np.argmin(np.abs((starts + ends) / 2 - centre))])
+        labelled.append(seg._replace(speaker=f"Speaker {speaker + 1}"))
+    return labelled
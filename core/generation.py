@@ -0,0 +1,357 @@
+"""Concurrent, per-format content generation with the async OpenAI client.
+
+Every selected content type is its own chat-completion call. The calls are
+issued together and bounded by a semaphore, so generating six formats takes
+about as long as the slowest one rather than the sum of all of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from core.lazy import lazy_import
+from core.llm_cache import ResponseCache, response_key
+from core.timestamps import format_timestamp
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+    from core.quotes import Quote
+    from core.retrieval import Chunk
+
+openai = lazy_import("openai")
+
+DEFAULT_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+MAX_CONCURRENCY = 6
+
+# Minimum seconds between progressive redraws of a streaming format.
+_RENDER_INTERVAL = 0.05
+
+SYSTEM_PROMPT = (
+    "You are a content strategist who turns podcast episodes into "
+    "platform-native content. Only use facts and quotes from the episode."
+)
+
+CONTENT_PROMPTS = {
+    "Twitter Thread": (
+        "Write a Twitter/X thread of 5-8 tweets. Open with a strong hook, number "
+        "each tweet as n/N, keep every tweet under 280 characters and put each "
+        "tweet on its own line separated by a blank line."
+    ),
+    "LinkedIn Post": (
+        "Write a LinkedIn post with a one-line opener, three to five key "
+        "insights as a checklist, one pull quote from the episode and a closing "
+        "question for the comments."
+    ),
+    "Blog Post": (
+        "Write an SEO-friendly blog post outline in Markdown: a title, an "
+        "introduction hook, four to six H2 sections with one-line summaries, a "
+        "conclusion and a call to action."
+    ),
+    "Newsletter": (
+        "Write an email newsletter section: subject line, preview text, a short "
+        "summary of the episode, three takeaways and a link-out prompt."
+    ),
+    "YouTube Shorts": (
+        "Write a 45-60 second YouTube Shorts script with an on-screen hook in "
+        "the first 3 seconds, timed beats as [0:00] markers and a closing line."
+    ),
+    "TikTok Script": (
+        "Write a 30-45 second TikTok script: a pattern-interrupt hook, three "
+        "fast beats with on-screen text suggestions and a loopable ending."
+    ),
+}
+
+# Formats that are structured around the episode's chapters.
+CHAPTER_FORMATS = ("Blog Post", "YouTube Shorts")
+# Formats that are built around verbatim quotes.
+QUOTE_FORMATS = ("Twitter Thread", "LinkedIn Post", "Newsletter", "TikTok Script")
+
+_LENGTH_HINTS = {
+    "Short": "Keep it brief.",
+    "Medium": "Use a moderate length.",
+    "Long": "Go into depth and use the full length the format allows.",
+}
+
+
+@dataclass(frozen=True)
+class ContentSettings:
+    tone: str = "Professional"
+    length: str = "Medium"
+    audience: str = "General"
+    emojis: int = 5
+    hashtags: bool = True
+    cta: bool = True
+    timestamps: bool = False
+
+    def instructions(self) -> str:
+        parts = [
+            f"Tone: {self.tone}.",
+            f"Audience: {self.audience}.",
+            _LENGTH_HINTS.get(self.length, ""),
+            f"Emoji usage on a 0-10 scale: {self.emojis}.",
+            "Include relevant hashtags." if self.hashtags else "Do not use hashtags.",
+            "End with a call to action." if self.cta else "Do not add a call to action.",
+            "Reference the chapter start times as [MM:SS] markers." if self.timestamps else "",
+        ]
+        return " ".join(p for p in parts if p)
+
+
+@dataclass
+class GeneratedContent:
+    content_type: str
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+    first_token_seconds: float = 0.0
+
+
+def build_messages(
+    content_type: str,
+    source_text: str,
+    settings: ContentSettings,
+    chapters: Sequence[Tuple[str, float]] = (),
+    quotes: Sequence[Quote] = (),
+    excerpts: Sequence[Chunk] = (),
+) -> List[dict]:
+    """Return the chat messages that generate ``content_type``.
+
+    ``(title, start)`` chapters are added to the source of chapter-driven
+    formats and ranked quotes to the source of quote-driven ones. Transcript
+    ``excerpts`` retrieved for this format are appended to any format.
+    """
+    if chapters and content_type in CHAPTER_FORMATS:
+        outline = "\n".join(f"- [{format_timestamp(start)}] {title}" for title, start in chapters)
+        source_text = f"{source_text}\n\nDetected chapters:\n{outline}"
+    if quotes and content_type in QUOTE_FORMATS:
+        lines = "\n".join(
+            f'- [{format_timestamp(quote.start)}] {quote.speaker + ": " if quote.speaker else ""}"{quote.text}"'
+            for quote in quotes
+        )
+        source_text = f"{source_text}\n\nQuotable moments (verbatim):\n{lines}"
+    if excerpts:
+        lines = "\n".join(f"- [{format_timestamp(chunk.start)}] {chunk.text}" for chunk in excerpts)
+        source_text = f"{source_text}\n\nRelevant transcript excerpts:\n{lines}"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"{CONTENT_PROMPTS[content_type]}\n{settings.instructions()}\n\n"
+                f"Episode:\n{source_text}"
+            ),
+        },
+    ]
+
+
+def make_client(base_url: Optional[str] = None, api_key: Optional[str] = None) -> AsyncOpenAI:
+    """Build an async client, reading credentials from the environment/.env."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return openai.AsyncOpenAI(base_url=base_url, api_key=api_key)
+
+
+async def complete(
+    client: AsyncOpenAI,
+    messages: List[dict],
+    model: str = DEFAULT_CHAT_MODEL,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    **kwargs,
+):
+    """Run one chat completion and return ``(text, prompt_tokens, completion_tokens)``.
+
+    With a ``cache``, a stored response is returned without calling the
+    model; ``refresh`` skips the lookup but still stores the new response.
+    """
+    key = response_key(model, messages, **kwargs) if cache is not None else None
+    if key is not None and not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+    usage = response.usage
+    result = (
+        response.choices[0].message.content or "",
+        usage.prompt_tokens if usage else 0,
+        usage.completion_tokens if usage else 0,
+    )
+    if key is not None:
+        cache.put(key, *result)
+    return result
+
+
+async def _generate_one(
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    content_type: str,
+    source_text: str,
+    settings: ContentSettings,
+    model: str,
+    cache: Optional[ResponseCache],
+    refresh: bool,
+    chapters: Sequence[Tuple[str, float]],
+    quotes: Sequence[Quote],
+    excerpts: Sequence[Chunk],
+) -> GeneratedContent:
+    async with semaphore:
+        started = time.perf_counter()
+        text, prompt_tokens, completion_tokens = await complete(
+            client, build_messages(content_type, source_text, settings, chapters, quotes, excerpts), model,
+            cache=cache, refresh=refresh,
+        )
+        return GeneratedContent(
+            content_type, text, prompt_tokens, completion_tokens, time.perf_counter() - started
+        )
+
+
+async def generate_all(
+    source_text: str,
+    content_types: Iterable[str],
+    settings: ContentSettings = ContentSettings(),
+    client: Optional[AsyncOpenAI] = None,
+    model: str = DEFAULT_CHAT_MODEL,
+    max_concurrency: int = MAX_CONCURRENCY,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    chapters: Sequence[Tuple[str, float]] = (),
+    quotes: Sequence[Quote] = (),
+    excerpts: Optional[Mapping[str, Sequence[Chunk]]] = None,
+) -> Dict[str, GeneratedContent]:
+    """Generate every content type concurrently, at most ``max_concurrency`` at once.
+
+    Pass ``refresh=True`` (the Regenerate button) to bypass cached responses.
+    ``excerpts`` maps content types to the transcript chunks retrieved for
+    them by :class:`core.retrieval.TranscriptIndex`.
+    """
+    excerpts = excerpts or {}
+    owns_client = client is None
+    client = client or make_client()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    try:
+        results = await asyncio.gather(*(
+            _generate_one(
+                client, semaphore, content_type, source_text, settings, model, cache, refresh, chapters, quotes,
+                excerpts.get(content_type, ()),
+            )
+            for content_type in content_types
+        ))
+    finally:
+        if owns_client:
+            await client.close()
+    return {result.content_type: result for result in results}
+
+
+async def _stream_one(
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    content_type: str,
+    source_text: str,
+    settings: ContentSettings,
+    model: str,
+    cache: Optional[ResponseCache],
+    refresh: bool,
+    on_text: Callable[[str, str], None],
+    chapters: Sequence[Tuple[str, float]],
+    quotes: Sequence[Quote],
+    excerpts: Sequence[Chunk],
+) -> GeneratedContent:
+    messages = build_messages(content_type, source_text, settings, chapters, quotes, excerpts)
+    key = response_key(model, messages) if cache is not None else None
+    async with semaphore:
+        started = time.perf_counter()
+        cached = cache.get(key) if key is not None and not refresh else None
+        if cached is not None:
+            on_text(content_type, cached[0])
+            elapsed = time.perf_counter() - started
+            return GeneratedContent(content_type, *cached, seconds=elapsed, first_token_seconds=elapsed)
+
+        stream = await client.chat.completions.create(
+            model=model, messages=messages, stream=True, stream_options={"include_usage": True}
+        )
+        text = ""
+        usage = None
+        first_token = None
+        last_render = 0.0
+        async for chunk in stream:
+            usage = chunk.usage or usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            now = time.perf_counter()
+            if first_token is None:
+                first_token = now - started
+            text += delta
+            # Throttle redraws; every one is a websocket message.
+            if now - last_render >= _RENDER_INTERVAL:
+                on_text(content_type, text)
+                last_render = now
+        on_text(content_type, text)
+
+    result = GeneratedContent(
+        content_type,
+        text,
+        usage.prompt_tokens if usage else 0,
+        usage.completion_tokens if usage else 0,
+        time.perf_counter() - started,
+        first_token if first_token is not None else time.perf_counter() - started,
+    )
+    if key is not None:
+        cache.put(key, text, result.prompt_tokens, result.completion_tokens)
+    return result
+
+
+async def stream_all(
+    source_text: str,
+    content_types: Iterable[str],
+    on_text: Callable[[str, str], None],
+    settings: ContentSettings = ContentSettings(),
+    client: Optional[AsyncOpenAI] = None,
+    model: str = DEFAULT_CHAT_MODEL,
+    max_concurrency: int = MAX_CONCURRENCY,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    chapters: Sequence[Tuple[str, float]] = (),
+    quotes: Sequence[Quote] = (),
+    excerpts: Optional[Mapping[str, Sequence[Chunk]]] = None,
+) -> Dict[str, GeneratedContent]:
+    """Like :func:`generate_all`, but stream tokens as they arrive.
+
+    ``on_text(content_type, text_so_far)`` is called from the event loop's
+    thread whenever a format's text grows, so callers can redraw in place.
+    Each result records time-to-first-token and time-to-complete.
+    """
+    excerpts = excerpts or {}
+    owns_client = client is None
+    client = client or make_client()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    try:
+        results = await asyncio.gather(*(
+            _stream_one(
+                client, semaphore, content_type, source_text, settings, model, cache, refresh, on_text,
+                chapters, quotes, excerpts.get(content_type, ()),
+            )
+            for content_type in content_types
+        ))
+    finally:
+        if owns_client:
+            await client.close()
+    return {result.content_type: result for result in results}
+
+
+def generate_content(source_text: str, content_types: Iterable[str], **kwargs) -> Dict[str, GeneratedContent]:
+    """Blocking wrapper around :func:`generate_all` for Streamlit scripts."""
+    return asyncio.run(generate_all(source_text, list(content_types), **kwargs))
+
+
+def stream_content(source_text: str, content_types: Iterable[str], on_text: Callable[[str, str], None],
+                   **kwargs) -> Dict[str, GeneratedContent]:
+    """Blocking wrapper around :func:`stream_all` for Streamlit scripts."""
+    return asyncio.run(stream_all(source_text, list(content_types), on_text, **kwargs))
@@ -0,0 +1,109 @@
+"""Zero-copy ingestion of uploaded audio.
+
+An upload is written to disk once, straight from the uploader's own buffer,
+and from then on is only read through a memory map. The hasher and decoder
+receive ``memoryview`` slices of that map, so no stage makes its own copy of
+the episode and per-session memory stays flat regardless of file size.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+import uuid
+from typing import BinaryIO, Iterator, Optional
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def iter_buffer(upload: BinaryIO, block_size: int = BLOCK_SIZE) -> Iterator[memoryview]:
+    """Yield zero-copy slices of an in-memory (``io.BytesIO``) upload.
+
+    ``getvalue()`` returns the bytes object the upload was built from, where
+    ``getbuffer()`` would first copy it to un-share it.
+    """
+    with memoryview(upload.getvalue()) as data:
+        for start in range(0, len(data), block_size):
+            with data[start:start + block_size] as block:
+                yield block
+
+
+def spool_upload(upload: BinaryIO, directory: Optional[str] = None) -> str:
+    """Write ``upload`` to a new file in ``directory`` and return its path.
+
+    ``io.BytesIO`` uploads (Streamlit's ``UploadedFile``) are written from
+    slices of their own bytes without copying; other file objects are
+    streamed through one reusable block buffer.
+    """
+    directory = directory or tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    suffix = os.path.splitext(getattr(upload, "name", "") or "")[1]
+    path = os.path.join(directory, f"{uuid.uuid4().hex}{suffix}")
+
+    with open(path, "wb", buffering=0) as spool:
+        if hasattr(upload, "getvalue"):
+            for block in iter_buffer(upload):
+                _write_all(spool, block)
+        else:
+            upload.seek(0)
+            block = bytearray(BLOCK_SIZE)
+            view = memoryview(block)
+            while True:
+                read = upload.readinto(block)
+                if not read:
+                    break
+                _write_all(spool, view[:read])
+    return path
+
+
+def _write_all(raw: BinaryIO, data) -> None:
+    """Write all of ``data`` to an unbuffered file, which may take several writes."""
+    view = memoryview(data)
+    while view:
+        view = view[raw.write(view):]
+
+
+class MappedAudio:
+    """Read-only memory map of an audio file, handed out as ``memoryview`` slices.
+
+    Use as a context manager; every slice must be released before it exits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._file = open(path, "rb")
+        # mmap refuses empty files; an empty view serves the same purpose.
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self) -> "MappedAudio":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """Return a zero-copy view of bytes ``[start, end)``."""
+        if self._map is None:
+            return memoryview(b"")
+        return memoryview(self._map)[start:end]
+
+    def blocks(self, block_size: int = BLOCK_SIZE, start: int = 0) -> Iterator[memoryview]:
+        """Yield consecutive zero-copy views of at most ``block_size`` bytes."""
+        for offset in range(start, self.size, block_size):
+            with self.view(offset, offset + block_size) as block:
+                yield block
+
+    def sha256(self) -> str:
+        digest = hashlib.sha256()
+        for block in self.blocks():
+            digest.update(block)
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,238 @@
+"""Background job queue backed by a local SQLite table.
+
+Streamlit reruns the whole page script on every widget interaction, so long
+work must not run inline. Jobs are written to a ``jobs`` table, picked up by
+a small pool of worker threads and report progress, plus optional
+JSON-serializable details such as partial results, back to the table; the
+page only stores the job id and polls its status.
+
+Several processes (two Streamlit servers, or a server and a script) may
+share one table. A claimed job records which queue owns it, and the owner
+refreshes a heartbeat while it runs; only running jobs whose heartbeat is
+older than ``PODCAST_AGENT_JOB_STALE_SECONDS`` are taken back and queued
+again, so a queue never steals work another live process is doing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from core.cache import DEFAULT_CACHE_DIR
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_WORKERS = int(os.getenv("PODCAST_AGENT_JOB_WORKERS", "2"))
+# A running job whose owner has not refreshed its heartbeat for this many
+# seconds is presumed dead and queued again.
+STALE_SECONDS = float(os.getenv("PODCAST_AGENT_JOB_STALE_SECONDS", "60"))
+# Seconds an idle worker waits before re-checking the table.
+_IDLE_POLL = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    details TEXT,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state_created ON jobs (state, created_at);
+"""
+
+# handler(payload, progress) -> JSON-serializable result, where
+# progress(fraction, message="", details=None) records how far the job got
+Handler = Callable[[Dict[str, Any], Callable[..., None]], Any]
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    state: str
+    progress: float
+    message: str
+    payload: Dict[str, Any]
+    result: Any
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+    details: Any = None
+
+    @property
+    def active(self) -> bool:
+        return self.state in (QUEUED, RUNNING)
+
+
+class JobQueue:
+    """Runs registered handlers for queued jobs on background threads."""
+
+    def __init__(self, handlers: Dict[str, Handler],
+                 path: str = os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3"),
+                 workers: int = DEFAULT_WORKERS, stale_seconds: float = STALE_SECONDS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.handlers = dict(handlers)
+        self.owner = uuid.uuid4().hex
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        # Tables created before progress details or owners existed lack the columns.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("details", "TEXT"), ("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.commit()
+        # The heartbeat thread's first pass also takes back jobs a dead process left running.
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        self._threads.append(threading.Thread(target=self._beat, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Queue a job and return its id."""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._wakeup:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, state, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), now, now),
+            )
+            self._db.commit()
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, kind, state, progress, message, payload, result, error, created_at, updated_at, details "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            row[0], row[1], row[2], row[3], row[4],
+            json.loads(row[5]),
+            json.loads(row[6]) if row[6] is not None else None,
+            row[7], row[8], row[9],
+            json.loads(row[10]) if row[10] is not None else None,
+        )
+
+    def pending(self) -> int:
+        """Number of queued or running jobs."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _requeue_stale(self) -> int:
+        """Queue again running jobs whose owner stopped sending heartbeats; the caller holds the lock."""
+        now = time.time()
+        # Rows from before heartbeats existed fall back to their last update.
+        requeued = self._db.execute(
+            "UPDATE jobs SET state = ?, owner = NULL, message = 'Restarted', updated_at = ? "
+            "WHERE state = ? AND COALESCE(heartbeat, updated_at) < ?",
+            (QUEUED, now, RUNNING, now - self.stale_seconds),
+        ).rowcount
+        self._db.commit()
+        return requeued
+
+    def _beat(self) -> None:
+        """Refresh the heartbeat of this queue's running jobs and take back dead owners' jobs."""
+        with self._wakeup:
+            while not self._stopping:
+                self._db.execute(
+                    "UPDATE jobs SET heartbeat = ? WHERE state = ? AND owner = ?",
+                    (time.time(), RUNNING, self.owner),
+                )
+                if self._requeue_stale():
+                    self._wakeup.notify_all()
+                self._wakeup.wait(self.stale_seconds / 6)
+
+    def _claim(self) -> Optional[Job]:
+        with self._wakeup:
+            while not self._stopping:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    # Another process may claim the same row first; only one update matches.
+                    claimed = self._db.execute(
+                        "UPDATE jobs SET state = ?, owner = ?, heartbeat = ?, updated_at = ? "
+                        "WHERE id = ? AND state = ?",
+                        (RUNNING, self.owner, now, now, row[0], QUEUED),
+                    ).rowcount
+                    self._db.commit()
+                    if claimed:
+                        break
+                    continue
+                self._wakeup.wait(_IDLE_POLL)
+            else:
+                return None
+        return self.get(row[0])
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = fields["heartbeat"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            # A job taken back from this queue belongs to its new owner now.
+            self._db.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner)
+            )
+            self._db.commit()
+
+    def _work(self) -> None:
+        while True:
+            job = self._claim()
+            if job is None:
+                return
+
+            def progress(fraction: float, message: str = "", details: Any = None, job_id: str = job.id) -> None:
+                fields = {"progress": min(max(fraction, 0.0), 1.0), "message": message}
+                if details is not None:
+                    fields["details"] = json.dumps(details)
+                self._update(job_id, **fields)
+
+            try:
+                result = self.handlers[job.kind](job.payload, progress)
+            except Exception as error:  # noqa: BLE001 - reported to the page
+                self._update(
+                    job.id, state=FAILED, error=f"{error}\n{traceback.format_exc()}", message=str(error)
+                )
+            else:
+                self._update(job.id, state=DONE, progress=1.0, message="Done", result=json.dumps(result))
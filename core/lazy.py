@@ -0,0 +1,98 @@
+"""Deferred imports of heavy dependencies and a background warm-up.
+
+Importing ``openai`` or ``pandas`` takes longer than importing Streamlit
+itself, and Whisper brings in ``torch``. Pages and modules that only need
+them on some code paths import them through :func:`lazy_import`, which
+returns a stand-in that imports the real module on first attribute access.
+Nothing is paid until a page actually processes an episode, generates
+content or draws a chart.
+
+:func:`warm_up` then moves that cost off the request path. Once the first
+page has been drawn it starts one background thread per process that
+imports the heavy modules and loads the Whisper model, so the first
+processing request usually finds them ready. Set
+``PODCAST_AGENT_WARM_UP=0`` to turn it off.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+from core.models import DEFAULT_MODEL, registry
+
+WARM_UP = os.getenv("PODCAST_AGENT_WARM_UP", "1") != "0"
+# Imported by the warm-up thread before the Whisper model is loaded; the
+# pipeline brings in numpy and the analysis stack the app page defers.
+WARM_MODULES = ("openai", "pandas", "core.pipeline")
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not yet copied over, so once the module
+        # is loaded every later lookup is a plain dict hit.
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return ``name`` if it is already imported, else a :class:`LazyModule` for it."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+class WarmUp:
+    """Progress of the background warm-up: what is loaded, what failed."""
+
+    def __init__(self, modules: Iterable[str], model: Optional[str]):
+        self.modules = list(modules)
+        self.model = model
+        self.seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+
+    def _run(self) -> None:
+        try:
+            for name in self.modules:
+                self._time(name, importlib.import_module, name)
+            if self.model is not None:
+                self._time(f"whisper:{self.model}", registry.get, self.model)
+        finally:
+            self.done.set()
+
+    def _time(self, label: str, load, *args) -> None:
+        started = time.perf_counter()
+        try:
+            load(*args)
+        except Exception as error:  # noqa: BLE001 - recorded; the request path will raise it
+            self.errors[label] = str(error)
+        else:
+            self.seconds[label] = time.perf_counter() - started
+
+
+_warm_up: Optional[WarmUp] = None
+_warm_up_lock = threading.Lock()
+
+
+def warm_up(modules: Iterable[str] = WARM_MODULES, model: Optional[str] = DEFAULT_MODEL) -> Optional[WarmUp]:
+    """Start the process-wide warm-up on the first call; later calls return it.
+
+    ``model=None`` skips loading Whisper. Returns None when warm-up is disabled.
+    """
+    global _warm_up
+    if not WARM_UP:
+        return None
+    with _warm_up_lock:
+        if _warm_up is None:
+            _warm_up = WarmUp(modules, model)
+            _warm_up.thread.start()
+    return _warm_up
@@ -0,0 +1,102 @@
+"""Persistent SQLite cache of chat-completion responses.
+
+Responses are keyed by a hash of the model, the whitespace-normalized prompt
+(which already carries the tone, length, audience and style settings) and
+any extra request options. Entries expire after a TTL and the table is kept
+to a maximum number of rows by evicting the least recently used ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from core.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+"""
+
+
+def response_key(model: str, messages: List[dict], **options) -> str:
+    """Hash a request into a cache key, ignoring whitespace differences."""
+    normalized = [(m["role"], " ".join(m["content"].split())) for m in messages]
+    payload = json.dumps([model, normalized, options], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """TTL- and size-bounded response store shared across sessions."""
+
+    def __init__(self, path: str = os.path.join(DEFAULT_CACHE_DIR, "responses.sqlite3"),
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        """Return ``(text, prompt_tokens, completion_tokens)`` or None."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, prompt_tokens, completion_tokens, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or now - row[3] > self.ttl_seconds:
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            self.saved_tokens += row[1] + row[2]
+        return row[0], row[1], row[2]
+
+    def put(self, key: str, text: str, prompt_tokens: int, completion_tokens: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, prompt_tokens, completion_tokens, now, now),
+            )
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
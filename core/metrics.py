@@ -0,0 +1,76 @@
+"""Running transcript statistics for the analytics panel.
+
+:class:`TranscriptMetrics` is fed one segment at a time while transcription
+streams. Each update costs time proportional to that segment's words only,
+never to the transcript so far, so the job can keep the panel current
+without recounting the whole transcript on every refresh. ``snapshot()``
+renders the totals as a JSON-friendly dict for the job table.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+
+from core.text import tokenize
+from core.transcription import Segment
+
+TOP_TERMS = 8
+
+
+class TranscriptMetrics:
+    """Word, timing, speaker and term totals over the segments seen so far."""
+
+    def __init__(self):
+        self.segments = 0
+        self.words = 0
+        self.speech_seconds = 0.0
+        self.duration = 0.0
+        self.term_counts: Counter = Counter()
+        self.speaker_seconds: Dict[str, float] = {}
+
+    def add(self, segment: Segment) -> None:
+        self.segments += 1
+        self.words += len(segment.text.split())
+        self.speech_seconds += max(0.0, segment.end - segment.start)
+        self.duration = max(self.duration, segment.end)
+        self.term_counts.update(tokenize(segment.text))
+        self._count_speaker(segment)
+
+    def _count_speaker(self, segment: Segment) -> None:
+        if segment.speaker:
+            spoken = max(0.0, segment.end - segment.start)
+            self.speaker_seconds[segment.speaker] = self.speaker_seconds.get(segment.speaker, 0.0) + spoken
+
+    def extend(self, segments: Iterable[Segment]) -> "TranscriptMetrics":
+        for segment in segments:
+            self.add(segment)
+        return self
+
+    def recount_speakers(self, segments: Iterable[Segment]) -> None:
+        """Redo the speaker totals once diarization has labelled ``segments``."""
+        self.speaker_seconds = {}
+        for segment in segments:
+            self._count_speaker(segment)
+
+    @property
+    def words_per_minute(self) -> float:
+        """Speaking rate over the time covered by segments, pauses excluded."""
+        return 60 * self.words / self.speech_seconds if self.speech_seconds else 0.0
+
+    def top_terms(self, k: int = TOP_TERMS) -> List[Tuple[str, int]]:
+        """The ``k`` most mentioned content words with their counts."""
+        return heapq.nlargest(k, self.term_counts.items(), key=itemgetter(1))
+
+    def snapshot(self) -> Dict:
+        return {
+            "segments": self.segments,
+            "words": self.words,
+            "duration": self.duration,
+            "speech_seconds": self.speech_seconds,
+            "words_per_minute": self.words_per_minute,
+            "speakers": len(self.speaker_seconds),
+            "top_terms": [list(term) for term in self.top_terms()],
+        }
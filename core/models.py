@@ -0,0 +1,274 @@
+"""Process-wide registry of Whisper models shared by every session.
+
+Streamlit runs each browser session's script on its own thread of a single
+server process, and a Whisper model takes seconds to load and hundreds of
+MB to a few GB to hold. The registry keeps one instance per (model name,
+device) for the whole process, the way ``st.cache_resource`` shares a
+resource, so any number of sessions transcribing with ``base`` hold a
+single copy of it.
+
+A model must not run two decodes at once, so callers get a
+:class:`SharedModel` whose ``transcribe`` holds the model's lock for one
+call. Sessions therefore take turns window by window instead of queueing
+behind a whole episode. Models that nobody is using are dropped, least
+recently used first, once the loaded models exceed
+``PODCAST_AGENT_MODEL_MEMORY_MB`` or have sat idle for
+``PODCAST_AGENT_MODEL_IDLE_SECONDS``. Eviction is checked whenever a model
+is requested, released or its stats are read, and by a background thread
+every ``EVICT_CHECK_SECONDS`` while any model is loaded, so an idle model
+is freed even if nothing else happens. :meth:`ModelRegistry.stats` reports
+load time, queue wait and active references per model.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+DEFAULT_MODEL = os.getenv("WHISPER_MODEL", "base")
+MEMORY_BUDGET_MB = float(os.getenv("PODCAST_AGENT_MODEL_MEMORY_MB", "4096"))
+IDLE_SECONDS = float(os.getenv("PODCAST_AGENT_MODEL_IDLE_SECONDS", "1800"))
+# Longest gap between eviction checks while a model is loaded.
+EVICT_CHECK_SECONDS = 60.0
+
+ModelKey = Tuple[str, str]
+
+
+class ModelStats(NamedTuple):
+    name: str
+    device: str
+    load_seconds: float
+    megabytes: float
+    refs: int
+    calls: int
+    waiting: int
+    mean_wait: float
+    max_wait: float
+    idle_seconds: float
+
+
+def default_device() -> str:
+    """``cuda`` when a GPU is available, else ``cpu``."""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def load_whisper(name: str, device: str):
+    import whisper
+
+    return whisper.load_model(name, device=device)
+
+
+def model_bytes(model) -> int:
+    """Memory held by a torch model's parameters; 0 for anything else."""
+    parameters = getattr(model, "parameters", None)
+    if parameters is None:
+        return 0
+    return sum(p.numel() * p.element_size() for p in parameters())
+
+
+class SharedModel:
+    """A loaded model that any thread may use; ``transcribe`` calls run one at a time.
+
+    Attributes other than ``transcribe`` are read from the wrapped model, so
+    it stands in for the model wherever one is expected.
+    """
+
+    def __init__(self, name: str, device: str):
+        self.name = name
+        self.device_name = device
+        self.model = None
+        self.load_seconds = 0.0
+        self.nbytes = 0
+        self.refs = 0
+        self.calls = 0
+        self.waiting = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.last_used = time.monotonic()
+        self._loading = threading.Lock()
+        self._running = threading.Lock()
+        self._counters = threading.Lock()
+
+    def __getattr__(self, attr: str):
+        # Only reached for attributes not set in __init__.
+        model = self.__dict__.get("model")
+        if model is None:
+            raise AttributeError(attr)
+        return getattr(model, attr)
+
+    def load(self, loader: Callable[[str, str], object]) -> bool:
+        """Load the model unless another thread already has; True if this call loaded it."""
+        if self.model is not None:
+            return False
+        with self._loading:
+            if self.model is not None:
+                return False
+            started = time.perf_counter()
+            model = loader(self.name, self.device_name)
+            self.load_seconds = time.perf_counter() - started
+            self.nbytes = model_bytes(model)
+            self.model = model
+            self.last_used = time.monotonic()
+            return True
+
+    def transcribe(self, *args, **kwargs):
+        queued = time.perf_counter()
+        with self._counters:
+            self.waiting += 1
+        with self._running:
+            wait = time.perf_counter() - queued
+            with self._counters:
+                self.waiting -= 1
+                self.calls += 1
+                self.wait_seconds += wait
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                return self.model.transcribe(*args, **kwargs)
+            finally:
+                self.last_used = time.monotonic()
+
+    def stats(self, now: float) -> ModelStats:
+        with self._counters:
+            return ModelStats(
+                self.name,
+                self.device_name,
+                self.load_seconds,
+                self.nbytes / 2**20,
+                self.refs,
+                self.calls,
+                self.waiting,
+                self.wait_seconds / self.calls if self.calls else 0.0,
+                self.max_wait,
+                0.0 if self.refs else now - self.last_used,
+            )
+
+
+class ModelRegistry:
+    """One :class:`SharedModel` per (name, device), loaded on first use.
+
+    Concurrent first requests for a model wait for a single load. A model
+    is only evicted while no :meth:`lease` holds it; a caller that kept a
+    reference from :meth:`get` can still use an evicted model, and its
+    memory is freed once that reference goes.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], object] = load_whisper,
+        memory_budget_mb: float = MEMORY_BUDGET_MB,
+        idle_seconds: float = IDLE_SECONDS,
+    ):
+        self.loader = loader
+        self.memory_budget = int(memory_budget_mb * 2**20)
+        self.idle_seconds = idle_seconds
+        self.loads = 0
+        self.evictions = 0
+        self._models: Dict[ModelKey, SharedModel] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def get(self, name: str, device: Optional[str] = None) -> SharedModel:
+        """The shared model for ``name`` on ``device`` (default: GPU if available)."""
+        return self._acquire(name, device, pin=0)
+
+    @contextmanager
+    def lease(self, name: str, device: Optional[str] = None) -> Iterator[SharedModel]:
+        """The shared model, counted as in use (and never evicted) until the block exits."""
+        shared = self._acquire(name, device, pin=1)
+        try:
+            yield shared
+        finally:
+            with self._lock:
+                shared.refs -= 1
+                shared.last_used = time.monotonic()
+            self.evict()
+
+    def _acquire(self, name: str, device: Optional[str], pin: int) -> SharedModel:
+        key = (name, device or default_device())
+        with self._lock:
+            shared = self._models.get(key)
+            if shared is None:
+                shared = self._models[key] = SharedModel(*key)
+            shared.refs += pin
+        try:
+            loaded = shared.load(self.loader)
+        except BaseException:
+            with self._lock:
+                shared.refs -= pin
+                if shared.model is None and self._models.get(key) is shared:
+                    del self._models[key]
+            raise
+        if loaded:
+            with self._lock:
+                self.loads += 1
+                self._start_reaper()
+        self.evict(keep=key)
+        return shared
+
+    def _start_reaper(self) -> None:
+        """Start the eviction thread unless it is running; the caller holds the lock."""
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        # Runs while any model is loaded; the next load starts a new one.
+        while True:
+            # At least a second apart, or an idle timeout of 0 would spin.
+            time.sleep(max(1.0, min(EVICT_CHECK_SECONDS, self.idle_seconds)))
+            self.evict()
+            with self._lock:
+                if not self._models:
+                    self._reaper = None
+                    return
+
+    def evict(self, keep: Optional[ModelKey] = None) -> List[ModelKey]:
+        """Drop unused models that are over the memory budget or idle too long.
+
+        ``keep`` is spared, so a model that was just loaded is not dropped to
+        make room for itself. Returns the keys evicted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            total = sum(shared.nbytes for shared in self._models.values())
+            unused = sorted(
+                (key for key, shared in self._models.items()
+                 if key != keep and shared.refs == 0 and shared.model is not None),
+                key=lambda key: self._models[key].last_used,
+            )
+            evicted = []
+            for key in unused:
+                shared = self._models[key]
+                if total > self.memory_budget or now - shared.last_used >= self.idle_seconds:
+                    del self._models[key]
+                    total -= shared.nbytes
+                    evicted.append(key)
+            self.evictions += len(evicted)
+        if evicted:
+            gc.collect()
+            if any(device.startswith("cuda") for _, device in evicted):
+                import torch
+
+                torch.cuda.empty_cache()
+        return evicted
+
+    def stats(self) -> List[ModelStats]:
+        """Load time, memory, queue wait and active references of each loaded model."""
+        self.evict()
+        now = time.monotonic()
+        with self._lock:
+            loaded = [shared for shared in self._models.values() if shared.model is not None]
+        return [shared.stats(now) for shared in loaded]
+
+
+# Module globals live for the whole server process and are shared by every
+# session's script thread, which is all st.cache_resource would add here.
+registry = ModelRegistry()
@@ -0,0 +1,189 @@
+"""Process-pool transcription across silence-delimited audio chunks.
+
+A single Whisper decode only keeps one core busy. Here the decoded audio is
+cut into long chunks at quiet points, the chunks are transcribed concurrently
+by worker processes that each hold their own model, and the per-chunk
+segments are stitched back together on the global timeline.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.audio import SAMPLE_RATE, decode_audio
+from core.transcription import (
+    DEFAULT_MODEL,
+    AudioSource,
+    Segment,
+    load_model,
+    restore_times,
+    spooled_audio,
+    transcribe_window,
+)
+from core.vad import VoiceActivityDetector
+
+CHUNK_SECONDS = 300.0
+SEARCH_SECONDS = 15.0
+OVERLAP_SECONDS = 1.0
+
+# Energy is measured over 20 ms frames when looking for a cut point.
+_FRAME = SAMPLE_RATE // 50
+# Longest run of words looked for when trimming text repeated across a seam.
+_MAX_REPEAT_WORDS = 8
+
+_worker_model = None
+
+
+def _quietest_frame(audio: np.ndarray) -> int:
+    """Return the sample index at the start of the lowest-energy frame."""
+    frames = len(audio) // _FRAME
+    if frames == 0:
+        return len(audio)
+    energy = np.square(audio[:frames * _FRAME]).reshape(frames, _FRAME).sum(axis=1)
+    return int(np.argmin(energy)) * _FRAME
+
+
+def split_at_silence(
+    blocks: Iterable[np.ndarray],
+    chunk_seconds: float = CHUNK_SECONDS,
+    search_seconds: float = SEARCH_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """Cut streamed PCM into ``(offset_seconds, chunk)`` pairs at quiet points.
+
+    Each cut lands on the quietest frame in the last ``search_seconds`` before
+    the ``chunk_seconds`` mark. The following chunk starts ``overlap_seconds``
+    before the cut so a word clipped by a bad cut is still heard whole once.
+    """
+    target = int(chunk_seconds * SAMPLE_RATE)
+    search = min(int(search_seconds * SAMPLE_RATE), target)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+
+    pending: List[np.ndarray] = []
+    pending_len = 0
+    offset = 0
+    for block in blocks:
+        pending.append(block)
+        pending_len += len(block)
+        while pending_len >= target:
+            audio = np.concatenate(pending)
+            cut = target - search + _quietest_frame(audio[target - search:target])
+            cut = max(cut, overlap + _FRAME)
+            yield offset / SAMPLE_RATE, audio[:cut]
+            restart = cut - overlap
+            pending, pending_len = [audio[restart:]], len(audio) - restart
+            offset += restart
+
+    if pending_len > overlap or (offset == 0 and pending_len > 0):
+        yield offset / SAMPLE_RATE, np.concatenate(pending)
+
+
+def _strip_repeated_words(previous: str, text: str) -> str:
+    """Remove a leading run of words in ``text`` that ends ``previous``."""
+    prev_words = previous.split()
+    words = text.split()
+    norm = lambda w: w.strip(".,!?;:\"'").lower()  # noqa: E731
+    for k in range(min(_MAX_REPEAT_WORDS, len(prev_words), len(words)), 0, -1):
+        if [norm(w) for w in prev_words[-k:]] == [norm(w) for w in words[:k]]:
+            return " ".join(words[k:])
+    return text
+
+
+def merge_segments(
+    chunks: Iterable[Tuple[float, List[Segment]]], overlap_seconds: float = OVERLAP_SECONDS
+) -> Iterator[Segment]:
+    """Stitch ``(chunk offset, globally-timed segments)`` pairs into one stream.
+
+    Segments re-transcribed from the overlap are dropped as by
+    :func:`core.transcription.dedupe_overlap`. Words repeated across a seam
+    are trimmed only from a chunk's leading segments that start inside its
+    overlap with the previous chunk, so repeats within one chunk ("Really,
+    really.") are kept.
+    """
+    last_end = 0.0
+    previous: Optional[Segment] = None
+    previous_chunk = -1
+    for index, (offset, segments) in enumerate(chunks):
+        seam_end = offset + overlap_seconds
+        for seg in segments:
+            if not seg.text or (seg.start + seg.end) / 2 < last_end:
+                continue
+            if seg.start < last_end:
+                seg = seg._replace(start=last_end)
+            if previous is not None and previous_chunk != index and seg.start < seam_end:
+                seg = seg._replace(text=_strip_repeated_words(previous.text, seg.text))
+                if not seg.text:
+                    continue
+            last_end = seg.end
+            previous, previous_chunk = seg, index
+            yield seg
+
+
+def _init_worker(loader: Callable, model_name: str, threads: int) -> None:
+    global _worker_model
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _worker_model = loader(model_name)
+
+
+def _transcribe_chunk(chunk: np.ndarray, offset: float, options: dict) -> List[Segment]:
+    return list(transcribe_window(_worker_model, chunk, offset, **options))
+
+
+def transcribe_parallel(
+    source: AudioSource,
+    workers: Optional[int] = None,
+    model_name: str = DEFAULT_MODEL,
+    language: Optional[str] = None,
+    chunk_seconds: float = CHUNK_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+    loader: Callable = load_model,
+    vad: Optional[VoiceActivityDetector] = None,
+    **options,
+) -> Iterator[Segment]:
+    """Transcribe ``source`` on ``workers`` processes, yielding segments in order.
+
+    ``loader`` builds the per-process model from ``model_name`` and must be
+    picklable; it defaults to :func:`core.transcription.load_model`. With a
+    ``vad``, non-speech audio is cut out before chunking.
+    """
+    workers = workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    options = dict(options, language=language)
+
+    def ordered_results(path: str) -> Iterator[Tuple[float, List[Segment]]]:
+        blocks = decode_audio(path)
+        if vad is not None:
+            blocks = vad.drop_silence(blocks)
+        chunks = split_at_silence(blocks, chunk_seconds, overlap_seconds=overlap_seconds)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process that already holds torch threads can deadlock.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(loader, model_name, threads),
+        ) as pool:
+            # Keep a couple of chunks queued per worker without decoding the
+            # whole episode into memory up front.
+            in_flight = deque()
+            for offset, chunk in chunks:
+                in_flight.append((offset, pool.submit(_transcribe_chunk, chunk, offset, options)))
+                if len(in_flight) >= workers * 2:
+                    offset, future = in_flight.popleft()
+                    yield offset, future.result()
+            while in_flight:
+                offset, future = in_flight.popleft()
+                yield offset, future.result()
+
+    with spooled_audio(source) as path:
+        yield from restore_times(merge_segments(ordered_results(path), overlap_seconds), vad)
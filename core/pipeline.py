@@ -0,0 +1,169 @@
+"""End-to-end episode processing shared by the UI's background jobs.
+
+``process_episode`` is the job handler behind "🚀 Start Processing": it
+transcribes the spooled upload (through the transcript cache), detects
+chapters, ranks quotable moments, adds the episode to the search index and
+runs the shared analysis pass, reporting progress as it goes.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.analysis import AnalysisResult, Chapter, run_analysis
+from core.cache import TranscriptCache, cache_key, hash_audio, hash_transcript
+from core.chapters import detect_chapters
+from core.diarization import INCREMENTAL_AFTER_SECONDS, assign_speakers, diarize
+from core.lazy import lazy_import
+from core.llm_cache import ResponseCache
+from core.metrics import TranscriptMetrics
+from core.parallel import transcribe_parallel
+from core.quotes import Quote, top_quotes
+from core.search import SearchIndex
+from core.transcription import DEFAULT_MODEL, Segment, probe_duration, transcribe_stream
+from core.vad import VoiceActivityDetector
+
+openai = lazy_import("openai")
+
+# progress(fraction, message, details=None); details carry live metrics
+Progress = Callable[..., None]
+
+# Share of the progress bar given to transcription; analysis gets the rest.
+_TRANSCRIPTION_SHARE = 0.9
+# Minimum seconds between live metrics snapshots sent with progress.
+_METRICS_INTERVAL = 1.0
+
+
+def transcribe_episode(
+    audio_path: str,
+    progress: Progress,
+    transcript_cache: Optional[TranscriptCache] = None,
+    model_name: str = DEFAULT_MODEL,
+    workers: int = 1,
+    vad: Optional[VoiceActivityDetector] = None,
+    speakers: bool = False,
+    metrics: Optional[TranscriptMetrics] = None,
+) -> List[Segment]:
+    """Transcribe ``audio_path``, reusing a cached transcript when possible.
+
+    With a ``vad``, silence is skipped and its statistics are left on it.
+    With ``speakers``, segments are labelled by diarization. ``metrics`` is
+    updated per segment and sent along with progress at most every
+    ``_METRICS_INTERVAL`` seconds.
+    """
+    options = {"skip_silence": True} if vad is not None else {}
+    if speakers:
+        options["speakers"] = True
+    key = cache_key(hash_audio(audio_path), model_name, **options)
+    if transcript_cache is not None:
+        segments = transcript_cache.get(key)
+        if segments is not None:
+            if metrics is not None:
+                metrics.extend(segments)
+            progress(1.0, "Transcript loaded from cache", metrics.snapshot() if metrics is not None else None)
+            return segments
+
+    duration = probe_duration(audio_path)
+    progress(0.0, "Decoding audio to 16 kHz mono...")
+    if workers > 1:
+        stream = transcribe_parallel(audio_path, workers=workers, model_name=model_name, vad=vad)
+    else:
+        stream = transcribe_stream(audio_path, model_name=model_name, vad=vad)
+    segments = []
+    published = 0.0
+    for segment in stream:
+        segments.append(segment)
+        details = None
+        if metrics is not None:
+            metrics.add(segment)
+            if time.monotonic() - published >= _METRICS_INTERVAL:
+                details = metrics.snapshot()
+                published = time.monotonic()
+        progress(segment.end / duration if duration else 0.0, segment.text, details)
+
+    if speakers and segments:
+        progress(1.0, "Identifying speakers...")
+        incremental = (duration or segments[-1].end) > INCREMENTAL_AFTER_SECONDS
+        segments = assign_speakers(segments, diarize(audio_path, incremental=incremental))
+        if metrics is not None:
+            metrics.recount_speakers(segments)
+
+    if transcript_cache is not None:
+        transcript_cache.put(key, segments)
+    return segments
+
+
+def process_episode(
+    payload: Dict,
+    progress: Progress,
+    transcript_cache: Optional[TranscriptCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+    search_index: Optional[SearchIndex] = None,
+) -> Dict:
+    """Job handler: transcribe and analyse the episode at ``payload["audio_path"]``.
+
+    A failed analysis does not fail the job; the transcript is still returned
+    with ``analysis_error`` set so the page can retry analysis on its own.
+    """
+    audio_path = payload["audio_path"]
+    vad = VoiceActivityDetector() if payload.get("skip_silence", True) else None
+    metrics = TranscriptMetrics()
+    try:
+        segments = transcribe_episode(
+            audio_path,
+            lambda fraction, message, details=None: progress(fraction * _TRANSCRIPTION_SHARE, message, details),
+            transcript_cache,
+            payload.get("model_name", DEFAULT_MODEL),
+            payload.get("workers", 1),
+            vad,
+            payload.get("detect_speakers", False),
+            metrics,
+        )
+    finally:
+        if payload.get("delete_audio"):
+            os.remove(audio_path)
+
+    transcript_hash = hash_transcript(segments)
+    if search_index is not None and segments:
+        title = payload.get("title") or os.path.basename(audio_path)
+        search_index.add_episode(transcript_hash, title, segments)
+
+    # The VAD saw no audio when the transcript came from the cache.
+    measured = vad is not None and vad.total_seconds > 0
+    quotes = top_quotes(segments)
+    result = {
+        "segments": [list(segment) for segment in segments],
+        "transcript_hash": transcript_hash,
+        "analysis": None,
+        "analysis_error": None,
+        "chapters": [list(chapter) for chapter in detect_chapters(segments)],
+        "quotes": [list(quote) for quote in quotes],
+        "metrics": metrics.snapshot(),
+        "duration": vad.total_seconds if measured else None,
+        "skipped_fraction": vad.skipped_fraction if measured else None,
+    }
+    if payload.get("analyze", True) and segments:
+        progress(_TRANSCRIPTION_SHARE, "Analyzing transcript...")
+        try:
+            result["analysis"] = run_analysis(segments, cache=response_cache, local_quotes=bool(quotes)).to_dict()
+        except openai.OpenAIError as error:
+            result["analysis_error"] = str(error)
+    return result
+
+
+def segments_from_result(result: Dict) -> List[Segment]:
+    return [Segment(*segment) for segment in result["segments"]]
+
+
+def chapters_from_result(result: Dict) -> List[Chapter]:
+    return [Chapter(*chapter) for chapter in result.get("chapters") or []]
+
+
+def quotes_from_result(result: Dict) -> List[Quote]:
+    return [Quote(*quote) for quote in result.get("quotes") or []]
+
+
+def analysis_from_result(result: Dict) -> Optional[AnalysisResult]:
+    return AnalysisResult.from_dict(result["analysis"]) if result.get("analysis") else None
@@ -0,0 +1,141 @@
+"""Heuristic ranking of quotable sentences in a transcript.
+
+Segments are joined and re-split into sentences, since Whisper segments
+often break mid-sentence. Each sentence is scored from features computed
+in one batch over every word of the transcript: a comfortable length,
+strong sentiment words, rhetorical markers (questions, contrasts,
+absolutes, direct address, numbers) and emphasis (exclamations,
+intensifiers, shouted words). Sentences that lean on earlier context or
+are full of fillers are penalised. The best ``k`` are picked with a heap
+rather than a full sort.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.transcription import Segment
+
+TOP_K = 12
+# Sentences scoring below this are not worth quoting, however few remain.
+MIN_SCORE = 1.0
+IDEAL_WORDS = 16
+MIN_WORDS = 6
+MAX_WORDS = 40
+
+_SENTENCE = re.compile(r"[^.!?\n]+[.!?]*")
+_WORD = re.compile(r"[A-Za-z0-9']+")
+
+# Word classes, in the column order of the per-sentence count matrix.
+_SENTIMENT, _RHETORIC, _EMPHASIS, _FILLER = 1, 2, 3, 4
+_CLASS_WORDS = {
+    _SENTIMENT: """
+        love hate amazing awful incredible terrible brilliant beautiful powerful painful fear afraid
+        happy proud success failure fail failed win won lose lost best worst hard easy simple magic
+        dream passion wrong mistake mistakes secret truth honest scary exciting crazy huge massive
+        regret expensive
+        """,
+    _RHETORIC: """
+        never always every everyone everything nobody nothing only instead but yet unless until
+        you your most why how biggest greatest key rule lesson difference
+        """,
+    _EMPHASIS: "really absolutely incredibly truly completely totally literally seriously",
+    _FILLER: "um uh like basically yeah mean guess okay",
+}
+# Each lexicon word gets an id (0 is "not in the lexicon") so that repeats
+# within a sentence can be collapsed before counting.
+_LEXICON = {word: i + 1 for i, word in enumerate(
+    word for words in _CLASS_WORDS.values() for word in words.split()
+)}
+_WORD_CLASS = np.array([0] + [cls for cls, words in _CLASS_WORDS.items() for _ in words.split()])
+# Opening words that point back at earlier talk, so the sentence cannot stand alone.
+_DANGLING = frozenset("and so but because it that this they he she which then also".split())
+
+
+class Quote(NamedTuple):
+    text: str
+    start: float
+    speaker: Optional[str] = None
+
+
+def split_sentences(segments: Sequence[Segment]) -> Tuple[List[str], List[int]]:
+    """Return transcript sentences and the index of the segment each starts in.
+
+    A change of speaker always ends a sentence.
+    """
+    parts, offsets, length = [], [], 0
+    for i, seg in enumerate(segments):
+        offsets.append(length)
+        text = seg.text.strip()
+        following = segments[i + 1].speaker if i + 1 < len(segments) else None
+        parts.append(text + ("\n" if following != seg.speaker else " "))
+        length += len(parts[-1])
+    sentences, owners = [], []
+    for match in _SENTENCE.finditer("".join(parts)):
+        raw = match.group()
+        sentence = raw.strip()
+        if sentence:
+            sentences.append(sentence)
+            owners.append(bisect_right(offsets, match.start() + len(raw) - len(raw.lstrip())) - 1)
+    return sentences, owners
+
+
+def score_sentences(sentences: Sequence[str]) -> np.ndarray:
+    """Return a quotability score per sentence; unusable ones get ``-inf``."""
+    words, rows = [], []
+    for row, sentence in enumerate(sentences):
+        tokens = _WORD.findall(sentence)
+        words.extend(tokens)
+        rows.extend([row] * len(tokens))
+    n = len(sentences)
+    if not words:
+        return np.full(n, -np.inf)
+    rows = np.array(rows)
+    lowered = [word.lower() for word in words]
+    codes = np.fromiter((_LEXICON.get(word, 0) for word in lowered), dtype=np.int64, count=len(words))
+    length = np.bincount(rows, minlength=n)
+    # Distinct lexicon words per sentence, by class: saying "you" five times
+    # is not five rhetorical devices.
+    pairs = np.unique(rows[codes > 0] * len(_WORD_CLASS) + codes[codes > 0])
+    counts = np.bincount(
+        pairs // len(_WORD_CLASS) * 5 + _WORD_CLASS[pairs % len(_WORD_CLASS)], minlength=n * 5
+    ).reshape(n, 5)
+    # Fillers count every time: a sentence full of "um" reads badly.
+    fillers = np.bincount(rows, weights=_WORD_CLASS[codes] == _FILLER, minlength=n)
+    shouted = np.bincount(rows, weights=[len(w) > 1 and w.isupper() and w != "I" for w in words], minlength=n)
+    numbers = np.bincount(rows, weights=[w[0].isdigit() for w in words], minlength=n)
+
+    ends = np.array([sentence[-1] for sentence in sentences])
+    first = [lowered[i] if i < len(lowered) else "" for i in np.concatenate(([0], np.cumsum(length)[:-1]))]
+    dangling = np.array([word in _DANGLING for word in first])
+
+    safe = np.maximum(length, 1)
+    scores = (
+        -np.abs(np.log2(safe / IDEAL_WORDS))
+        + 1.5 * np.minimum(counts[:, _SENTIMENT], 3)
+        + 0.8 * np.minimum(counts[:, _RHETORIC], 3)
+        + 0.5 * np.minimum(numbers, 2)
+        + 0.8 * (ends == "?")
+        + 1.0 * (ends == "!")
+        + 0.6 * np.minimum(counts[:, _EMPHASIS] + shouted, 2)
+        - 0.75 * fillers
+        - 1.5 * dangling
+    )
+    return np.where((length >= MIN_WORDS) & (length <= MAX_WORDS), scores, -np.inf)
+
+
+def top_quotes(segments: Sequence[Segment], k: int = TOP_K, min_score: float = MIN_SCORE) -> List[Quote]:
+    """Return up to ``k`` of the most quotable sentences, best first."""
+    sentences, owners = split_sentences(segments)
+    scores = score_sentences(sentences)
+    # Repeated lines (intros, catchphrases) count once, at their first airing.
+    unique = {}
+    for i, sentence in enumerate(sentences):
+        unique.setdefault(sentence.lower(), i)
+    best = heapq.nlargest(k, (i for i in unique.values() if scores[i] >= min_score), key=scores.__getitem__)
+    return [Quote(sentences[i], segments[owners[i]].start, segments[owners[i]].speaker) for i in best]
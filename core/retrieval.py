@@ -0,0 +1,228 @@
+"""Local semantic retrieval of transcript chunks for grounded generation.
+
+A transcript is cut into chunks of about ``CHUNK_SECONDS`` that are embedded
+into unit-length vectors and kept in a :class:`VectorIndex`: one float32
+matrix searched by brute force, a block of rows at a time, with a single
+matrix multiply for every query in a batch. With ``quantized=True`` rows are
+stored as int8 with a per-row scale, a quarter of the memory, and are
+widened back to float32 one block at a time while searching.
+
+Embedders are pluggable: anything with a ``dim`` and an ``embed(texts)``
+returning an ``(n, dim)`` array will do. :class:`HashingEmbedder` is the
+default, a deterministic feature-hashing embedder that needs no model or
+network, so results are the same on every machine.
+
+:class:`TranscriptIndex` ties the two together. Each content type asks for
+the chunks closest to the episode digest, nudged towards what that format
+needs, so generators see a few relevant excerpts instead of the transcript.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from core.text import tokenize
+from core.transcription import Segment
+
+DEFAULT_DIM = 256
+CHUNK_SECONDS = 45.0
+EXCERPTS_PER_FORMAT = 4
+# Rows scored per matrix multiply. Small enough that a widened int8 block
+# stays in cache, which keeps the quantized index as fast as float32.
+BLOCK_ROWS = 1 << 14
+# Weight of the per-format hint against the digest in retrieval queries.
+FOCUS_WEIGHT = 0.5
+
+# What each content type looks for in the transcript, beyond the digest.
+FORMAT_QUERIES = {
+    "Twitter Thread": "surprising bold claim insight lesson numbers",
+    "LinkedIn Post": "lesson career leadership team business experience",
+    "Blog Post": "explain how why example steps process detail",
+    "Newsletter": "takeaway key point recommendation advice",
+    "YouTube Shorts": "story moment happened surprising reveal",
+    "TikTok Script": "story secret mistake surprising crazy",
+}
+
+
+class Chunk(NamedTuple):
+    text: str
+    start: float
+    end: float
+
+
+class Embedder(Protocol):
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an ``(len(texts), dim)`` float32 array."""
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length; all-zero rows stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.float32(1e-12))
+
+
+class HashingEmbedder:
+    """Signed feature hashing of content words and adjacent word pairs.
+
+    Counts are damped with ``1 + log(count)``, so a chunk that repeats a
+    word is not dominated by it.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            bucket = self._buckets[feature] = (value % self.dim, 1.0 if value >> 63 else -1.0)
+        return bucket
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows, columns, weights = [], [], []
+        for row, text in enumerate(texts):
+            words = tokenize(text)
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                column, sign = self._bucket(feature)
+                rows.append(row)
+                columns.append(column)
+                weights.append(sign)
+        cells = np.array(rows, dtype=np.int64) * self.dim + np.array(columns, dtype=np.int64)
+        # Signed counts per cell; colliding features partly cancel, as in any feature hashing.
+        counts = np.bincount(cells, weights=weights, minlength=len(texts) * self.dim).astype(np.float32)
+        nonzero = counts != 0
+        counts[nonzero] = np.sign(counts[nonzero]) * (1 + np.log(np.abs(counts[nonzero])))
+        vectors = counts.reshape(len(texts), self.dim)
+        return normalize(vectors)
+
+
+class VectorIndex:
+    """Brute-force inner-product index over unit-length vectors."""
+
+    def __init__(self, dim: int, quantized: bool = False):
+        self.dim = dim
+        self.quantized = quantized
+        self._vectors = np.empty((0, dim), dtype=np.int8 if quantized else np.float32)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._vectors[:self._size].nbytes + (self._scales[:self._size].nbytes if self.quantized else 0)
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """Append ``vectors`` (normalized here) and return their ids."""
+        vectors = normalize(np.atleast_2d(vectors))
+        n = len(vectors)
+        if self._size + n > len(self._vectors):
+            # Grow geometrically so repeated adds stay linear overall.
+            capacity = max(self._size + n, 2 * len(self._vectors))
+            grown = np.empty((capacity, self.dim), dtype=self._vectors.dtype)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+            if self.quantized:
+                self._scales = np.resize(self._scales, capacity)
+        rows = slice(self._size, self._size + n)
+        if self.quantized:
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1
+            self._vectors[rows] = np.rint(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._vectors[rows] = vectors
+        self._size += n
+        return np.arange(rows.start, rows.stop)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top ``k`` ``(scores, ids)`` per query row, best first; both ``(len(queries), k)``."""
+        queries = normalize(np.atleast_2d(queries))
+        k = min(k, self._size)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_ids = np.empty((len(queries), 0), dtype=np.int64)
+        for first in range(0, self._size, BLOCK_ROWS):
+            stop = min(first + BLOCK_ROWS, self._size)
+            block = self._vectors[first:stop]
+            if self.quantized:
+                scores = (queries @ block.T.astype(np.float32)) * self._scales[first:stop]
+            else:
+                scores = queries @ block.T
+            if stop - first > k:
+                top = np.argpartition(scores, -k, axis=1)[:, -k:]
+                scores = np.take_along_axis(scores, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(stop - first), scores.shape)
+            # Merge the block's best with the best so far, keeping k.
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_ids = np.concatenate([best_ids, top + first], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(best_scores, -k, axis=1)[:, -k:]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
+
+
+def chunk_segments(segments: Iterable[Segment], seconds: float = CHUNK_SECONDS) -> List[Chunk]:
+    """Group consecutive segments into chunks of about ``seconds``."""
+    chunks: List[Chunk] = []
+    texts: List[str] = []
+    start = end = 0.0
+    for seg in segments:
+        if texts and seg.end - start > seconds:
+            chunks.append(Chunk(" ".join(texts), start, end))
+            texts = []
+        if not texts:
+            start = seg.start
+        texts.append(seg.text.strip())
+        end = seg.end
+    if texts:
+        chunks.append(Chunk(" ".join(texts), start, end))
+    return chunks
+
+
+class TranscriptIndex:
+    """Embedded chunks of one transcript, searchable by text."""
+
+    def __init__(self, chunks: Sequence[Chunk], embedder: Optional[Embedder] = None, quantized: bool = False):
+        self.chunks = list(chunks)
+        self.embedder = embedder or HashingEmbedder()
+        self.index = VectorIndex(self.embedder.dim, quantized)
+        if self.chunks:
+            self.index.add(self.embedder.embed([chunk.text for chunk in self.chunks]))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment], embedder: Optional[Embedder] = None,
+                      seconds: float = CHUNK_SECONDS, quantized: bool = False) -> "TranscriptIndex":
+        return cls(chunk_segments(segments, seconds), embedder, quantized)
+
+    def search(self, queries: np.ndarray, k: int) -> List[List[Chunk]]:
+        """The ``k`` closest chunks to each query vector, in transcript order."""
+        if not self.chunks:
+            return [[] for _ in range(len(np.atleast_2d(queries)))]
+        _, ids = self.index.search(queries, k)
+        return [[self.chunks[i] for i in sorted(row)] for row in ids]
+
+    def excerpts(self, content_types: Iterable[str], context: str,
+                 k: int = EXCERPTS_PER_FORMAT) -> Dict[str, List[Chunk]]:
+        """The chunks each content type should draw on, for an episode described by ``context``.
+
+        All formats are searched in one batch: the digest vector plus a
+        format-specific hint from :data:`FORMAT_QUERIES`.
+        """
+        content_types = list(content_types)
+        if not content_types:
+            return {}
+        vectors = self.embedder.embed([context] + [FORMAT_QUERIES.get(name, "") for name in content_types])
+        queries = vectors[:1] + FOCUS_WEIGHT * vectors[1:]
+        return dict(zip(content_types, self.search(queries, k)))
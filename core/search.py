@@ -0,0 +1,223 @@
+"""Full-text search over every processed episode, backed by SQLite FTS5.
+
+Each finished transcript is added once. Its segments are grouped into
+passages of about ``PASSAGE_SECONDS`` that become rows of an FTS5 table,
+and the episode is recorded under a hash of its transcript. Adding an
+episode that is already recorded returns immediately, so the index only
+ever grows by the new episodes and never re-scans old ones.
+
+Queries use the FTS5 inverted index with BM25 ranking and support quoted
+phrases. Besides its text, every passage carries tag tokens for its
+episode and its ``BUCKET_SECONDS`` time buckets, so queries limited to one
+episode or to a time range (by argument, or with ``after:MM:SS`` and
+``before:MM:SS`` in the query text) are answered from the index rather
+than by filtering every match. Very broad queries rank only the newest
+``MAX_CANDIDATES`` matching passages, which keeps them in the millisecond
+range however large the archive grows. Hits report the start of the
+segment that matched, recovered from per-passage segment offsets.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.cache import DEFAULT_CACHE_DIR
+from core.timestamps import parse_timestamp
+
+if TYPE_CHECKING:
+    from core.transcription import Segment
+
+DEFAULT_LIMIT = 20
+# Tokens of context around the match in result snippets.
+SNIPPET_TOKENS = 12
+PASSAGE_SECONDS = 30.0
+BUCKET_SECONDS = 300.0
+# Longer time ranges are filtered after matching instead of by bucket tags.
+MAX_BUCKETS = 24
+# Queries matching more passages than this rank only the newest ones.
+MAX_CANDIDATES = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    duration REAL NOT NULL,
+    segments INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS episodes_indexed_at ON episodes (indexed_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+    text, tags, episode UNINDEXED, start UNINDEXED, "end" UNINDEXED, starts UNINDEXED, offsets UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_ANCHOR = re.compile(r"\b(after|before):(\d+(?::\d+){0,2})")
+_WORD = re.compile(r"\w+")
+
+
+class Episode(NamedTuple):
+    key: str
+    title: str
+    duration: float
+    segments: int
+    indexed_at: float
+
+
+class Hit(NamedTuple):
+    key: str
+    title: str
+    start: float
+    snippet: str
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every word or ``"quoted phrase"`` must match."""
+    parts = []
+    for phrase, word in _TERM.findall(text):
+        words = _WORD.findall(phrase or word)
+        if words:
+            parts.append('"' + " ".join(words) + '"')
+    return " AND ".join(parts)
+
+
+def parse_query(text: str) -> Tuple[str, Optional[float], Optional[float]]:
+    """Split ``after:``/``before:`` time anchors off ``text``; returns ``(text, start, end)``."""
+    anchors = {name: parse_timestamp(value) for name, value in _ANCHOR.findall(text)}
+    return _ANCHOR.sub(" ", text), anchors.get("after"), anchors.get("before")
+
+
+def _passages(segments: List[Segment], episode: int) -> List[tuple]:
+    """Group consecutive segments into passage rows of about ``PASSAGE_SECONDS``."""
+    rows = []
+    i = 0
+    while i < len(segments):
+        first = segments[i]
+        texts, starts, offsets, length = [], [], [], 0
+        j = i
+        while j < len(segments) and (j == i or segments[j].end - first.start <= PASSAGE_SECONDS):
+            text = segments[j].text.strip()
+            texts.append(text)
+            starts.append(f"{segments[j].start:.2f}")
+            offsets.append(str(length))
+            length += len(text) + 1
+            j += 1
+        last = segments[j - 1].end
+        buckets = range(int(first.start // BUCKET_SECONDS), int(last // BUCKET_SECONDS) + 1)
+        tags = " ".join([f"e{episode}"] + [f"t{b}" for b in buckets])
+        rows.append((" ".join(texts), tags, episode, first.start, last, " ".join(starts), " ".join(offsets)))
+        i = j
+    return rows
+
+
+class SearchIndex:
+    """Episode search index shared across sessions."""
+
+    def __init__(self, path: str = os.path.join(DEFAULT_CACHE_DIR, "search.sqlite3")):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def add_episode(self, key: str, title: str, segments: Iterable[Segment]) -> bool:
+        """Index ``segments`` under ``key`` unless it is already indexed; True if added."""
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM episodes WHERE key = ?", (key,)).fetchone():
+                return False
+            segments = list(segments)
+            duration = max((seg.end for seg in segments), default=0.0)
+            with self._db:
+                cursor = self._db.execute(
+                    "INSERT INTO episodes (key, title, duration, segments, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, title, duration, len(segments), time.time()),
+                )
+                self._db.executemany(
+                    'INSERT INTO passages (text, tags, episode, start, "end", starts, offsets) '
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    _passages(segments, cursor.lastrowid),
+                )
+        return True
+
+    def search(self, query: str, start: Optional[float] = None, end: Optional[float] = None,
+               key: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> List[Hit]:
+        """Best matches for ``query``, optionally between ``start`` and ``end`` seconds or in one episode.
+
+        Anchors in the query text take precedence over ``start`` and ``end``.
+        """
+        query, after, before = parse_query(query)
+        start = after if after is not None else start
+        end = before if before is not None else end
+        match = fts_query(query)
+        if not match:
+            return []
+        conditions = [f"text : ({match})"]
+        filters, params = "", []
+        with self._lock:
+            if key is not None:
+                row = self._db.execute("SELECT id FROM episodes WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return []
+                conditions.append(f"tags : e{row[0]}")
+            if start is not None or end is not None:
+                if end is None:
+                    end = self._db.execute("SELECT MAX(duration) FROM episodes").fetchone()[0] or 0.0
+                first = int((start or 0.0) // BUCKET_SECONDS)
+                last = int(end // BUCKET_SECONDS)
+                if last - first < MAX_BUCKETS:
+                    conditions.append("tags : (" + " OR ".join(f"t{b}" for b in range(first, last + 1)) + ")")
+                filters = ' AND passages."end" > ? AND passages.start < ?'
+                params = [start or 0.0, end]
+            match = " AND ".join(conditions)
+
+            # Rank only the newest MAX_CANDIDATES matches: FTS5 walks matches
+            # in rowid order cheaply, but must score every one it ranks. The
+            # cutoff counts filtered matches only, or rows outside the time
+            # range could push every match in it past the cutoff.
+            row = self._db.execute(
+                f"SELECT rowid FROM passages WHERE passages MATCH ?{filters} ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                [match, *params, MAX_CANDIDATES - 1],
+            ).fetchone()
+            ids = [rowid for rowid, in self._db.execute(
+                f"SELECT rowid FROM passages WHERE passages MATCH ? AND rowid >= ?{filters} "
+                "ORDER BY bm25(passages, 1.0, 0.0) LIMIT ?",
+                [match, row[0] if row else 0, *params, limit],
+            )]
+            if not ids:
+                return []
+            # Snippets are built for the winners only.
+            rows = self._db.execute(
+                "SELECT passages.rowid, episodes.key, episodes.title, passages.starts, passages.offsets, "
+                "instr(highlight(passages, 0, char(2), char(3)), char(2)) - 1, "
+                f"snippet(passages, 0, '**', '**', '…', {SNIPPET_TOKENS}) "
+                "FROM passages JOIN episodes ON episodes.id = passages.episode "
+                f"WHERE passages MATCH ? AND passages.rowid IN ({', '.join('?' * len(ids))})",
+                [match, *ids],
+            ).fetchall()
+        order = {rowid: i for i, rowid in enumerate(ids)}
+        hits = []
+        for _, key, title, starts, offsets, position, snippet in sorted(rows, key=lambda r: order[r[0]]):
+            # Start of the segment holding the first highlighted match.
+            index = bisect_right([int(o) for o in offsets.split()], position) - 1
+            hits.append(Hit(key, title, float(starts.split()[max(0, index)]), snippet))
+        return hits
+
+    def recent(self, limit: int = 5) -> List[Episode]:
+        """The most recently indexed episodes, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, title, duration, segments, indexed_at FROM episodes ORDER BY indexed_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [Episode(*row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
@@ -0,0 +1,172 @@
+"""Compact, columnar transcript storage with lookup by time.
+
+A :class:`TranscriptStore` keeps a transcript as a handful of NumPy columns
+instead of one Python object per segment: ``float32`` start and end times,
+``int16`` speaker ids, and every segment's UTF-8 text concatenated into one
+byte buffer addressed by ``uint32`` offsets. Segments are only built when
+they are read, so a transcript costs its UTF-8 text plus 14 bytes per
+segment, about a third of the same transcript as a list of dicts.
+
+The store saves to a single uncompressed file whose columns are aligned
+raw arrays behind a small JSON header, so :meth:`TranscriptStore.open` can
+memory-map it and read any stretch of a long episode without loading the
+rest.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union, overload
+
+import numpy as np
+
+from core.transcription import Segment
+
+_MAGIC = b"PTRS"
+_VERSION = 1
+_ALIGN = 8
+# magic, version, header length
+_PREAMBLE = struct.Struct("<4sII")
+
+
+class TranscriptStore(Sequence[Segment]):
+    """Read-only sequence of :class:`Segment` backed by columns."""
+
+    __slots__ = ("start", "end", "offsets", "text", "speaker", "speakers")
+
+    def __init__(self, start: np.ndarray, end: np.ndarray, offsets: np.ndarray, text: np.ndarray,
+                 speaker: Optional[np.ndarray] = None, speakers: Sequence[str] = ()):
+        self.start = start
+        self.end = end
+        self.offsets = offsets
+        self.text = text
+        self.speaker = speaker
+        self.speakers = list(speakers)
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> "TranscriptStore":
+        segments = list(segments)
+        encoded = [seg.text.encode() for seg in segments]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(t) for t in encoded], out=offsets[1:])
+        speaker = None
+        names = sorted({seg.speaker for seg in segments if seg.speaker})
+        if names:
+            index = {name: i for i, name in enumerate(names)}
+            speaker = np.array([index.get(seg.speaker, -1) for seg in segments], dtype=np.int16)
+        return cls(
+            np.array([seg.start for seg in segments], dtype=np.float32),
+            np.array([seg.end for seg in segments], dtype=np.float32),
+            offsets,
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            speaker,
+            names,
+        )
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The columns as named arrays, as stored by :class:`core.cache.TranscriptCache`."""
+        columns = {"start": self.start, "end": self.end, "offsets": self.offsets, "text": self.text}
+        if self.speaker is not None:
+            columns["speaker"] = self.speaker
+            columns["speakers"] = np.frombuffer("\n".join(self.speakers).encode(), dtype=np.uint8)
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns) -> "TranscriptStore":
+        """Inverse of :meth:`columns`; accepts any mapping such as an open ``.npz``."""
+        speaker, speakers = None, ()
+        if "speaker" in columns:
+            speaker = columns["speaker"]
+            speakers = bytes(columns["speakers"]).decode().split("\n")
+        return cls(columns["start"], columns["end"], columns["offsets"], columns["text"], speaker, speakers)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @overload
+    def __getitem__(self, index: int) -> Segment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TranscriptStore": ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            first, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TranscriptStore slices must be contiguous")
+            stop = max(first, stop)
+            # Offsets stay absolute, so the slice shares the text buffer.
+            return TranscriptStore(
+                self.start[first:stop], self.end[first:stop], self.offsets[first:stop + 1], self.text,
+                self.speaker[first:stop] if self.speaker is not None else None, self.speakers,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self._segment(index)
+
+    def _segment(self, i: int) -> Segment:
+        text = bytes(self.text[self.offsets[i]:self.offsets[i + 1]]).decode()
+        speaker = None
+        if self.speaker is not None and self.speaker[i] >= 0:
+            speaker = self.speakers[self.speaker[i]]
+        return Segment(text, float(self.start[i]), float(self.end[i]), speaker)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(len(self)):
+            yield self._segment(i)
+
+    def index_at(self, seconds: float) -> int:
+        """Index of the segment playing at ``seconds``, else the last one before it (-1 if none)."""
+        return int(np.searchsorted(self.start, seconds, side="right")) - 1
+
+    def between(self, start: float, end: float) -> "TranscriptStore":
+        """The segments that overlap ``[start, end)``."""
+        first = int(np.searchsorted(self.end, start, side="right"))
+        stop = int(np.searchsorted(self.start, end, side="left"))
+        return self[first:max(first, stop)]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns().values())
+
+    def save(self, path: str) -> None:
+        """Write the memory-mappable form of the store to ``path``, atomically."""
+        columns = self.columns()
+        layout, position = {}, 0
+        for name, column in columns.items():
+            layout[name] = [column.dtype.str, position, len(column)]
+            position += -(-column.nbytes // _ALIGN) * _ALIGN
+        header = json.dumps(layout).encode()
+        # Pad the header so the first column starts aligned.
+        header += b" " * (-(_PREAMBLE.size + len(header)) % _ALIGN)
+
+        directory = os.path.dirname(path) or "."
+        handle, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(header)))
+            f.write(header)
+            for column in columns.values():
+                data = np.ascontiguousarray(column).tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % _ALIGN))
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: str) -> "TranscriptStore":
+        """Memory-map a store written by :meth:`save`; pages are read on demand."""
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, header_size = _PREAMBLE.unpack(bytes(raw[:_PREAMBLE.size]))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a transcript store")
+        base = _PREAMBLE.size + header_size
+        columns = {}
+        for name, (dtype, position, count) in json.loads(bytes(raw[_PREAMBLE.size:base])).items():
+            dtype = np.dtype(dtype)
+            start = base + position
+            columns[name] = raw[start:start + count * dtype.itemsize].view(dtype)
+        return cls.from_columns(columns)
@@ -0,0 +1,118 @@
+"""Map-reduce summarization for transcripts larger than one prompt.
+
+The transcript is split into token-bounded chunks that are summarized in
+parallel (map); the partial summaries are then packed into token-bounded
+groups and summarized again, level by level, until a single summary fits
+(reduce). Fan-out width and chunk size are both configurable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from core.generation import DEFAULT_CHAT_MODEL, complete, make_client
+from core.llm_cache import ResponseCache
+from core.tokens import estimate_tokens
+from core.transcription import Segment, segment_line
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+CHUNK_TOKENS = 6000
+FAN_OUT = 8
+
+MAP_PROMPT = (
+    "Summarize this part of a podcast transcript as dense notes. Keep the "
+    "[MM:SS] timestamps of topic changes, every named person or product, and "
+    "quote the most memorable lines verbatim."
+)
+REDUCE_PROMPT = (
+    "Merge these consecutive notes from one podcast episode into a single set "
+    "of dense notes. Keep timestamps, names and verbatim quotes; drop repetition."
+)
+
+
+@dataclass
+class SummaryResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    calls: int = 0
+    levels: int = 0
+
+
+def pack(texts: Sequence[str], max_tokens: int, separator: str = "\n") -> List[str]:
+    """Greedily join consecutive ``texts`` into chunks of at most ``max_tokens``.
+
+    A single text larger than the budget becomes a chunk of its own.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        tokens = estimate_tokens(text) + 1
+        if current and size + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, size = [], 0
+        current.append(text)
+        size += tokens
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def chunk_transcript(segments: Sequence[Segment], max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """Split a transcript into timestamped, token-bounded text chunks."""
+    return pack([segment_line(seg) for seg in segments], max_tokens)
+
+
+async def _summarize_all(client, semaphore, prompt: str, chunks: Sequence[str],
+                         model: str, result: SummaryResult, cache) -> List[str]:
+    async def one(chunk: str) -> str:
+        async with semaphore:
+            text, prompt_tokens, completion_tokens = await complete(
+                client,
+                [{"role": "system", "content": prompt}, {"role": "user", "content": chunk}],
+                model,
+                cache=cache,
+            )
+        result.prompt_tokens += prompt_tokens
+        result.completion_tokens += completion_tokens
+        result.calls += 1
+        return text
+
+    return list(await asyncio.gather(*(one(chunk) for chunk in chunks)))
+
+
+async def map_reduce_summarize(
+    segments: Sequence[Segment],
+    client: Optional[AsyncOpenAI] = None,
+    model: str = DEFAULT_CHAT_MODEL,
+    chunk_tokens: int = CHUNK_TOKENS,
+    fan_out: int = FAN_OUT,
+    cache: Optional[ResponseCache] = None,
+) -> SummaryResult:
+    """Summarize ``segments`` with at most ``fan_out`` requests in flight."""
+    owns_client = client is None
+    client = client or make_client()
+    semaphore = asyncio.Semaphore(fan_out)
+    result = SummaryResult("")
+    try:
+        chunks = chunk_transcript(segments, chunk_tokens)
+        summaries = await _summarize_all(client, semaphore, MAP_PROMPT, chunks, model, result, cache)
+        result.levels = 1
+        while len(summaries) > 1:
+            groups = pack(summaries, chunk_tokens, separator="\n\n")
+            if len(groups) == len(summaries):
+                # Each summary alone fills the budget; pair them so the
+                # reduction still converges.
+                groups = ["\n\n".join(summaries[i:i + 2]) for i in range(0, len(summaries), 2)]
+            summaries = await _summarize_all(client, semaphore, REDUCE_PROMPT, groups, model, result, cache)
+            result.levels += 1
+    finally:
+        if owns_client:
+            await client.close()
+    result.text = summaries[0] if summaries else ""
+    return result
@@ -0,0 +1,66 @@
+"""Tokenization shared by the lexical analysers (chapters, topics, quotes).
+
+Transcripts are lower-cased and split into word tokens; common English
+function words and spoken fillers are dropped so similarity and keyword
+scores reflect what an episode is about.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z][a-z0-9']*[a-z0-9]|[a-z]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't did didn't do does doesn't doing
+don't down during each else even ever every few for from further get gets getting go goes going
+gone got gotta had hadn't has hasn't have haven't having he he'd he'll he's her here here's hers
+herself him himself his how how's i i'd i'll i'm i've if in into is isn't it it's its itself
+just let let's like lot lots made make makes many may maybe me might more most much must mustn't
+my myself need no nor not now of off often oh ok okay on once one only or other ought our ours
+ourselves out over own really right said same say says see shan't she she'd she'll she's should
+shouldn't so some something still such sure take than that that's the their theirs them
+themselves then there there's these they they'd they'll they're they've thing things think this
+those though through to too two um uh under until up upon us use used very want wanted was wasn't
+way we we'd we'll we're we've well were weren't what what's when when's where where's whether
+which while who who's whom why why's will with won't would wouldn't yeah yes yet you you'd
+you'll you're you've your yours yourself yourselves actually basically kind know mean gonna
+wanna kinda sort stuff guess anyway yep hmm mm
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased content words of ``text``: no stopwords, at least three letters."""
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+
+class Vocabulary:
+    """Maps terms to dense integer ids as they are first seen."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def encode(self, tokens: Iterable[str]) -> np.ndarray:
+        ids = self.ids
+        out = []
+        for token in tokens:
+            term_id = ids.get(token)
+            if term_id is None:
+                term_id = ids[token] = len(self.terms)
+                self.terms.append(token)
+            out.append(term_id)
+        return np.array(out, dtype=np.int64)
+
+
+def sparse_counts(rows: np.ndarray, terms: np.ndarray, n_terms: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Collapse ``(row, term)`` occurrences into sparse ``(rows, terms, counts)`` triples."""
+    keys, counts = np.unique(rows * n_terms + terms, return_counts=True)
+    return keys // n_terms, keys % n_terms, counts.astype(np.float64)
@@ -0,0 +1,23 @@
+"""Formatting and parsing of ``MM:SS`` transcript timestamps.
+
+Kept free of heavy imports so pages that only show times, and the search
+index, can use them without loading the transcription stack.
+"""
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as ``MM:SS`` (or ``H:MM:SS`` past the hour)."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse ``SS``, ``MM:SS`` or ``H:MM:SS`` into seconds (0 if malformed)."""
+    seconds = 0.0
+    try:
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return 0.0
+    return seconds
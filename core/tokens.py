@@ -0,0 +1,18 @@
+"""Cheap token estimates for prompt budgeting and reporting."""
+
+from typing import Iterable
+
+# OpenAI's rule of thumb for English text: about four characters per token.
+CHARS_PER_TOKEN = 4
+# Fixed framing cost the chat format adds to every message.
+TOKENS_PER_MESSAGE = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text`` without loading a tokenizer."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: Iterable[dict]) -> int:
+    """Estimate the prompt tokens of a list of chat messages."""
+    return sum(TOKENS_PER_MESSAGE + estimate_tokens(m["content"]) for m in messages)
@@ -0,0 +1,83 @@
+"""Model-free topic and keyword extraction for the analytics section.
+
+The transcript is split into one-minute windows that act as documents for
+TF-IDF: a term mentioned often, but concentrated in some stretches of the
+episode, is a topic, while words spread evenly through the whole episode
+score low. Word pairs that recur together are reported as one phrase, such
+as "content strategy", in place of their single words.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+from core.text import Vocabulary, sparse_counts, tokenize
+from core.transcription import Segment
+
+WINDOW_SECONDS = 60.0
+TOP_K = 8
+# A word pair is a phrase when it recurs at least this often and makes up
+# this share of the mentions of its rarer word.
+MIN_PHRASE_MENTIONS = 3
+MIN_PHRASE_SHARE = 0.3
+
+
+class Topic(NamedTuple):
+    name: str
+    mentions: int
+    relevance: float  # 0-100, relative to the strongest topic
+
+
+def extract_topics(segments: Sequence[Segment], top_k: int = TOP_K,
+                   window_seconds: float = WINDOW_SECONDS) -> List[Topic]:
+    """Return the ``top_k`` topics of a transcript, strongest first."""
+    vocabulary = Vocabulary()
+    ids, windows = [], []
+    for seg in segments:
+        encoded = vocabulary.encode(tokenize(seg.text))
+        ids.append(encoded)
+        windows.append(np.full(len(encoded), int(seg.start // window_seconds)))
+    if not len(vocabulary):
+        return []
+    terms = np.concatenate(ids)
+    docs = np.concatenate(windows)
+    n_docs = int(docs.max()) + 1
+    n_terms = len(vocabulary)
+
+    mentions = np.bincount(terms, minlength=n_terms)
+    _, term_ids, _ = sparse_counts(docs, terms, n_terms)
+    document_frequency = np.bincount(term_ids, minlength=n_terms)
+    scores = np.log1p(mentions) * (np.log((1 + n_docs) / (1 + document_frequency)) + 1)
+    candidates = [(float(scores[t]), vocabulary.terms[t], int(mentions[t])) for t in np.argsort(-scores)[:top_k * 3]]
+
+    # Pairs of adjacent content words within the same window. A pair that
+    # accounts for a good share of its rarer word's mentions is a phrase
+    # ("content strategy") and stands in for its words at their score.
+    same = docs[1:] == docs[:-1]
+    pairs = terms[:-1][same] * n_terms + terms[1:][same]
+    if len(pairs):
+        pair_keys, pair_mentions = np.unique(pairs, return_counts=True)
+        first, second = np.divmod(pair_keys, n_terms)
+        share = pair_mentions / np.minimum(mentions[first], mentions[second])
+        phrases = np.flatnonzero((pair_mentions >= MIN_PHRASE_MENTIONS) & (share >= MIN_PHRASE_SHARE))
+        for p in phrases:
+            name = f"{vocabulary.terms[first[p]]} {vocabulary.terms[second[p]]}"
+            score = max(scores[first[p]], scores[second[p]])
+            candidates.append((float(score), name, int(pair_mentions[p])))
+
+    topics: List[Topic] = []
+    taken = set()
+    # Phrases sort ahead of their own words on equal scores.
+    for score, name, count in sorted(candidates, key=lambda c: (-c[0], -len(c[1].split()))):
+        words = set(name.split())
+        # Skip a word already covered by a chosen phrase, and vice versa.
+        if words & taken:
+            continue
+        taken |= words
+        topics.append(Topic(name.title(), count, score))
+        if len(topics) == top_k:
+            break
+    best = topics[0].relevance if topics else 1.0
+    return [topic._replace(relevance=round(100 * topic.relevance / best, 1)) for topic in topics]
@@ -0,0 +1,176 @@
+"""Chunked, streaming transcription built on OpenAI Whisper.
+
+Audio is streamed as 16 kHz mono PCM by ``core.audio``, cut into fixed-size
+overlapping windows and transcribed one window at a time, so segments are
+yielded as soon as each window finishes instead of after the whole episode.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from core.audio import SAMPLE_RATE, decode_audio
+from core.ingest import spool_upload
+from core.models import DEFAULT_MODEL, registry
+from core.timestamps import format_timestamp, parse_timestamp  # noqa: F401 - re-exported
+from core.vad import VoiceActivityDetector
+
+WINDOW_SECONDS = 30.0
+OVERLAP_SECONDS = 2.0
+
+AudioSource = Union[str, "os.PathLike[str]", BinaryIO]
+
+
+class Segment(NamedTuple):
+    text: str
+    start: float
+    end: float
+    speaker: Optional[str] = None
+
+
+def segment_line(seg: Segment) -> str:
+    """Render a segment as ``[MM:SS] Speaker: text`` for prompts and exports."""
+    speaker = f"{seg.speaker}: " if seg.speaker else ""
+    return f"[{format_timestamp(seg.start)}] {speaker}{seg.text}"
+
+
+@contextmanager
+def spooled_audio(source: AudioSource) -> Iterator[str]:
+    """Yield a filesystem path for ``source``, spooling file objects to disk."""
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+
+    path = spool_upload(source)
+    try:
+        yield path
+    finally:
+        os.remove(path)
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Return the duration of ``path`` in seconds, or None if unknown."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        path,
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, text=True).stdout
+        return float(out.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def iter_windows(
+    blocks: Iterable[np.ndarray],
+    window_seconds: float = WINDOW_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """Regroup PCM blocks into ``(offset_seconds, window)`` pairs.
+
+    Consecutive windows share ``overlap_seconds`` of audio so words cut at a
+    window edge are heard whole by one of the two windows.
+    """
+    window = int(window_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    if not 0 <= overlap < window:
+        raise ValueError("overlap must be non-negative and shorter than the window")
+    hop = window - overlap
+
+    buf = np.empty(window, dtype=np.float32)
+    filled = 0
+    offset = 0
+    for block in blocks:
+        pos = 0
+        while pos < len(block):
+            take = min(window - filled, len(block) - pos)
+            buf[filled:filled + take] = block[pos:pos + take]
+            filled += take
+            pos += take
+            if filled == window:
+                yield offset / SAMPLE_RATE, buf
+                carry = np.empty(window, dtype=np.float32)
+                carry[:overlap] = buf[hop:]
+                buf, filled = carry, overlap
+                offset += hop
+
+    # Flush the tail unless it is only audio the previous window already saw.
+    if filled > overlap or (offset == 0 and filled > 0):
+        yield offset / SAMPLE_RATE, buf[:filled]
+
+
+def dedupe_overlap(segments: Iterable[Segment]) -> Iterator[Segment]:
+    """Drop segments re-transcribed from the overlap between two windows.
+
+    A segment whose midpoint falls before the end of the last emitted segment
+    is a repeat; one that merely starts early is clamped to the previous end.
+    """
+    last_end = 0.0
+    for seg in segments:
+        if not seg.text or (seg.start + seg.end) / 2 < last_end:
+            continue
+        if seg.start < last_end:
+            seg = seg._replace(start=last_end)
+        last_end = seg.end
+        yield seg
+
+
+def load_model(name: str = DEFAULT_MODEL, device: Optional[str] = None):
+    """The process-wide shared Whisper model ``name``, loaded on first use."""
+    return registry.get(name, device)
+
+
+def transcribe_window(model, window: np.ndarray, offset: float, **options) -> Iterator[Segment]:
+    """Transcribe a single PCM window, shifting timestamps by ``offset``."""
+    options.setdefault("fp16", model.device.type != "cpu")
+    # Each window stands alone; conditioning on earlier text can loop.
+    options.setdefault("condition_on_previous_text", False)
+    result = model.transcribe(window, **options)
+    for seg in result["segments"]:
+        yield Segment(seg["text"].strip(), offset + seg["start"], offset + seg["end"])
+
+
+def restore_times(segments: Iterable[Segment], vad: Optional[VoiceActivityDetector]) -> Iterator[Segment]:
+    """Map segment times from silence-trimmed audio back to the original."""
+    for seg in segments:
+        if vad is not None:
+            seg = seg._replace(
+                start=vad.timeline.to_original(seg.start),
+                end=vad.timeline.to_original(seg.end, end=True),
+            )
+        yield seg
+
+
+def transcribe_stream(
+    source: AudioSource,
+    model_name: str = DEFAULT_MODEL,
+    language: Optional[str] = None,
+    window_seconds: float = WINDOW_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+    vad: Optional[VoiceActivityDetector] = None,
+    **options,
+) -> Iterator[Segment]:
+    """Yield transcript segments for ``source`` as each window completes.
+
+    With a ``vad``, non-speech audio is cut out before Whisper sees it. The
+    model is leased from :data:`core.models.registry` for the whole stream
+    and shared with any other stream using it.
+    """
+    with registry.lease(model_name) as model, spooled_audio(source) as path:
+        blocks = decode_audio(path)
+        if vad is not None:
+            blocks = vad.drop_silence(blocks)
+        windows = iter_windows(blocks, window_seconds, overlap_seconds)
+        raw = (
+            seg
+            for offset, window in windows
+            for seg in transcribe_window(model, window, offset, language=language, **options)
+        )
+        yield from restore_times(dedupe_overlap(raw), vad)
@@ -0,0 +1,166 @@
+"""Voice-activity detection that cuts long silences out of the audio stream.
+
+Audio is split into 30 ms frames and each frame is classified from two
+vectorized features: its energy relative to a running noise floor, and the
+share of its spectrum in the speech band. Frames further than
+``pad_seconds`` from any speech are dropped, so long pauses, dead air and
+hum never reach Whisper while short pauses between words are kept. A
+:class:`Timeline` maps timestamps in the shortened audio back to the
+original.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from core.audio import SAMPLE_RATE
+
+FRAME_SECONDS = 0.03
+PAD_SECONDS = 0.5
+# A frame is speech when it is this far above the noise floor...
+MARGIN_DB = 10.0
+# ...at least this loud in absolute terms...
+MIN_DB = -50.0
+# ...and this share of its energy falls in the voice band, 80 Hz - 4 kHz
+# (white noise puts about half its energy there, hum almost none).
+MIN_BAND_RATIO = 0.6
+# How fast the noise floor may rise per block, so it can track a louder room.
+_FLOOR_RISE_DB = 1.0
+
+_FRAME = int(FRAME_SECONDS * SAMPLE_RATE)
+_FREQS = np.fft.rfftfreq(_FRAME, 1 / SAMPLE_RATE)
+_BAND = (_FREQS >= 80) & (_FREQS <= 4000)
+_WINDOW = np.hanning(_FRAME).astype(np.float32)
+
+
+class Timeline:
+    """Piecewise mapping from shortened-audio seconds to original seconds."""
+
+    def __init__(self):
+        self._kept = [0.0]
+        self._original = [0.0]
+
+    def add(self, kept: float, original: float) -> None:
+        """Record that the audio at ``kept`` seconds resumes at ``original``."""
+        if kept == self._kept[-1]:
+            self._original[-1] = original
+        else:
+            self._kept.append(kept)
+            self._original.append(original)
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """Map ``seconds`` back; an ``end`` on a cut stays before the cut."""
+        i = max(0, (bisect_left if end else bisect_right)(self._kept, seconds) - 1)
+        return self._original[i] + seconds - self._kept[i]
+
+
+def frame_features(frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return per-frame energy (dB) and speech-band energy ratio for an ``(n, frame)`` array."""
+    energy_db = 10 * np.log10(np.mean(np.square(frames), axis=1) + 1e-10)
+    power = np.square(np.abs(np.fft.rfft(frames * _WINDOW, axis=1)))
+    band_ratio = power[:, _BAND].sum(axis=1) / (power.sum(axis=1) + 1e-10)
+    return energy_db, band_ratio
+
+
+def _dilate(flags: np.ndarray, radius: int) -> np.ndarray:
+    """True wherever a True flag lies within ``radius`` positions."""
+    counts = np.concatenate(([0], np.cumsum(flags)))
+    idx = np.arange(len(flags))
+    lo = np.clip(idx - radius, 0, len(flags))
+    hi = np.clip(idx + radius + 1, 0, len(flags))
+    return counts[hi] - counts[lo] > 0
+
+
+class VoiceActivityDetector:
+    """Streaming speech detector; see :meth:`drop_silence`.
+
+    After the stream is consumed, ``timeline`` maps transcript timestamps
+    back to the original audio and ``skipped_fraction`` is the share of
+    audio that was cut.
+    """
+
+    def __init__(self, pad_seconds: float = PAD_SECONDS, margin_db: float = MARGIN_DB,
+                 min_db: float = MIN_DB, min_band_ratio: float = MIN_BAND_RATIO):
+        self.radius = max(1, round(pad_seconds / FRAME_SECONDS))
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.min_band_ratio = min_band_ratio
+        self.timeline = Timeline()
+        self.total_seconds = 0.0
+        self.kept_seconds = 0.0
+        self._floor = None
+
+    @property
+    def skipped_fraction(self) -> float:
+        return 1 - self.kept_seconds / self.total_seconds if self.total_seconds else 0.0
+
+    def is_speech(self, frames: np.ndarray) -> np.ndarray:
+        """Classify an ``(n, frame)`` array, updating the running noise floor."""
+        energy_db, band_ratio = frame_features(frames)
+        if len(frames):
+            quiet = float(np.percentile(energy_db, 10))
+            self._floor = quiet if self._floor is None else min(quiet, self._floor + _FLOOR_RISE_DB)
+        threshold = max(self.min_db, (self._floor or self.min_db) + self.margin_db)
+        return (energy_db > threshold) & (band_ratio > self.min_band_ratio)
+
+    def speech_regions(self, audio: np.ndarray) -> List[Tuple[float, float]]:
+        """Return padded ``(start, end)`` speech regions of a whole array in seconds."""
+        n = len(audio) // _FRAME
+        keep = _dilate(self.is_speech(audio[:n * _FRAME].reshape(n, _FRAME)), self.radius)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], keep.astype(np.int8), [0]))))
+        return [(float(s * FRAME_SECONDS), float(e * FRAME_SECONDS)) for s, e in zip(edges[::2], edges[1::2])]
+
+    def drop_silence(self, blocks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """Yield ``blocks`` with non-speech stretches removed.
+
+        Whether a frame is kept depends on the ``radius`` frames after it, so
+        that many frames are held back until the next block arrives.
+        """
+        radius = self.radius
+        leftover = np.empty(0, dtype=np.float32)
+        held = np.empty((0, _FRAME), dtype=np.float32)
+        held_flags = np.empty(0, dtype=bool)
+        behind = np.zeros(radius, dtype=bool)  # flags of the last frames already decided
+        was_kept = False
+        frame_index = 0  # original position of held[0], in frames
+        kept_frames = 0
+
+        def decide(frames, flags, lookahead):
+            nonlocal behind, was_kept, frame_index, kept_frames
+            context = np.concatenate((behind, flags, lookahead))
+            keep = _dilate(context, radius)[radius:radius + len(flags)]
+            starts = np.flatnonzero(keep & ~np.concatenate(([was_kept], keep[:-1])))
+            before = np.concatenate(([0], np.cumsum(keep)))
+            for start in starts:
+                self.timeline.add(float(kept_frames + before[start]) * FRAME_SECONDS,
+                                  float(frame_index + start) * FRAME_SECONDS)
+            if len(flags):
+                was_kept = bool(keep[-1])
+                behind = np.concatenate((behind, flags))[-radius:]
+            frame_index += len(flags)
+            kept_frames += int(before[-1])
+            self.kept_seconds = kept_frames * FRAME_SECONDS
+            return frames[keep].reshape(-1)
+
+        for block in blocks:
+            self.total_seconds += len(block) / SAMPLE_RATE
+            audio = np.concatenate((leftover, block))
+            n = len(audio) // _FRAME
+            leftover = audio[n * _FRAME:]
+            frames = np.concatenate((held, audio[:n * _FRAME].reshape(n, _FRAME)))
+            flags = np.concatenate((held_flags, self.is_speech(frames[len(held):])))
+            ready = max(0, len(frames) - radius)
+            out = decide(frames[:ready], flags[:ready], flags[ready:])
+            held, held_flags = frames[ready:], flags[ready:]
+            if len(out):
+                yield out
+
+        out = decide(held, held_flags, np.empty(0, dtype=bool))
+        if was_kept and len(leftover):
+            out = np.concatenate((out, leftover))
+            self.kept_seconds += len(leftover) / SAMPLE_RATE
+        if len(out):
+            yield out
@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+
+from core.assets import markup, stylesheet
 
 # Page config
 st.set_page_config(
@@ -9,91 +10,16 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-<style>
-    .hero-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 4rem 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin: 2rem 0;
-    }
-    .hero-title {
-        font-size: 3.5rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .hero-subtitle {
-        font-size: 1.3rem;
-        margin-bottom: 2rem;
-        opacity: 0.9;
-    }
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-        gap: 2rem;
-        margin: 3rem 0;
-    }
-    .feature-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        border-left: 4px solid #667eea;
-        transition: transform 0.3s ease;
-    }
-    .feature-card:hover {
-        transform: translateY(-5px);
-    }
-    .feature-icon {
-        font-size: 3rem;
-        margin-bottom: 1rem;
-    }
-    .pricing-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        text-align: center;
-        margin: 1rem;
-    }
-    .pricing-card.featured {
-        border: 3px solid #667eea;
-        transform: scale(1.05);
-    }
-    .cta-section {
-        background: #f8f9fa;
-        padding: 3rem 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin: 3rem 0;
-    }
-    .stat-container {
-        background: linear-gradient(45deg, #667eea, #764ba2);
-        color: white;
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 2rem 0;
-    }
-    .workflow-step {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border-left: 4px solid #667eea;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(stylesheet("landing.css"), unsafe_allow_html=True)
 
 # Hero Section
-st.markdown("""
+st.markdown(markup("""
 <div class="hero-section">
     <div class="hero-title">🎙️ Podcast to Content Agent</div>
     <div class="hero-subtitle">Transform your podcasts into viral content across all platforms in minutes, not hours</div>
     <p>Stop spending endless hours manually editing and repurposing your podcast content. Let AI do the heavy lifting while you focus on creating amazing content.</p>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # CTA Buttons
 col1, col2, col3 = st.columns([1, 1, 1])
@@ -128,7 +54,7 @@ with col2:
 st.markdown("---")
 st.markdown("## ✨ Our Solution: AI-Powered Content Transformation")
 
-st.markdown("""
+st.markdown(markup("""
 <div class="stat-container">
     <h3 style="text-align: center; margin-bottom: 2rem;">⚡ From 1 Podcast to 15+ Content Pieces in Under 10 Minutes</h3>
     <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 2rem; text-align: center;">
@@ -150,7 +76,7 @@ st.markdown("""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # How It Works
 st.markdown("## 🔄 How It Works")
@@ -183,12 +109,12 @@ workflow_steps = [
 ]
 
 for step in workflow_steps:
-    st.markdown(f"""
+    st.markdown(markup(f"""
     <div class="workflow-step">
         <h3>{step['icon']} Step {step['step']}: {step['title']}</h3>
         <p>{step['description']}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 # Features Section
 st.markdown("---")
@@ -231,13 +157,13 @@ features = [
 cols = st.columns(3)
 for i, feature in enumerate(features):
     with cols[i % 3]:
-        st.markdown(f"""
+        st.markdown(markup(f"""
         <div class="feature-card">
             <div class="feature-icon">{feature['icon']}</div>
             <h3>{feature['title']}</h3>
             <p>{feature['description']}</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
 
 # Use Cases
 st.markdown("---")
@@ -264,7 +190,7 @@ st.markdown("## 💰 Simple, Transparent Pricing")
 pricing_col1, pricing_col2, pricing_col3 = st.columns(3)
 
 with pricing_col1:
-    st.markdown("""
+    st.markdown(markup("""
     <div class="pricing-card">
         <h3>🆓 Free</h3>
         <h2>$0<span style="font-size: 1rem;">/month</span></h2>
@@ -276,10 +202,10 @@ with pricing_col1:
         </ul>
         <button style="width: 100%; padding: 1rem; background: #667eea; color: white; border: none; border-radius: 5px; cursor: pointer;">Get Started</button>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 with pricing_col2:
-    st.markdown("""
+    st.markdown(markup("""
     <div class="pricing-card featured">
         <h3>⭐ Pro</h3>
         <h2>$29<span style="font-size: 1rem;">/month</span></h2>
@@ -292,10 +218,10 @@ with pricing_col2:
         </ul>
         <button style="width: 100%; padding: 1rem; background: #667eea; color: white; border: none; border-radius: 5px; cursor: pointer;">Start Free Trial</button>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 with pricing_col3:
-    st.markdown("""
+    st.markdown(markup("""
     <div class="pricing-card">
         <h3>🚀 Agency</h3>
         <h2>$99<span style="font-size: 1rem;">/month</span></h2>
@@ -308,7 +234,7 @@ with pricing_col3:
         </ul>
         <button style="width: 100%; padding: 1rem; background: #667eea; color: white; border: none; border-radius: 5px; cursor: pointer;">Contact Sales</button>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 # Social Proof
 st.markdown("---")
@@ -336,7 +262,7 @@ testimonials = [
 ]
 
 for testimonial in testimonials:
-    st.markdown(f"""
+    st.markdown(markup(f"""
     <div class="feature-card">
         <div style="display: flex; align-items: center; margin-bottom: 1rem;">
             <span style="font-size: 3rem; margin-right: 1rem;">{testimonial['avatar']}</span>
@@ -347,16 +273,16 @@ for testimonial in testimonials:
         </div>
         <p style="font-style: italic;">"{testimonial['quote']}"</p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 # Final CTA
-st.markdown("""
+st.markdown(markup("""
 <div class="cta-section">
     <h2>🚀 Ready to Transform Your Content Strategy?</h2>
     <p>Join thousands of creators who are already scaling their content with AI</p>
     <p><strong>Start your free trial today - no credit card required!</strong></p>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 col1, col2, col3 = st.columns([1, 1, 1])
 with col2:
@@ -365,7 +291,7 @@ with col2:
 
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(markup("""
 <div style="text-align: center; padding: 2rem; color: #666; background: #f8f9fa; border-radius: 10px;">
     <h3>🎙️ Podcast to Content Agent</h3>
     <p>Built with ❤️ for content creators everywhere</p>
@@ -376,4 +302,4 @@ st.markdown("""
         <a href="#" style="margin: 0 1rem; color: #667eea; text-decoration: none;">❓ Help</a>
     </p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+"""), unsafe_allow_html=True)
\ No newline at end of file
@@ -1,9 +1,28 @@
 import streamlit as st
 import os
-import pandas as pd
-import numpy as np
 import time
 from datetime import datetime
+from functools import partial
+
+from core.assets import fragment, markup, stylesheet
+from core.cache import DEFAULT_CACHE_DIR, TranscriptCache
+from core.generation import ContentSettings, build_messages, generate_content, stream_content
+from core.jobs import DONE, FAILED, JobQueue
+from core.lazy import lazy_import, warm_up
+from core.llm_cache import ResponseCache
+from core.ingest import spool_upload
+from core.search import SearchIndex
+from core.timestamps import format_timestamp
+from core.tokens import estimate_message_tokens, estimate_tokens
+
+# Imported on first use, so drawing the page does not wait for them
+pd = lazy_import("pandas")
+openai = lazy_import("openai")
+analysis = lazy_import("core.analysis")
+pipeline = lazy_import("core.pipeline")
+retrieval = lazy_import("core.retrieval")
+store = lazy_import("core.store")
+topic_extraction = lazy_import("core.topics")
 
 # Page config
 st.set_page_config(
@@ -14,149 +33,23 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .feature-card {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .content-output {
-        background: #ffffff;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 1px solid #e0e0e0;
-        margin: 1rem 0;
-    }
-    .upload-section {
-        background: #f0f2f6;
-        padding: 2rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 2rem 0;
-    }
-    .progress-container {
-        margin: 2rem 0;
-    }
-    .sidebar-section {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    
-    @keyframes fadeInUp {
-        from {
-            opacity: 0;
-            transform: translateY(30px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    @keyframes pulse {
-        0% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-        100% { transform: scale(1); }
-    }
-    
-    .animated-card {
-        animation: fadeInUp 0.6s ease-out;
-    }
-    
-    .pulse-button {
-        animation: pulse 2s infinite;
-    }
-    
-    .processing-step {
-        background: linear-gradient(45deg, #f8f9fa, #ffffff);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border-left: 4px solid #667eea;
-        transition: all 0.3s ease;
-    }
-    
-    .processing-step.active {
-        background: linear-gradient(45deg, #e3f2fd, #f8f9fa);
-        border-left-color: #2196f3;
-        box-shadow: 0 4px 15px rgba(33, 150, 243, 0.2);
-    }
-    
-    .processing-step.completed {
-        background: linear-gradient(45deg, #e8f5e8, #f8f9fa);
-        border-left-color: #4caf50;
-    }
-    
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 1rem;
-        margin: 2rem 0;
-    }
-    
-    .mini-feature-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        text-align: center;
-        transition: transform 0.3s ease;
-        border-top: 3px solid #667eea;
-    }
-    
-    .mini-feature-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-    }
-    
-    .upload-area {
-        border: 2px dashed #667eea;
-        border-radius: 15px;
-        padding: 3rem 2rem;
-        text-align: center;
-        background: linear-gradient(45deg, #f8f9fa, #ffffff);
-        transition: all 0.3s ease;
-    }
-    
-    .upload-area:hover {
-        border-color: #764ba2;
-        background: linear-gradient(45deg, #e3f2fd, #f8f9fa);
-    }
-    
-    .success-animation {
-        animation: pulse 1s ease-in-out;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(stylesheet("app.css"), unsafe_allow_html=True)
 
 # Main header
-st.markdown("""
+st.markdown(markup("""
 <div class="main-header">
     <h1>🎙️ Podcast to Content Agent</h1>
     <p>Transform your podcasts into engaging content across all platforms</p>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # Sidebar for settings and options
-st.sidebar.markdown("""
+st.sidebar.markdown(markup("""
 <div style="background: linear-gradient(45deg, #667eea, #764ba2); color: white; padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem;">
     <h2 style="margin: 0; text-align: center;">⚙️ Content Settings</h2>
     <p style="margin: 0.5rem 0 0 0; text-align: center; opacity: 0.9;">Customize your content generation</p>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # Content type selection with enhanced UI
 st.sidebar.markdown("### 📝 Content Types to Generate")
@@ -172,6 +65,13 @@ content_options = [
     ("TikTok Script", "🎵", "Viral short-form content", False)
 ]
 
+# Sample content shown in a format's tab until it has been generated
+SAMPLE_CONTENT = {
+    "Twitter Thread": "sample_twitter_thread.html",
+    "LinkedIn Post": "sample_linkedin_post.html",
+    "Blog Post": "sample_blog_post.html",
+}
+
 for name, icon, description, default in content_options:
     content_types[name] = st.sidebar.checkbox(
         f"{icon} {name}", 
@@ -224,22 +124,145 @@ st.sidebar.markdown("### ⚡ Processing Options")
 
 auto_generate = st.sidebar.checkbox("🚀 Auto-generate all content", value=True, help="Generate all selected content types automatically")
 save_template = st.sidebar.checkbox("💾 Save as template", value=False, help="Save these settings for future use")
+transcription_workers = st.sidebar.number_input(
+    "🧵 Transcription Workers",
+    min_value=1,
+    max_value=os.cpu_count() or 1,
+    value=1,
+    help="Transcribe audio chunks in parallel processes"
+)
+skip_silence = st.sidebar.checkbox("🔇 Skip silence", value=True, help="Detect speech and leave pauses, intros and dead air out of transcription")
+
+content_settings = ContentSettings(
+    tone=content_tone,
+    length=content_length,
+    audience=target_audience,
+    emojis=include_emojis,
+    hashtags=include_hashtags,
+    cta=include_cta,
+    timestamps=include_timestamps,
+)
 
 # Quick stats in sidebar
 st.sidebar.markdown("---")
-st.sidebar.markdown("""
+st.sidebar.markdown(markup("""
 <div style="background: #f8f9fa; padding: 1rem; border-radius: 8px; text-align: center;">
     <h4 style="color: #667eea; margin: 0;">📊 Quick Stats</h4>
     <p style="margin: 0.5rem 0; color: #666;">Content pieces generated today</p>
     <h3 style="margin: 0; color: #28a745;">156</h3>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
+
+# Transcript cache shared by every session in this server process
+@st.cache_resource
+def get_transcript_cache():
+    return TranscriptCache()
+
+transcript_cache = get_transcript_cache()
+
+# LLM response cache shared the same way, so reruns reuse earlier generations
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+response_cache = get_response_cache()
+
+# Search index of every processed episode, also read by the home page
+@st.cache_resource
+def get_search_index():
+    return SearchIndex()
+
+# Background workers shared by all sessions; pages only keep the job id
+UPLOAD_DIR = os.path.join(DEFAULT_CACHE_DIR, "uploads")
+JOB_POLL_SECONDS = 1.0
+
+def run_episode_job(payload, progress, **caches):
+    """Job handler; the processing pipeline is only imported once a job runs"""
+    return pipeline.process_episode(payload, progress, **caches)
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue({
+        "process_episode": partial(
+            run_episode_job,
+            transcript_cache=get_transcript_cache(),
+            response_cache=get_response_cache(),
+            search_index=get_search_index(),
+        ),
+    })
+
+job_queue = get_job_queue()
+
+# Topics depend only on the transcript, so they are computed once per transcript
+@st.cache_data(max_entries=32)
+def get_topics(transcript_hash, _segments):
+    return topic_extraction.extract_topics(_segments)
+
+# Chunk embeddings for retrieval, likewise built once per transcript
+@st.cache_resource(max_entries=8)
+def get_transcript_index(transcript_hash, _segments):
+    return retrieval.TranscriptIndex.from_segments(_segments)
+
+def episode_excerpts(content_types):
+    """Transcript chunks each content type retrieves for its prompt"""
+    index = get_transcript_index(st.session_state.transcript_hash, st.session_state.transcript)
+    return index.excerpts(content_types, st.session_state.analysis.digest.to_prompt())
 
 # Initialize session state for variables that need to be accessible across columns
 if 'uploaded_file' not in st.session_state:
     st.session_state.uploaded_file = None
 if 'youtube_url' not in st.session_state:
     st.session_state.youtube_url = None
+if 'transcript' not in st.session_state:
+    st.session_state.transcript = None
+if 'transcript_hash' not in st.session_state:
+    st.session_state.transcript_hash = None
+if 'transcript_tokens' not in st.session_state:
+    st.session_state.transcript_tokens = 0
+if 'transcript_speakers' not in st.session_state:
+    st.session_state.transcript_speakers = 0
+if 'generated' not in st.session_state:
+    st.session_state.generated = {}
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = None
+if 'analysis_error' not in st.session_state:
+    st.session_state.analysis_error = None
+if 'generation_error' not in st.session_state:
+    st.session_state.generation_error = None
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
+if 'audio_stats' not in st.session_state:
+    st.session_state.audio_stats = None
+if 'chapters' not in st.session_state:
+    st.session_state.chapters = []
+if 'quotes' not in st.session_state:
+    st.session_state.quotes = []
+if 'metrics' not in st.session_state:
+    st.session_state.metrics = None
+
+# Pick up the results of a finished background job
+active_job = job_queue.get(st.session_state.job_id) if st.session_state.job_id else None
+if active_job is not None and active_job.state == DONE:
+    # Columnar form: a fraction of the memory of a list of segments per session
+    st.session_state.transcript = store.TranscriptStore.from_segments(pipeline.segments_from_result(active_job.result))
+    # Computed once per transcript (the hash by the job); reruns read these instead of rescanning it
+    st.session_state.transcript_hash = active_job.result["transcript_hash"]
+    st.session_state.transcript_tokens = estimate_tokens(" ".join(seg.text for seg in st.session_state.transcript))
+    st.session_state.transcript_speakers = len(st.session_state.transcript.speakers)
+    st.session_state.analysis = pipeline.analysis_from_result(active_job.result)
+    st.session_state.analysis_error = active_job.result["analysis_error"]
+    st.session_state.generation_error = None
+    st.session_state.chapters = pipeline.chapters_from_result(active_job.result)
+    st.session_state.quotes = pipeline.quotes_from_result(active_job.result)
+    st.session_state.metrics = active_job.result.get("metrics")
+    if active_job.result.get("duration") is not None:
+        st.session_state.audio_stats = (active_job.result["duration"], active_job.result["skipped_fraction"])
+    st.session_state.job_id = None
+    active_job = None
+
+# Content types to stream into the result tabs during this run
+stream_types = []
+stream_placeholders = {}
 
 # Main content area
 col1, col2 = st.columns([1, 1])
@@ -248,23 +271,23 @@ with col1:
     st.markdown("## 🎵 Upload Your Content")
     
     # Upload section
-    st.markdown("""
+    st.markdown(markup("""
     <div class="upload-area animated-card">
         <h3>📁 Choose Your Input Method</h3>
         <p>Drag and drop your files or paste a YouTube link to get started</p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
     
     # Input method tabs
     tab1, tab2, tab3 = st.tabs(["📁 File Upload", "🔗 YouTube Link", "🎙️ Direct Recording"])
     
     with tab1:
-        st.markdown("""
+        st.markdown(markup("""
         <div style="text-align: center; padding: 1rem; background: #f8f9fa; border-radius: 10px; margin-bottom: 1rem;">
             <h4 style="color: #667eea;">🎵 Upload Your Audio File</h4>
             <p style="color: #666; margin: 0;">Supported formats: MP3, MP4, WAV, M4A (Max 200MB)</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
         
         uploaded_file = st.file_uploader(
             "Upload your podcast file",
@@ -272,16 +295,32 @@ with col1:
             help="Supported formats: MP3, MP4, WAV, M4A"
         )
         
-        # Update session state
+        # Update session state, dropping results that belong to a previous file
+        if uploaded_file is not st.session_state.uploaded_file:
+            previous = st.session_state.uploaded_file
+            if not (uploaded_file and previous and uploaded_file.file_id == previous.file_id):
+                st.session_state.transcript = None
+                st.session_state.transcript_hash = None
+                st.session_state.transcript_tokens = 0
+                st.session_state.transcript_speakers = 0
+                st.session_state.analysis = None
+                st.session_state.analysis_error = None
+                st.session_state.generation_error = None
+                st.session_state.job_id = None
+                st.session_state.audio_stats = None
+                st.session_state.chapters = []
+                st.session_state.quotes = []
+                st.session_state.metrics = None
+                st.session_state.generated = {}
         st.session_state.uploaded_file = uploaded_file
         
         if uploaded_file:
-            st.markdown("""
+            st.markdown(markup("""
             <div class="success-animation" style="background: #e8f5e8; padding: 1rem; border-radius: 10px; margin: 1rem 0;">
                 <h4 style="color: #4caf50; margin: 0;">✅ File Successfully Uploaded!</h4>
                 <p style="margin: 0.5rem 0 0 0; color: #666;">Ready for processing</p>
             </div>
-            """, unsafe_allow_html=True)
+            """), unsafe_allow_html=True)
             
             # File details
             metric_col1, metric_col2, metric_col3 = st.columns(3)
@@ -295,12 +334,12 @@ with col1:
             st.audio(uploaded_file)
     
     with tab2:
-        st.markdown("""
+        st.markdown(markup("""
         <div style="text-align: center; padding: 1rem; background: #f8f9fa; border-radius: 10px; margin-bottom: 1rem;">
             <h4 style="color: #667eea;">🔗 Import from YouTube</h4>
             <p style="color: #666; margin: 0;">Paste any YouTube URL to extract audio automatically</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
         
         youtube_url = st.text_input(
             "🔗 YouTube URL",
@@ -313,27 +352,27 @@ with col1:
         
         if youtube_url:
             if "youtube.com" in youtube_url or "youtu.be" in youtube_url:
-                st.markdown("""
+                st.markdown(markup("""
                 <div class="success-animation" style="background: #e8f5e8; padding: 1rem; border-radius: 10px; margin: 1rem 0;">
                     <h4 style="color: #4caf50; margin: 0;">✅ Valid YouTube URL Detected!</h4>
                     <p style="margin: 0.5rem 0 0 0; color: #666;">Ready to extract audio</p>
                 </div>
-                """, unsafe_allow_html=True)
+                """), unsafe_allow_html=True)
                 
                 # Mock video info
-                st.markdown("""
+                st.markdown(markup("""
                 <div style="background: white; padding: 1rem; border-radius: 10px; border: 1px solid #e0e0e0;">
                     <h5>📺 Video Preview</h5>
                     <p><strong>Title:</strong> Sample Podcast Episode</p>
                     <p><strong>Duration:</strong> 45:32</p>
                     <p><strong>Channel:</strong> Tech Talks</p>
                 </div>
-                """, unsafe_allow_html=True)
+                """), unsafe_allow_html=True)
             else:
                 st.error("❌ Please enter a valid YouTube URL")
     
     with tab3:
-        st.markdown("""
+        st.markdown(markup("""
         <div style="text-align: center; padding: 2rem; background: #f8f9fa; border-radius: 10px;">
             <h4 style="color: #667eea;">🎙️ Direct Recording</h4>
             <p style="color: #666;">Record directly in your browser (Coming Soon)</p>
@@ -343,7 +382,7 @@ with col1:
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
         st.button("🎙️ Start Recording", disabled=True, help="Feature coming in next update")
 
 with col2:
@@ -368,181 +407,247 @@ with col2:
                 if i == 0:
                     st.success(f"{step} ✅")
                 elif i == 1:
-                    if st.button("🚀 Start Processing"):
-                        # Simulate processing
-                        with st.spinner("Processing..."):
-                            progress_bar = st.progress(0)
-                            for j in range(100):
-                                time.sleep(0.01)
-                                progress_bar.progress(j + 1)
+                    if st.session_state.transcript is not None:
                         st.success(f"{step} ✅")
+                        if st.session_state.transcript_speakers:
+                            st.caption(f"👥 {st.session_state.transcript_speakers} speakers identified")
+                        if st.session_state.chapters:
+                            with st.expander(f"📑 {len(st.session_state.chapters)} chapters detected"):
+                                for chapter in st.session_state.chapters:
+                                    st.markdown(f"`{format_timestamp(chapter.start)}` {chapter.title}")
+                        if st.session_state.quotes:
+                            with st.expander(f"⭐ {len(st.session_state.quotes)} quotable moments"):
+                                for quote in st.session_state.quotes:
+                                    st.markdown(f"`{format_timestamp(quote.start)}` “{quote.text}”")
+                    elif active_job is not None and active_job.active:
+                        st.info(f"{step} ⏳ {active_job.message[:80]}")
+                        st.progress(active_job.progress)
+                    else:
+                        if active_job is not None and active_job.state == FAILED:
+                            st.error(f"❌ Processing failed: {active_job.message}")
+                        if st.button("🚀 Start Processing"):
+                            if not st.session_state.uploaded_file:
+                                st.warning("YouTube import isn't available yet - please upload an audio file.")
+                            else:
+                                audio_path = spool_upload(st.session_state.uploaded_file, UPLOAD_DIR)
+                                st.session_state.job_id = job_queue.submit("process_episode", {
+                                    "audio_path": audio_path,
+                                    "title": st.session_state.uploaded_file.name,
+                                    "workers": int(transcription_workers),
+                                    "skip_silence": skip_silence,
+                                    "detect_speakers": detect_speakers,
+                                    "delete_audio": True,
+                                })
+                                st.rerun()
+                elif i == 2:
+                    if st.session_state.analysis is not None:
+                        st.success(f"{step} ✅")
+                    elif st.session_state.transcript is not None:
+                        if st.session_state.analysis_error:
+                            st.error(f"❌ Content analysis failed: {st.session_state.analysis_error}")
+                        if st.button("🧠 Retry Analysis" if st.session_state.analysis_error else "🧠 Analyze Transcript"):
+                            try:
+                                with st.spinner("Analyzing transcript..."):
+                                    st.session_state.analysis = analysis.run_analysis(
+                                        st.session_state.transcript, cache=response_cache,
+                                        local_quotes=bool(st.session_state.quotes),
+                                    )
+                                st.session_state.analysis_error = None
+                                st.rerun()
+                            except openai.OpenAIError as error:
+                                st.session_state.analysis_error = str(error)
+                    else:
+                        st.info(f"{step} ⏳")
+                elif i == 3:
+                    selected_types = [name for name, selected in content_types.items() if selected]
+                    missing_types = [name for name in selected_types if name not in st.session_state.generated]
+                    if st.session_state.analysis is not None and selected_types and not missing_types:
+                        st.success(f"{step} ✅")
+                    elif st.session_state.analysis is not None:
+                        # After a failure only an explicit retry calls the API again, not any rerun
+                        if st.session_state.generation_error:
+                            st.error(f"❌ Content generation failed: {st.session_state.generation_error}")
+                            start_generation = st.button("🔁 Retry Generation")
+                        else:
+                            start_generation = auto_generate or st.button("✍️ Generate Content")
+                        if start_generation:
+                            # Generation streams into the content section once it is drawn below
+                            stream_types = missing_types
+                            st.session_state.generation_error = None
+                            st.info(f"{step} - streaming into the content below ⏳")
+                        else:
+                            st.info(f"{step} ⏳")
+                    else:
+                        st.info(f"{step} ⏳")
                 else:
                     st.info(f"{step} ⏳")
+            st.caption(f"🗄️ Transcript cache: {transcript_cache.hits} hits / {transcript_cache.misses} misses")
+            if st.session_state.analysis is not None and st.session_state.generated:
+                # Prompt tokens had every generator read the raw transcript vs. the shared digest;
+                # the transcript's own tokens were counted once when it was loaded
+                naive_tokens = sum(
+                    estimate_message_tokens(build_messages(name, "", content_settings))
+                    + st.session_state.transcript_tokens
+                    for name in st.session_state.generated
+                )
+                digest_tokens = st.session_state.analysis.prompt_tokens + sum(
+                    content.prompt_tokens for content in st.session_state.generated.values()
+                )
+                st.caption(f"🔢 Prompt tokens: {naive_tokens:,} from raw transcript → {digest_tokens:,} with shared analysis")
     else:
         # Show empty state when no file is uploaded
-        st.markdown("""
+        st.markdown(markup("""
         <div style="text-align: center; padding: 3rem 1rem; background: #f8f9fa; border-radius: 15px; border: 2px dashed #ccc;">
             <div style="font-size: 3rem; margin-bottom: 1rem; opacity: 0.5;">⏳</div>
             <h4 style="color: #666; margin: 0;">Waiting for Upload</h4>
             <p style="color: #888; margin: 0.5rem 0 0 0;">Upload a file to start processing</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
 
 # Results section with enhanced visuals
 st.markdown("---")
-st.markdown("""
+st.markdown(markup("""
 <div style="text-align: center; margin: 2rem 0;">
     <h2 style="color: #667eea;">📊 Generated Content</h2>
     <p style="color: #666; font-size: 1.1rem;">Your podcast transformed into engaging content</p>
 </div>
-""", unsafe_allow_html=True)
+"""), unsafe_allow_html=True)
 
 # Show content generation progress
 if st.session_state.uploaded_file or st.session_state.youtube_url:
     # Enhanced content generation results
-    st.markdown("""
+    st.markdown(markup("""
     <div style="background: linear-gradient(45deg, #e3f2fd, #f8f9fa); padding: 2rem; border-radius: 15px; margin: 2rem 0;">
         <h3 style="text-align: center; color: #667eea;">🎉 Content Generation Complete!</h3>
         <p style="text-align: center; color: #666;">Your content has been successfully generated across all selected platforms</p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
     
     # Content overview cards
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.markdown("""
+        st.markdown(markup("""
         <div class="mini-feature-card">
             <div style="font-size: 2rem; margin-bottom: 0.5rem;">🐦</div>
             <h4>Twitter Thread</h4>
             <p style="color: #28a745; margin: 0;">6 tweets generated</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
+        st.markdown(markup("""
         <div class="mini-feature-card">
             <div style="font-size: 2rem; margin-bottom: 0.5rem;">💼</div>
             <h4>LinkedIn Post</h4>
             <p style="color: #28a745; margin: 0;">Professional ready</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
+        st.markdown(markup("""
         <div class="mini-feature-card">
             <div style="font-size: 2rem; margin-bottom: 0.5rem;">📝</div>
             <h4>Blog Outline</h4>
             <p style="color: #28a745; margin: 0;">SEO optimized</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
     with col4:
-        st.markdown("""
+        st.markdown(markup("""
         <div class="mini-feature-card">
             <div style="font-size: 2rem; margin-bottom: 0.5rem;">📬</div>
             <h4>Newsletter</h4>
             <p style="color: #28a745; margin: 0;">Email ready</p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
-    content_tabs = st.tabs([key for key, value in content_types.items() if value])
+    # Only the active format is drawn; the others are a label in the selector
+    # until picked, and their content stays in st.session_state.generated.
+    selected_types = [name for name, selected in content_types.items() if selected]
+    if selected_types:
+        if st.session_state.get("active_format") not in selected_types:
+            st.session_state.active_format = selected_types[0]
+        icons = {name: icon for name, icon, _, _ in content_options}
+        content_type = st.radio(
+            "Content format", selected_types, key="active_format", format_func=lambda name: f"{icons[name]} {name}",
+            horizontal=True, label_visibility="collapsed",
+        )
+        ready = [name for name in selected_types if name in st.session_state.generated]
+        if ready:
+            st.caption(f"✅ Generated: {', '.join(ready)}")
+        i = list(content_types).index(content_type)
+        st.markdown(fragment("content_tab.html", title=content_type), unsafe_allow_html=True)
+        
+        if content_type in st.session_state.generated:
+            generated = st.session_state.generated[content_type]
+            st.markdown(generated.text)
+            st.caption(f"⚡ First token {generated.first_token_seconds:.2f}s · complete {generated.seconds:.2f}s")
+            
+        elif content_type in stream_types:
+            stream_placeholders[content_type] = st.empty()
+            stream_placeholders[content_type].caption("✍️ Waiting for the first tokens...")
+            
+        elif content_type in SAMPLE_CONTENT:
+            st.markdown(fragment(SAMPLE_CONTENT[content_type]), unsafe_allow_html=True)
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        # Enhanced action buttons
+        col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+        with col1:
+            if st.button(f"📋 Copy", key=f"copy_{i}", help=f"Copy {content_type} to clipboard"):
+                st.success("Content copied to clipboard!")
+        with col2:
+            if st.button(f"📥 Download", key=f"download_{i}", help=f"Download {content_type} as text file"):
+                st.success("Download started!")
+        with col3:
+            if st.button(f"🔄 Regenerate", key=f"regen_{i}", help=f"Generate new version of {content_type}"):
+                if st.session_state.analysis is None:
+                    st.info("Process an episode first to generate content.")
+                else:
+                    try:
+                        with st.spinner("Regenerating content..."):
+                            st.session_state.generated.update(generate_content(
+                                st.session_state.analysis.digest.to_prompt(),
+                                [content_type],
+                                settings=content_settings,
+                                cache=response_cache,
+                                refresh=True,
+                                chapters=st.session_state.chapters,
+                                quotes=st.session_state.quotes,
+                                excerpts=episode_excerpts([content_type]),
+                            ))
+                        st.rerun()
+                    except openai.OpenAIError as error:
+                        st.error(f"❌ Regeneration failed: {error}")
+        with col4:
+            if st.button(f"📤 Share", key=f"share_{i}", help=f"Share {content_type}"):
+                st.success("Share link created!")
     
-    for i, (content_type, selected) in enumerate(content_types.items()):
-        if selected and i < len(content_tabs):
-            with content_tabs[list(content_types.keys()).index(content_type)]:
-                st.markdown(f"""
-                <div style="background: white; padding: 1.5rem; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); margin: 1rem 0;">
-                    <h3 style="color: #667eea; border-bottom: 2px solid #e0e0e0; padding-bottom: 0.5rem;">{content_type}</h3>
-                """, unsafe_allow_html=True)
-                
-                if content_type == "Twitter Thread":
-                    st.markdown("""
-                        <div style="background: #f8f9fa; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #1da1f2;">
-                            <h4 style="color: #1da1f2;">🧵 Twitter Thread (6 tweets)</h4>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>1/6</strong> 🎙️ Just discovered an amazing insight about content creation that will change how you think about podcasting...</p>
-                            </div>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>2/6</strong> The key is not just creating content, but creating content that resonates with your audience on multiple platforms 🎯</p>
-                            </div>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>3/6</strong> "Content is king, but context is kingdom" - This quote from the podcast really hit home 👑</p>
-                            </div>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>4/6</strong> Here are 3 actionable strategies mentioned:<br>
-                                • Repurpose everything<br>
-                                • Know your audience<br>
-                                • Stay consistent</p>
-                            </div>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>5/6</strong> The most surprising stat: 73% of creators don't repurpose their content effectively 📈</p>
-                            </div>
-                            <div style="background: white; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #1da1f2;">
-                                <p><strong>6/6</strong> What's your biggest content creation challenge? Drop a comment below! 👇</p>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                elif content_type == "LinkedIn Post":
-                    st.markdown("""
-                        <div style="background: #f8f9fa; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #0077b5;">
-                            <h4 style="color: #0077b5;">💼 LinkedIn Post</h4>
-                            <div style="background: white; padding: 1.5rem; border-radius: 8px; border: 1px solid #e0e0e0;">
-                                <p style="font-size: 1.1rem; line-height: 1.6;">The content creation landscape is evolving rapidly, and podcasters who adapt will thrive.</p>
-                                <p style="margin: 1rem 0;"><strong>Key insights from today's discussion:</strong></p>
-                                <p>✅ Authenticity beats perfection every time<br>
-                                ✅ Consistent value delivery builds trust<br>
-                                ✅ Multi-platform thinking from day one</p>
-                                <blockquote style="border-left: 3px solid #0077b5; padding-left: 1rem; margin: 1rem 0; font-style: italic; color: #666;">
-                                    "Your audience doesn't just want content, they want connection."
-                                </blockquote>
-                                <p>What strategies have worked best for your content? Let's discuss in the comments.</p>
-                                <p style="color: #0077b5; font-weight: bold;">#ContentCreation #Podcasting #Marketing #Leadership</p>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                elif content_type == "Blog Post":
-                    st.markdown("""
-                        <div style="background: #f8f9fa; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #ff6b35;">
-                            <h4 style="color: #ff6b35;">📝 Blog Post Outline</h4>
-                            <div style="background: white; padding: 1.5rem; border-radius: 8px; border: 1px solid #e0e0e0;">
-                                <h5 style="color: #333; border-bottom: 2px solid #e0e0e0; padding-bottom: 0.5rem;">Title: "The Ultimate Guide to Content Repurposing for Podcasters"</h5>
-                                <div style="margin: 1rem 0;">
-                                    <p><strong>🎯 Introduction:</strong> Hook about content creation challenges</p>
-                                    <p><strong>📊 Section 1:</strong> Why Repurposing Matters</p>
-                                    <p><strong>🚀 Section 2:</strong> The 5-Platform Strategy</p>
-                                    <p><strong>🛠️ Section 3:</strong> Tools and Techniques</p>
-                                    <p><strong>📈 Section 4:</strong> Measuring Success</p>
-                                    <p><strong>✅ Conclusion:</strong> Action steps and next steps</p>
-                                    <p><strong>📞 CTA:</strong> Download free template</p>
-                                </div>
-                                <div style="background: #f0f2f6; padding: 1rem; border-radius: 5px; margin-top: 1rem;">
-                                    <small><strong>Estimated read time:</strong> 8-10 minutes | <strong>Word count:</strong> ~2,000 words</small>
-                                </div>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("</div>", unsafe_allow_html=True)
-                
-                # Enhanced action buttons
-                col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
-                with col1:
-                    if st.button(f"📋 Copy", key=f"copy_{i}", help=f"Copy {content_type} to clipboard"):
-                        st.success("Content copied to clipboard!")
-                with col2:
-                    if st.button(f"📥 Download", key=f"download_{i}", help=f"Download {content_type} as text file"):
-                        st.success("Download started!")
-                with col3:
-                    if st.button(f"🔄 Regenerate", key=f"regen_{i}", help=f"Generate new version of {content_type}"):
-                        st.info("Regenerating content...")
-                with col4:
-                    if st.button(f"📤 Share", key=f"share_{i}", help=f"Share {content_type}"):
-                        st.success("Share link created!")
+    # Stream newly requested formats, redrawing the active one as tokens arrive
+    if stream_types:
+        def show_partial(content_type, text):
+            if content_type in stream_placeholders:
+                stream_placeholders[content_type].markdown(text)
+        
+        try:
+            st.session_state.generated.update(stream_content(
+                st.session_state.analysis.digest.to_prompt(),
+                stream_types,
+                show_partial,
+                settings=content_settings,
+                cache=response_cache,
+                chapters=st.session_state.chapters,
+                quotes=st.session_state.quotes,
+                excerpts=episode_excerpts(stream_types),
+            ))
+            st.rerun()
+        except openai.OpenAIError as error:
+            st.session_state.generation_error = str(error)
+            st.error(f"❌ Content generation failed: {error}")
 else:
     # Show empty state with call to action
-    st.markdown("""
+    st.markdown(markup("""
     <div style="text-align: center; padding: 4rem 2rem; background: #f8f9fa; border-radius: 15px; margin: 2rem 0;">
         <div style="font-size: 4rem; margin-bottom: 1rem;">🎙️</div>
         <h3 style="color: #667eea;">Ready to Transform Your Podcast?</h3>
@@ -558,7 +663,7 @@ else:
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 # Analytics and insights section
 if st.session_state.uploaded_file or st.session_state.youtube_url:
@@ -567,29 +672,90 @@ if st.session_state.uploaded_file or st.session_state.youtube_url:
     
     col1, col2, col3, col4 = st.columns(4)
     
+    # Running totals: published by the job while it transcribes, final once it is done
+    live_metrics = st.session_state.metrics
+    if active_job is not None and active_job.details:
+        live_metrics = active_job.details
+    topics = None
+    if st.session_state.transcript:
+        topics = get_topics(st.session_state.transcript_hash, st.session_state.transcript)
+    
     with col1:
-        st.metric("📊 Total Duration", "45:32", "2:15")
+        if st.session_state.audio_stats is not None:
+            duration, skipped = st.session_state.audio_stats
+            st.metric("📊 Total Duration", format_timestamp(duration),
+                      f"{skipped:.0%} silence skipped", delta_color="off")
+        elif live_metrics:
+            st.metric("📊 Total Duration", format_timestamp(live_metrics["duration"]))
+        else:
+            st.metric("📊 Total Duration", "45:32", "2:15")
     with col2:
-        st.metric("💬 Word Count", "6,847", "234")
+        if live_metrics:
+            st.metric("💬 Word Count", f"{live_metrics['words']:,}",
+                      f"{live_metrics['words_per_minute']:.0f} words/min", delta_color="off")
+        else:
+            st.metric("💬 Word Count", "6,847", "234")
     with col3:
-        st.metric("🎯 Key Topics", "7", "1")
+        if topics is not None:
+            st.metric("🎯 Key Topics", len(topics))
+        elif live_metrics:
+            st.metric("🎯 Key Topics", len(live_metrics["top_terms"]),
+                      help=", ".join(term for term, _ in live_metrics["top_terms"]))
+        else:
+            st.metric("🎯 Key Topics", "7", "1")
     with col4:
-        st.metric("⭐ Quotable Moments", "12", "3")
+        if st.session_state.transcript:
+            st.metric("⭐ Quotable Moments", len(st.session_state.quotes))
+        else:
+            st.metric("⭐ Quotable Moments", "12", "3")
+    
+    # LLM response cache effectiveness
+    cache_col1, cache_col2 = st.columns(2)
+    with cache_col1:
+        st.metric("🗄️ Response Cache Hit Rate", f"{response_cache.hit_rate:.0%}",
+                  f"{response_cache.hits} hits / {response_cache.misses} misses", delta_color="off")
+    with cache_col2:
+        st.metric("💰 Tokens Saved by Cache", f"{response_cache.saved_tokens:,}")
     
     # Topic breakdown
     st.markdown("### 🏷️ Topic Breakdown")
-    topics_data = {
-        'Topic': ['Content Strategy', 'Social Media', 'Productivity', 'Marketing', 'Technology'],
-        'Mentions': [23, 18, 15, 12, 8],
-        'Relevance': [95, 87, 82, 78, 65]
-    }
-    st.bar_chart(pd.DataFrame(topics_data).set_index('Topic')['Mentions'])
+    if topics:
+        topics_data = {
+            'Topic': [topic.name for topic in topics],
+            'Mentions': [topic.mentions for topic in topics],
+            'Relevance': [topic.relevance for topic in topics]
+        }
+    elif live_metrics and live_metrics["top_terms"]:
+        top_count = live_metrics["top_terms"][0][1]
+        topics_data = {
+            'Topic': [term.title() for term, _ in live_metrics["top_terms"]],
+            'Mentions': [count for _, count in live_metrics["top_terms"]],
+            'Relevance': [round(100 * count / top_count, 1) for _, count in live_metrics["top_terms"]]
+        }
+    else:
+        topics_data = {
+            'Topic': ['Content Strategy', 'Social Media', 'Productivity', 'Marketing', 'Technology'],
+            'Mentions': [23, 18, 15, 12, 8],
+            'Relevance': [95, 87, 82, 78, 65]
+        }
+    topics_df = pd.DataFrame(topics_data).set_index('Topic')
+    st.bar_chart(topics_df['Mentions'])
+    if topics:
+        st.dataframe(topics_df)
 
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(markup("""
 <div style="text-align: center; padding: 2rem; color: #666;">
     <p>🎙️ <strong>Podcast to Content Agent</strong> - Transforming audio into engaging content</p>
     <p>Built with ❤️ using Streamlit | Version 1.0.0</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+"""), unsafe_allow_html=True)
+
+# Load Whisper and the heavy imports in the background once the page is up
+warm_up()
+
+# Keep polling while a background job is running for this session
+if active_job is not None and active_job.active:
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
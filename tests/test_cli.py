@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from core.cli import episode_names, find_episodes, main
+
+
+def test_missing_input_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path / "missing")])
+    assert exit_info.value.code == 2
+    assert "no such file or directory" in capsys.readouterr().err
+
+
+def test_same_named_episodes_get_separate_folders(tmp_path):
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "ep1.mp3").write_bytes(b"")
+    (tmp_path / "a" / "ep2.mp3").write_bytes(b"")
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("a/ep2.mp3\n")
+
+    episodes = find_episodes([str(tmp_path / "a"), str(tmp_path / "b"), str(manifest)])
+    names = episode_names(episodes)
+    assert len(episodes) == 3  # a/ep2.mp3 is listed twice but processed once
+    assert len(set(names.values())) == 3
+    assert names[os.path.join(str(tmp_path / "a"), "ep2.mp3")] == "ep2"
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from core.generation import CONTENT_PROMPTS, generate_all
+
+FORMATS = list(CONTENT_PROMPTS)
+
+
+class StubServer:
+    """Chat-completions stub that fails each prompt's first attempt and tracks concurrency."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.attempts = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with stub._lock:
+                    stub.attempts[prompt] += 1
+                    first_attempt = stub.attempts[prompt] == 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.latency(prompt))
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                if first_attempt:
+                    self.send_response(500)
+                    self.send_header("retry-after-ms", "10")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                payload = json.dumps({
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": prompt},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def latest_first(prompt):
+    """Later formats answer sooner, so completion order is the reverse of request order."""
+    position = next(i for i, name in enumerate(FORMATS) if CONTENT_PROMPTS[name] in prompt)
+    return 0.05 * (len(FORMATS) - position)
+
+
+@pytest.fixture
+def stub():
+    with StubServer(latest_first) as server:
+        yield server
+
+
+def run(stub, max_concurrency, max_retries=2):
+    client = openai.AsyncOpenAI(base_url=stub.url, api_key="stub", max_retries=max_retries)
+    return asyncio.run(generate_all("An episode about pricing.", FORMATS, client=client,
+                                    max_concurrency=max_concurrency))
+
+
+def test_concurrency_is_capped_by_the_semaphore(stub):
+    run(stub, max_concurrency=2)
+    assert stub.max_in_flight == 2
+
+
+def test_failed_requests_are_retried(stub):
+    results = run(stub, max_concurrency=3)
+    assert len(stub.attempts) == len(FORMATS)
+    assert set(stub.attempts.values()) == {2}
+    assert all(result.prompt_tokens == 10 for result in results.values())
+
+
+def test_errors_surface_once_retries_run_out(stub):
+    with pytest.raises(openai.InternalServerError):
+        run(stub, max_concurrency=3, max_retries=0)
+
+
+def test_results_keep_the_requested_order(stub):
+    results = run(stub, max_concurrency=len(FORMATS))
+    assert list(results) == FORMATS
+    for name, result in results.items():
+        assert result.content_type == name
+        assert CONTENT_PROMPTS[name] in result.text
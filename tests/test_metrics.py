@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from core.metrics import TranscriptMetrics
+from core.transcription import Segment
+
+TRANSCRIPT = [
+    Segment("Pricing is the hardest decision founders make.", 0.0, 4.0, "Host"),
+    Segment("We doubled our pricing last year.", 6.0, 9.0, "Guest"),
+    Segment("Customers stayed because pricing matched value.", 9.0, 15.0, "Guest"),
+]
+
+
+def test_word_and_time_totals():
+    metrics = TranscriptMetrics().extend(TRANSCRIPT)
+    assert metrics.segments == 3
+    assert metrics.words == 7 + 6 + 6
+    assert metrics.duration == 15.0
+    # The two-second pause before the second segment is not speech.
+    assert metrics.speech_seconds == pytest.approx(13.0)
+    assert metrics.words_per_minute == pytest.approx(60 * 19 / 13.0)
+
+
+def test_empty_metrics():
+    metrics = TranscriptMetrics()
+    assert metrics.words_per_minute == 0.0
+    assert metrics.top_terms() == []
+    assert metrics.snapshot()["speakers"] == 0
+
+
+def test_top_terms_skip_stopwords_and_short_words():
+    metrics = TranscriptMetrics().extend(TRANSCRIPT)
+    assert metrics.top_terms(1) == [("pricing", 3)]
+    terms = dict(metrics.top_terms())
+    assert terms["customers"] == 1
+    assert "the" not in terms and "is" not in terms and "we" not in terms
+
+
+def test_speaker_seconds_and_recount_after_diarization():
+    metrics = TranscriptMetrics().extend(TRANSCRIPT)
+    assert metrics.speaker_seconds == {"Host": 4.0, "Guest": 9.0}
+    relabelled = [segment._replace(speaker="Speaker 1") for segment in TRANSCRIPT]
+    metrics.recount_speakers(relabelled)
+    assert metrics.speaker_seconds == {"Speaker 1": 13.0}
+
+
+def test_incremental_updates_match_a_full_count():
+    incremental = TranscriptMetrics()
+    for segment in TRANSCRIPT:
+        incremental.add(segment)
+    assert incremental.snapshot() == TranscriptMetrics().extend(TRANSCRIPT).snapshot()
+
+
+def test_snapshot_is_json_serializable():
+    snapshot = TranscriptMetrics().extend(TRANSCRIPT).snapshot()
+    assert json.loads(json.dumps(snapshot)) == snapshot
+    assert snapshot["speakers"] == 2
+    assert snapshot["top_terms"][0] == ["pricing", 3]
@@ -0,0 +1,35 @@
+from core.parallel import merge_segments
+from core.transcription import Segment
+
+
+def test_repeats_inside_a_chunk_are_kept():
+    chunk = [
+        Segment("What do you think about that?", 10.0, 12.0),
+        Segment("That is a great question.", 12.2, 14.0),
+        Segment("Really, really.", 14.1, 15.0),
+        Segment("Really good stuff.", 15.2, 16.5),
+    ]
+    merged = list(merge_segments([(0.0, chunk), (300.0, [Segment("Next chunk.", 301.0, 302.0)])]))
+    assert [seg.text for seg in merged] == [seg.text for seg in chunk] + ["Next chunk."]
+
+
+def test_words_repeated_across_a_seam_are_trimmed():
+    first = [Segment("we raised prices last year", 290.0, 299.6)]
+    # The next chunk starts one second before the cut and hears "last year" again.
+    second = [
+        Segment("last year and churn went down", 299.5, 303.0),
+        Segment("down is good", 303.2, 304.0),
+    ]
+    merged = list(merge_segments([(0.0, first), (299.0, second)], overlap_seconds=1.0))
+    assert [seg.text for seg in merged] == [
+        "we raised prices last year",
+        "and churn went down",
+        "down is good",
+    ]
+
+
+def test_segments_heard_twice_in_the_overlap_are_dropped():
+    first = [Segment("first words", 295.0, 299.5)]
+    second = [Segment("first words", 299.0, 299.6), Segment("new words", 299.8, 302.0)]
+    merged = list(merge_segments([(0.0, first), (299.0, second)], overlap_seconds=1.0))
+    assert [seg.text for seg in merged] == ["first words", "new words"]